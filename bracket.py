@@ -0,0 +1,329 @@
+# bracket.py
+# Best-of-N series and single-elimination brackets on top of Match.
+#
+# Game win probabilities are estimated once per matchup by simulation (to a
+# target standard error) and memoized in a MatchupCache keyed by roster and
+# EngineParams fingerprints; whole brackets are then sampled in bulk from the
+# cached probability matrix with NumPy.
+#
+#   cache = MatchupCache(precision=0.01, workers=8)
+#   sim = BracketSimulator(teams_in_seed_order, cache, best_of=7)
+#   print(sim.sample(1_000_000, seed=3).format())
+
+import hashlib
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from multiball_basketball import EngineParams, Match, Team
+from rng import make_rng
+
+# True = higher seed at home, per game of the series
+SERIES_HOME_PATTERNS = {
+    1: (True,),
+    3: (True, False, True),
+    5: (True, True, False, False, True),
+    7: (True, True, False, False, True, False, True),
+}
+
+
+def home_pattern(best_of: int) -> Tuple[bool, ...]:
+    if best_of < 1 or best_of % 2 == 0:
+        raise ValueError("best_of must be a positive odd number")
+    if best_of in SERIES_HOME_PATTERNS:
+        return SERIES_HOME_PATTERNS[best_of]
+    # Alternate, higher seed first (and therefore last)
+    return tuple(g % 2 == 0 for g in range(best_of))
+
+
+# --------------------------------------------------------------------
+# Full-fidelity series (real Match games)
+# --------------------------------------------------------------------
+
+@dataclass
+class SeriesResult:
+    higher: str
+    lower: str
+    wins: Tuple[int, int]          # (higher seed, lower seed)
+    games: List[Tuple[str, int, int, str]]  # (home, home score, away score, away)
+
+    @property
+    def winner(self) -> str:
+        return self.higher if self.wins[0] > self.wins[1] else self.lower
+
+
+def series_seed(seed: int, round_index: int, slot: int) -> int:
+    """Seed of one series of a played bracket; distinct (seed, round, slot) keys get independent streams."""
+    return int(np.random.SeedSequence([seed, round_index, slot]).generate_state(1, np.uint64)[0])
+
+
+def play_series(higher: Team, lower: Team, best_of: int = 7, *, params: Optional[EngineParams] = None,
+                seed: int = 0, backend: str = "python") -> SeriesResult:
+    """Play a series game by game until one side has a majority; the home team is team_a."""
+    need = best_of // 2 + 1
+    wins = [0, 0]
+    games = []
+    for g, higher_home in enumerate(home_pattern(best_of)):
+        home, away = (higher, lower) if higher_home else (lower, higher)
+        h, a = home.copy(), away.copy()
+        Match(h, a, params=params, logged=False, rng=make_rng(seed, backend=backend, index=g)).simulate()
+        games.append((home.name, h.score, a.score, away.name))
+        wins[0 if (h.score > a.score) == higher_home else 1] += 1
+        if max(wins) == need:
+            break
+    return SeriesResult(higher.name, lower.name, (wins[0], wins[1]), games)
+
+
+# --------------------------------------------------------------------
+# Matchup cache
+# --------------------------------------------------------------------
+
+def _play_batch(first: Team, second: Team, params: Optional[EngineParams], seed: int,
+                start: int, count: int, alternate: bool, backend: str) -> int:
+    # Wins for `first` over games [start, start + count) of this matchup's stream
+    wins = 0
+    for g in range(start, start + count):
+        first_home = not alternate or g % 2 == 0
+        home, away = (first, second) if first_home else (second, first)
+        h, a = home.copy(), away.copy()
+        Match(h, a, params=params, logged=False, rng=make_rng(seed, backend=backend, index=g)).simulate()
+        wins += (h.score > a.score) == first_home
+    return wins
+
+
+@dataclass
+class MatchupEstimate:
+    wins: int = 0
+    games: int = 0
+
+    @property
+    def probability(self) -> float:
+        return self.wins / self.games if self.games else 0.5
+
+    @property
+    def stderr(self) -> float:
+        # Shrunk toward 1/2 so a lopsided early sample does not report zero error
+        p = (self.wins + 0.5) / (self.games + 1)
+        return math.sqrt(p * (1.0 - p) / self.games) if self.games else float('inf')
+
+
+MatchupKey = Tuple[Tuple[str, str], Tuple[str, str]]
+
+
+class MatchupCache:
+    """
+    Memoized game win probabilities. Keys are (name, roster fingerprint) per
+    side plus the EngineParams fingerprint, so a roster edit or a params change
+    simply misses; invalidate()/params= drop the stale entries.
+
+    The engine has no home-court term, so by default (symmetric=True) one
+    estimate serves both home/away orders, with the sample alternating who is
+    team_a. Set symmetric=False to estimate each order separately.
+    """
+    def __init__(self, params: Optional[EngineParams] = None, *, precision: float = 0.01,
+                 min_games: int = 200, max_games: int = 20000, batch: int = 100,
+                 symmetric: bool = True, seed: int = 0, workers: Optional[int] = None,
+                 backend: str = "python"):
+        self.precision = precision
+        self.min_games = min_games
+        self.max_games = max_games
+        self.batch = batch
+        self.symmetric = symmetric
+        self.seed = seed
+        self.workers = workers
+        self.backend = backend
+        self._entries: Dict[MatchupKey, MatchupEstimate] = {}
+        self._params = params
+        self._params_fp = (params or EngineParams()).fingerprint()
+
+    @property
+    def params(self) -> Optional[EngineParams]:
+        return self._params
+
+    @params.setter
+    def params(self, params: Optional[EngineParams]):
+        fp = (params or EngineParams()).fingerprint()
+        if fp != self._params_fp:
+            self._entries.clear()
+        self._params, self._params_fp = params, fp
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, team: Optional[Team] = None):
+        """Drop every entry involving `team` (by name), or everything."""
+        if team is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if team.name in (k[0][0], k[1][0])]:
+            del self._entries[key]
+
+    def _key(self, home: Team, away: Team) -> Tuple[MatchupKey, bool]:
+        # (key, home is the key's first side)
+        a, b = (home.name, home.fingerprint()), (away.name, away.fingerprint())
+        if self.symmetric and b < a:
+            return (b, a), False
+        return (a, b), True
+
+    def _stream_seed(self, key: MatchupKey) -> int:
+        h = hashlib.sha1(repr((self.seed, self._params_fp, key)).encode()).digest()
+        return int.from_bytes(h[:7], 'big')
+
+    def _done(self, est: MatchupEstimate) -> bool:
+        return est.games >= self.max_games or (est.games >= self.min_games and est.stderr <= self.precision)
+
+    def estimate(self, pairs: Iterable[Tuple[Team, Team]]):
+        """
+        Fill the cache for every (home, away) pair. All unfinished matchups are
+        advanced one batch at a time in a single parallel round, until each one
+        meets the precision target (or max_games).
+        """
+        teams: Dict[MatchupKey, Tuple[Team, Team]] = {}
+        for home, away in pairs:
+            key, first_home = self._key(home, away)
+            teams[key] = (home, away) if first_home else (away, home)
+            self._entries.setdefault(key, MatchupEstimate())
+        pending = [k for k in teams if not self._done(self._entries[k])]
+        if not pending:
+            return
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 1 else None
+        try:
+            while pending:
+                jobs = []
+                for key in pending:
+                    est = self._entries[key]
+                    count = min(self.batch, self.max_games - est.games)
+                    jobs.append((*teams[key], self._params, self._stream_seed(key), est.games, count,
+                                 self.symmetric, self.backend))
+                if executor is None:
+                    results = [_play_batch(*job) for job in jobs]
+                else:
+                    results = list(executor.map(_play_batch, *zip(*jobs)))
+                for key, job, wins in zip(pending, jobs, results):
+                    est = self._entries[key]
+                    est.wins += wins
+                    est.games += job[5]
+                pending = [k for k in pending if not self._done(self._entries[k])]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def lookup(self, home: Team, away: Team) -> MatchupEstimate:
+        key, first_home = self._key(home, away)
+        if key not in self._entries or not self._done(self._entries[key]):
+            self.estimate([(home, away)])
+        est = self._entries[key]
+        return est if first_home else MatchupEstimate(est.games - est.wins, est.games)
+
+    def win_probability(self, home: Team, away: Team) -> float:
+        """P(home beats away) in one game with `home` as team_a."""
+        return self.lookup(home, away).probability
+
+    def matrix(self, teams: Sequence[Team]) -> np.ndarray:
+        """H[i, j] = P(teams[i] at home beats teams[j]); diagonal is 0.5."""
+        n = len(teams)
+        self.estimate((teams[i], teams[j]) for i in range(n) for j in range(n) if i != j)
+        probs = np.full((n, n), 0.5)
+        for i in range(n):
+            for j in range(n):
+                if i != j:
+                    probs[i, j] = self.win_probability(teams[i], teams[j])
+        return probs
+
+
+# --------------------------------------------------------------------
+# Brackets
+# --------------------------------------------------------------------
+
+def bracket_order(n: int) -> List[int]:
+    """Seed indices in bracket slot order: 0 v n-1, then n/2-1 v n/2, ..."""
+    if n < 2 or n & (n - 1):
+        raise ValueError("bracket size must be a power of two >= 2")
+    order = [0, 1]
+    while len(order) < n:
+        size = 2 * len(order)
+        order = [s for seed in order for s in (seed, size - 1 - seed)]
+    return order
+
+
+@dataclass
+class BracketResult:
+    team_names: List[str]          # seed order
+    reach: np.ndarray              # (teams, rounds + 1): P(win at least r series)
+    sims: int
+
+    @property
+    def champion(self) -> np.ndarray:
+        return self.reach[:, -1]
+
+    def format(self) -> str:
+        rounds = self.reach.shape[1] - 1
+        # column "won r" = P(win at least r series); the last one is the title
+        header = f"{'seed':>4}  {'team':<20}" + "".join(f"{'won ' + str(r):>8}" for r in range(1, rounds)) + f"{'champ':>8}"
+        lines = [f"{self.sims} brackets", header]
+        for s in np.argsort(-self.champion, kind='stable'):
+            cells = "".join(f"{self.reach[s, r]:>8.3f}" for r in range(1, rounds + 1))
+            lines.append(f"{s + 1:>4}  {self.team_names[s]:<20}{cells}")
+        return "\n".join(lines)
+
+
+class BracketSimulator:
+    """
+    Single-elimination bracket over `teams` (best seed first). The higher seed
+    has home court in every series per SERIES_HOME_PATTERNS.
+    """
+    def __init__(self, teams: Sequence[Team], cache: Optional[MatchupCache] = None, best_of: int = 7):
+        self.order = bracket_order(len(teams))
+        self.teams = list(teams)
+        self.cache = cache if cache is not None else MatchupCache()
+        self.best_of = best_of
+        self.pattern = home_pattern(best_of)
+
+    def probabilities(self) -> np.ndarray:
+        return self.cache.matrix(self.teams)
+
+    def sample(self, sims: int, seed: int = 0, chunk: int = 250_000) -> BracketResult:
+        """Sample `sims` whole brackets from the cached game probabilities."""
+        probs = self.probabilities()
+        n = len(self.teams)
+        rounds = int(math.log2(n))
+        need = self.best_of // 2
+        rng = np.random.default_rng(seed)
+        counts = np.zeros((n, rounds + 1), dtype=np.int64)
+        counts[:, 0] = sims
+        done = 0
+        while done < sims:
+            m = min(chunk, sims - done)
+            field = np.tile(np.array(self.order, dtype=np.int16), (m, 1))
+            for r in range(1, rounds + 1):
+                a, b = field[:, 0::2], field[:, 1::2]
+                top, bottom = np.minimum(a, b), np.maximum(a, b)
+                p_home = probs[top, bottom]
+                p_away = 1.0 - probs[bottom, top]
+                wins = np.zeros(top.shape, dtype=np.int8)
+                # Playing every game and taking the majority gives the same winner as stopping early
+                for top_home in self.pattern:
+                    wins += rng.random(top.shape) < (p_home if top_home else p_away)
+                field = np.where(wins > need, top, bottom)
+                counts[:, r] += np.bincount(field.ravel(), minlength=n)
+            done += m
+        return BracketResult([t.name for t in self.teams], counts / sims, sims)
+
+    def play(self, seed: int = 0, *, backend: str = "python") -> List[List[SeriesResult]]:
+        """One bracket with every game actually simulated; returns the series by round."""
+        by_name = {t.name: i for i, t in enumerate(self.teams)}
+        field = list(self.order)
+        rounds = []
+        while len(field) > 1:
+            results = []
+            for k in range(0, len(field), 2):
+                top, bottom = sorted(field[k:k + 2])
+                results.append(play_series(self.teams[top], self.teams[bottom], self.best_of,
+                                           params=self.cache.params, seed=series_seed(seed, len(rounds), k),
+                                           backend=backend))
+            rounds.append(results)
+            field = [by_name[s.winner] for s in results]
+        return rounds
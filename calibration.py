@@ -0,0 +1,322 @@
+# calibration.py
+# Fit EngineParams to target per-team league averages with parallel,
+# common-random-number batched simulation.
+#
+#   python calibration.py targets.txt --budget 20000 --games 200 --workers 8
+#
+# targets.txt may be the "--- 100 Game Stat Averages ---" block printed by
+# test_multiball_basketball.py, or a JSON object {"PTS": 104.0, ...}.
+
+import argparse
+import json
+import math
+import random
+import re
+from dataclasses import dataclass, fields, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from multiball_basketball import EngineParams, Match, Player, PlayerAttributes, Team
+from rng import make_rng
+from rotation import ForfeitError
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+STAT_KEYS = ('FGA', 'FGM', '3PA', '3PM', 'FTA', 'FTM', 'TO', 'PTS', 'FOUL', 'AST', 'REB', 'STL', 'BLK')
+ATTRIBUTE_NAMES = tuple(f.name for f in fields(PlayerAttributes))
+
+
+@dataclass
+class Knob:
+    name: str
+    lo: float
+    hi: float
+
+
+# Search space; names are EngineParams fields except 'three_point_scale',
+# which rescales every 3PT entry of the half-court shot distributions.
+DEFAULT_KNOBS = (
+    Knob('oreb_rate', 0.15, 0.40),
+    Knob('ft_oreb_rate', 0.10, 0.40),
+    Knob('block_rate', 0.03, 0.20),
+    Knob('base_foul_close', 0.02, 0.14),
+    Knob('base_foul_jumper', 0.005, 0.06),
+    Knob('base_foul_non_shooting', 0.0, 0.03),
+    Knob('bonus_foul_bump', 0.0, 0.20),
+    Knob('success_min', 0.05, 0.30),
+    Knob('success_max', 0.60, 0.98),
+    Knob('three_point_scale', 0.5, 2.0),
+)
+
+HALF_COURT_KEYS = ('G', 'F', 'C')
+
+
+def apply_knob(params: EngineParams, name: str, value: float) -> EngineParams:
+    if name == 'three_point_scale':
+        weights = dict(params.shot_weights)
+        for key in HALF_COURT_KEYS:
+            weights[key] = tuple((t, w * value if t.startswith('3PT') else w) for t, w in weights[key])
+        return replace(params, shot_weights=weights)
+    return replace(params, **{name: value})
+
+
+def params_from_vector(base: EngineParams, knobs: Sequence[Knob], vector: Sequence[float]) -> EngineParams:
+    params = base
+    for knob, value in zip(knobs, vector):
+        params = apply_knob(params, knob.name, value)
+    return params
+
+
+def vector_from_params(params: EngineParams, knobs: Sequence[Knob]) -> List[float]:
+    return [1.0 if k.name == 'three_point_scale' else getattr(params, k.name) for k in knobs]
+
+
+# --------------------------------------------------------------------
+# Seeded rosters and batched simulation
+# --------------------------------------------------------------------
+
+def seeded_team(rng: random.Random, team_name: str, prefix: str, size: int = 10) -> Team:
+    # Same attribute ranges as make_random_player in the test harness
+    roster = []
+    for i in range(size):
+        values = {a: rng.uniform(40, 99) for a in ATTRIBUTE_NAMES if a != 'height'}
+        values['height'] = rng.uniform(68, 87)
+        roster.append(Player(name=f"{prefix}{i+1}", attributes=PlayerAttributes(**values)))
+    return Team(name=team_name, roster=roster)
+
+
+def simulate_game(params: EngineParams, seed: int, backend: str = "python") -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    One game on common random numbers: the seed fixes both rosters and every
+    engine draw, so two parameter sets evaluated on the same seed differ only
+    through the parameters. Returns {stat: (team A total, team B total)}.
+    """
+    rng = random.Random(seed)
+    team_a = seeded_team(rng, "Testers", "T")
+    team_b = seeded_team(rng, "Debuggers", "D")
+    match = Match(team_a, team_b, params=params, logged=False, rng=make_rng(seed, backend=backend))
+    try:
+        match.simulate()
+    except ForfeitError:
+        return None
+    return {
+        k: (sum(p.stats.get(k, 0) for p in team_a.roster), sum(p.stats.get(k, 0) for p in team_b.roster))
+        for k in STAT_KEYS
+    }
+
+
+def _run_chunk(params: EngineParams, seeds: Sequence[int],
+               backend: str = "python") -> Tuple[int, Dict[str, float], Dict[str, float]]:
+    # Per-team sums and sums of squares (both teams pooled) for a seed chunk
+    n = 0
+    sums = dict.fromkeys(STAT_KEYS, 0.0)
+    squares = dict.fromkeys(STAT_KEYS, 0.0)
+    for seed in seeds:
+        game = simulate_game(params, seed, backend)
+        if game is None:
+            continue
+        n += 2
+        for k, (a, b) in game.items():
+            sums[k] += a + b
+            squares[k] += a * a + b * b
+    return n, sums, squares
+
+
+@dataclass
+class BatchResult:
+    n: int
+    mean: Dict[str, float]
+    stderr: Dict[str, float]
+
+
+def _combine(parts) -> BatchResult:
+    n = sum(p[0] for p in parts)
+    mean, stderr = {}, {}
+    for k in STAT_KEYS:
+        s = sum(p[1][k] for p in parts)
+        sq = sum(p[2][k] for p in parts)
+        m = s / n if n else 0.0
+        var = (sq / n - m * m) * n / (n - 1) if n > 1 else 0.0
+        mean[k] = m
+        stderr[k] = math.sqrt(max(var, 0.0) / n) if n else 0.0
+    return BatchResult(n, mean, stderr)
+
+
+def _chunks(seeds: Sequence[int], size: int) -> List[Sequence[int]]:
+    return [seeds[i:i + size] for i in range(0, len(seeds), size)]
+
+
+def evaluate_batch(candidates: Sequence[EngineParams], seeds: Sequence[int], *,
+                   executor: Optional["ProcessPoolExecutor"] = None, chunk_size: int = 25,
+                   backend: str = "python") -> List[BatchResult]:
+    """Evaluate every candidate on the same seeds, as one flat batch of chunk jobs."""
+    chunks = _chunks(list(seeds), chunk_size)
+    jobs = [(ci, params, chunk) for ci, params in enumerate(candidates) for chunk in chunks]
+    if executor is None:
+        results = [_run_chunk(params, chunk, backend) for _, params, chunk in jobs]
+    else:
+        futures = [executor.submit(_run_chunk, params, chunk, backend) for _, params, chunk in jobs]
+        results = [f.result() for f in futures]
+    per_candidate: List[list] = [[] for _ in candidates]
+    for (ci, _, _), res in zip(jobs, results):
+        per_candidate[ci].append(res)
+    return [_combine(parts) for parts in per_candidate]
+
+
+# --------------------------------------------------------------------
+# Goodness of fit
+# --------------------------------------------------------------------
+
+def loss(result: BatchResult, targets: Dict[str, float]) -> float:
+    # Mean squared relative error over the targeted stats
+    terms = [((result.mean[k] - t) / t) ** 2 for k, t in targets.items() if t]
+    return sum(terms) / len(terms) if terms else 0.0
+
+
+def fit_report(result: BatchResult, targets: Dict[str, float]) -> Dict[str, dict]:
+    report = {}
+    for k, t in targets.items():
+        m, se = result.mean[k], result.stderr[k]
+        report[k] = {
+            'target': t,
+            'simulated': m,
+            'stderr': se,
+            'z': (m - t) / se if se else 0.0,
+        }
+    return report
+
+
+# --------------------------------------------------------------------
+# Search
+# --------------------------------------------------------------------
+
+@dataclass
+class CalibrationResult:
+    params: EngineParams
+    values: Dict[str, float]
+    loss: float
+    rms_relative_error: float
+    fit: Dict[str, dict]
+    games_simulated: int
+    generations: int
+
+    def format(self) -> str:
+        lines = ["--- Fitted Parameters ---"]
+        for name, value in self.values.items():
+            lines.append(f"  {name}: {value:.4f}")
+        lines.append("--- Goodness of Fit ---")
+        lines.append(f"  {'stat':<6}{'target':>9}{'sim':>9}{'stderr':>8}{'z':>7}")
+        for k, row in self.fit.items():
+            lines.append(f"  {k:<6}{row['target']:>9.2f}{row['simulated']:>9.2f}"
+                         f"{row['stderr']:>8.2f}{row['z']:>7.2f}")
+        lines.append(f"  RMS relative error: {self.rms_relative_error:.2%}")
+        lines.append(f"  Games simulated: {self.games_simulated} over {self.generations} generations")
+        return "\n".join(lines)
+
+
+def calibrate(targets: Dict[str, float], *, budget: int = 20000, games: int = 200,
+              population: int = 8, knobs: Sequence[Knob] = DEFAULT_KNOBS,
+              base: Optional[EngineParams] = None, workers: Optional[int] = None,
+              seed: int = 0, chunk_size: int = 25, backend: str = "python") -> CalibrationResult:
+    """
+    Elitist evolution strategy in the normalised knob box. Each generation
+    evaluates the incumbent plus `population` perturbations on one shared seed
+    set (common random numbers), so candidate differences are not swamped by
+    game-to-game noise. Stops once `budget` simulated games are spent.
+    """
+    unknown = set(targets) - set(STAT_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown target stats: {sorted(unknown)}")
+    base = base if base is not None else EngineParams()
+    search_rng = random.Random(seed)
+    seeds = [search_rng.randrange(2 ** 31) for _ in range(games)]
+
+    def to_params(unit):
+        return params_from_vector(base, knobs, [k.lo + u * (k.hi - k.lo) for k, u in zip(knobs, unit)])
+
+    start = vector_from_params(base, knobs)
+    best_unit = [min(1.0, max(0.0, (v - k.lo) / (k.hi - k.lo))) for k, v in zip(knobs, start)]
+    step = 0.25
+    spent = 0
+    generations = 0
+    # multiprocessing is imported only when it is used (keeps `python -m multiball` startup light)
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        best_result = evaluate_batch([to_params(best_unit)], seeds, executor=executor,
+                                     chunk_size=chunk_size, backend=backend)[0]
+        best_loss = loss(best_result, targets)
+        spent += games
+        while spent + population * games <= budget:
+            generations += 1
+            units = [
+                [min(1.0, max(0.0, u + search_rng.gauss(0.0, step))) for u in best_unit]
+                for _ in range(population)
+            ]
+            results = evaluate_batch([to_params(u) for u in units], seeds, executor=executor,
+                                     chunk_size=chunk_size, backend=backend)
+            spent += population * games
+            improved = False
+            for unit, result in zip(units, results):
+                cand_loss = loss(result, targets)
+                if cand_loss < best_loss:
+                    best_unit, best_result, best_loss, improved = unit, result, cand_loss, True
+            # 1/5th-rule style step adaptation
+            step = min(0.5, step * 1.5) if improved else max(0.01, step * 0.7)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    values = {k.name: k.lo + u * (k.hi - k.lo) for k, u in zip(knobs, best_unit)}
+    return CalibrationResult(
+        params=to_params(best_unit),
+        values=values,
+        loss=best_loss,
+        rms_relative_error=math.sqrt(best_loss),
+        fit=fit_report(best_result, targets),
+        games_simulated=spent,
+        generations=generations,
+    )
+
+
+# --------------------------------------------------------------------
+# Targets I/O / CLI
+# --------------------------------------------------------------------
+
+re_stat_line = re.compile(r"^\s+([0-9A-Z]+): (-?\d+(?:\.\d+)?)\s*$")
+
+
+def parse_targets(text: str) -> Dict[str, float]:
+    """Accept JSON or the averages block printed by test_100_game_stat_averages (teams are pooled)."""
+    text = text.strip()
+    if text.startswith("{"):
+        return {k: float(v) for k, v in json.loads(text).items()}
+    values: Dict[str, List[float]] = {}
+    for line in text.splitlines():
+        m = re_stat_line.match(line)
+        if m and m.group(1) in STAT_KEYS:
+            values.setdefault(m.group(1), []).append(float(m.group(2)))
+    return {k: sum(v) / len(v) for k, v in values.items()}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fit engine constants to target per-team averages.")
+    ap.add_argument("targets", help="JSON file or saved test_100_game_stat_averages output")
+    ap.add_argument("--budget", type=int, default=20000, help="total simulated games")
+    ap.add_argument("--games", type=int, default=200, help="games per candidate evaluation")
+    ap.add_argument("--population", type=int, default=8)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--rng", default="python", help="RNG backend: python, pcg64 or philox")
+    args = ap.parse_args(argv)
+
+    with open(args.targets, "r", encoding="utf-8") as f:
+        targets = parse_targets(f.read())
+    result = calibrate(targets, budget=args.budget, games=args.games, population=args.population,
+                       workers=args.workers, seed=args.seed, backend=args.rng)
+    print(result.format())
+
+
+if __name__ == "__main__":
+    main()
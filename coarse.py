@@ -0,0 +1,524 @@
+# coarse.py
+# Coarse-grained possession sampler for large projection runs.
+#
+# CoarseMatch resolves a half-court possession with one draw from the
+# categorical distribution of its outcomes: a turnover (plain, stolen or an
+# offensive foul), a non-shooting foul, a free-throw trip, or a made or missed
+# field goal (2 or 3 points, assisted, blocked, offensive or defensive
+# rebound), each with the players involved. The probabilities come from the
+# same formulas simulate_shot uses. A table covers one offensive/defensive
+# lineup pair and bonus state; assisters, blockers, rebounders and stealers
+# are then credited from the lineup's selection tables, and free-throw trips
+# from a per-shooter table. Fast breaks, the last shot clock of a period and
+# end-of-period shots still go through the detailed engine.
+#
+# Tables are computed for rested players and cached in OutcomeTables by
+# (offense, lineup names, bonus state), so a lineup pair that comes back -
+# later in the game or in another game of the same matchup - costs nothing.
+# Fatigue is applied per draw instead: a made shot is turned into a miss
+# with the probability the shooter's current fatigue takes off their make
+# rate (the table stores that slope per shooter).
+#
+# Stamina drains linearly while a player is on court, so the coarse match
+# also keeps on-court stamina and minutes as anchors (LazyTeamRotation) and
+# only runs the substitution pass when someone can next be tired, after a
+# foul, or when the quarter changes.
+#
+# Share one OutcomeTables across every match of a matchup (Team.copy()s of
+# the same two rosters):
+#
+#   tables = OutcomeTables(params)
+#   for seed in range(10000):
+#       a, b = home.copy(), away.copy()
+#       CoarseMatch(a, b, tables=tables, rng=make_rng(seed)).simulate()
+
+import math
+from itertools import product
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from multiball_basketball import (
+    CLOSE_SHOT_TYPES, LIVE_BALL_TURNOVERS, TURNOVER_TYPES, EngineParams, Match, Player, Team,
+    defense_pressure, free_throw_skill, shot_skill,
+)
+from rotation import RotationManager, TeamRotation
+
+# Outcome kinds; an outcome is (kind, offense slot, defense slot, a, b, c)
+# with slots into the lineups sorted by name:
+#   TURNOVER     handler slot, -, turnover code
+#   FOUL         -, fouler slot (non-shooting foul outside the bonus)
+#   FREE_THROWS  shooter slot, fouler slot, attempts
+#   MADE         shooter slot, -, points, assisted
+#   MISSED       shooter slot, -, three-pointer, blocked, offensive rebound
+TURNOVER, FOUL, FREE_THROWS, MADE, MISSED = range(5)
+PLAIN, STEAL, OFFENSIVE_FOUL = range(3)
+
+# Bonus states of the defense: fouls + 1 < threshold, fouls + 1 == threshold, fouls >= threshold
+NO_BONUS, BONUS_NEXT, IN_BONUS = range(3)
+
+# Lineup boosts are rounded to this step in the matchup cache key
+BOOST_STEP = 0.005
+# Midpoint quadrature over simulate_free_throws' per-trip +-0.05 noise
+FT_NOISE_POINTS = 21
+
+Outcome = Tuple[int, int, int, int, int, int]
+by_name = attrgetter('name')
+
+
+class OutcomeTable(NamedTuple):
+    outcomes: Tuple[Outcome, ...]
+    cum_weights: Tuple[float, ...]
+    fatigue_slopes: Tuple[Tuple[float, float], ...]  # per shooter slot: (2-pt, 3-pt) make rate lost per unit fatigue
+
+
+def _prob(x: float) -> float:
+    return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
+
+
+def bonus_state(team_fouls: int, threshold: int) -> int:
+    if team_fouls >= threshold:
+        return IN_BONUS
+    return BONUS_NEXT if team_fouls + 1 >= threshold else NO_BONUS
+
+
+class OutcomeTables:
+    """
+    Possession-outcome tables for one matchup and one EngineParams, plus the
+    pieces they are built from: shot-type mixes per shooter, matchup rows per
+    (shooter, defender, lineup boost) and free-throw trips per shooter.
+    Entries are keyed by names; use a new instance when rosters or params
+    change. At most max_tables lineup tables are kept.
+    """
+    def __init__(self, params: Optional[EngineParams] = None, max_tables: int = 50_000):
+        self.params = params if params is not None else EngineParams()
+        self.max_tables = max_tables
+        self.builds = 0
+        self._tables: Dict[tuple, OutcomeTable] = {}
+        self._outcomes: Dict[Outcome, Outcome] = {}
+        self._shots: Dict[str, List[tuple]] = {}
+        self._matchups: Dict[Tuple[str, str, int], Tuple[float, ...]] = {}
+        self._trips: Dict[Tuple[str, int], tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def clear(self):
+        for cache in (self._tables, self._outcomes, self._shots, self._matchups, self._trips):
+            cache.clear()
+
+    def get(self, match: Match, offense: Team, defense: Team, off: List[Player], de: List[Player],
+            bonus: int) -> OutcomeTable:
+        """Table for name-sorted lineups `off` vs `de`, built on first use."""
+        key = (offense.name, tuple(p.name for p in off), tuple(p.name for p in de), bonus)
+        table = self._tables.get(key)
+        if table is None:
+            if len(self._tables) >= self.max_tables:
+                self._tables.clear()
+            table = self._tables[key] = self._build(match, offense, defense, off, de, bonus)
+        return table
+
+    # ---------- Per-player pieces ----------
+    def _shot_rows(self, shooter: Player) -> List[tuple]:
+        # (shot type, weight, points, close, assist chance, skill) per half-court shot type
+        rows = self._shots.get(shooter.name)
+        if rows is None:
+            pos = shooter.position
+            dist = self.params.shot_weights[pos if pos in ('G', 'F') else 'C']
+            total = sum(w for _, w in dist)
+            rows = []
+            for shot_type, w in dist:
+                assist = 1.0 if 'Catch & Shoot' in shot_type else 0.0 if shot_type == '3PT Heave' else 0.5
+                rows.append((shot_type, w / total, 3 if '3PT' in shot_type else 2, shot_type in CLOSE_SHOT_TYPES,
+                             assist, shot_skill(shooter.attributes, shot_type)))
+            self._shots[shooter.name] = rows
+        return rows
+
+    def matchup(self, match: Match, shooter: Player, defender: Player, boost: int) -> Tuple[float, ...]:
+        """
+        Shot-type-weighted masses for a rested shooter against one defender:
+        2-pt shooting fouls, 3-pt shooting fouls, no shooting foul, and of
+        that: made 2 unassisted, made 2 assisted, made 3 unassisted, made 3
+        assisted, missed 2, missed 3, then the 2-pt and 3-pt make mass lost
+        per unit of fatigue.
+        """
+        key = (shooter.name, defender.name, boost)
+        row = self._matchups.get(key)
+        if row is not None:
+            return row
+        params = self.params
+        factor = boost * BOOST_STEP
+        close_foul = _prob(match.foul_chance(defender, shooting=True, team_fouls=0, base_foul=params.base_foul_close))
+        jump_foul = _prob(match.foul_chance(defender, shooting=True, team_fouls=0, base_foul=params.base_foul_jumper))
+        pressure = defense_pressure(defender.attributes)
+        masses = [0.0] * 11
+        for shot_type, w, points, close, assist, skill in self._shot_rows(shooter):
+            fouled = close_foul if close else jump_foul
+            three = points == 3
+            masses[1 if three else 0] += w * fouled
+            w *= 1.0 - fouled
+            masses[2] += w
+            skill *= factor
+            q = match.success_chance(shot_type, skill, pressure)
+            base = 5 if three else 3
+            masses[base] += w * q * (1.0 - assist)
+            masses[base + 1] += w * q * assist
+            masses[8 if three else 7] += w * (1.0 - q)
+            if params.success_min < q < params.success_max:
+                # d(success)/d(fatigue) off the clamps
+                masses[10 if three else 9] += w * skill * params.fatigue_penalty / 150.0
+        row = self._matchups[key] = tuple(masses)
+        return row
+
+    def trip(self, shooter: Player, attempts: int):
+        """((made, last attempt missed) outcomes, cumulative weights) for one free-throw trip."""
+        key = (shooter.name, attempts)
+        trip = self._trips.get(key)
+        if trip is None:
+            params = self.params
+            skill = free_throw_skill(shooter.attributes)
+            dist: Dict[Tuple[int, bool], float] = {}
+            for k in range(FT_NOISE_POINTS):
+                noise = -0.05 + 0.1 * (k + 0.5) / FT_NOISE_POINTS
+                pct = max(params.ft_min, min(params.ft_max, skill / 100 + noise))
+                for shots in product((True, False), repeat=attempts):
+                    p = 1.0 / FT_NOISE_POINTS
+                    for made in shots:
+                        p *= pct if made else 1.0 - pct
+                    outcome = (sum(shots), not shots[-1])
+                    dist[outcome] = dist.get(outcome, 0.0) + p
+            outcomes = tuple(dist)
+            acc, cum_weights = 0.0, []
+            for outcome in outcomes:
+                acc += dist[outcome]
+                cum_weights.append(acc)
+            trip = self._trips[key] = (outcomes, tuple(cum_weights))
+        return trip
+
+    # ---------- Lineup tables ----------
+    def _build(self, match: Match, offense: Team, defense: Team, off: List[Player], de: List[Player],
+               bonus: int) -> OutcomeTable:
+        self.builds += 1
+        params = self.params
+        rows: List[Tuple[Outcome, float]] = []
+
+        # Turnovers: uniform handler, uniform turnover type
+        live = len(LIVE_BALL_TURNOVERS) / len(TURNOVER_TYPES)
+        charge = TURNOVER_TYPES.count('offensive foul') / len(TURNOVER_TYPES)
+        steal = live * params.steal_rate
+        shot_share = 0.0
+        for i, handler in enumerate(off):
+            p = _prob(match.turnover_chance(handler)) / len(off)
+            rows.append(((TURNOVER, i, 0, STEAL, 0, 0), p * steal))
+            rows.append(((TURNOVER, i, 0, OFFENSIVE_FOUL, 0, 0), p * charge))
+            rows.append(((TURNOVER, i, 0, PLAIN, 0, 0), p * (1.0 - steal - charge)))
+            shot_share += 1.0 / len(off) - p
+        share = shot_share / len(off)
+
+        team_fouls = (0, params.bonus_threshold - 1, params.bonus_threshold)[bonus]
+        other_foul = [_prob(match.foul_chance(d, shooting=False, team_fouls=team_fouls)) for d in de]
+        help_weights = [d.selection_weights()['help_defense'] for d in de]
+        help_total = sum(help_weights)
+        help_share = [w / help_total for w in help_weights]
+        fouls = [0.0] * len(de)
+        boost = round((1.0 + 0.1 * offense.team_boost) / BOOST_STEP)
+        r = params.random_defender_rate
+        oreb = params.oreb_rate
+        blocked = params.block_rate
+        slopes = []
+        for i, shooter in enumerate(off):
+            same = [j for j, d in enumerate(de) if d.position == shooter.position]
+            if same:
+                matchup = [r * h for h in help_share]
+                for j in same:
+                    matchup[j] += (1.0 - r) / len(same)
+            else:
+                matchup = help_share
+            made = [0.0] * 4
+            missed = [0.0, 0.0]
+            lost = [0.0, 0.0]
+            for j, pj in enumerate(matchup):
+                if pj == 0.0:
+                    continue
+                ft2, ft3, clean, m2, m2a, m3, m3a, x2, x3, d2, d3 = self.matchup(match, shooter, de[j], boost)
+                p = share * pj
+                if bonus != NO_BONUS:
+                    ft2 += clean * other_foul[j]
+                else:
+                    fouls[j] += p * clean * other_foul[j]
+                rows.append(((FREE_THROWS, i, j, 2, 0, 0), p * ft2))
+                rows.append(((FREE_THROWS, i, j, 3, 0, 0), p * ft3))
+                p *= 1.0 - other_foul[j]
+                made[0] += p * m2
+                made[1] += p * m2a
+                made[2] += p * m3
+                made[3] += p * m3a
+                missed[0] += p * x2
+                missed[1] += p * x3
+                lost[0] += p * d2
+                lost[1] += p * d3
+            for k, (points, assisted) in enumerate(((2, 0), (2, 1), (3, 0), (3, 1))):
+                rows.append(((MADE, i, 0, points, assisted, 0), made[k]))
+            for three in (0, 1):
+                for block, pb in ((1, blocked), (0, 1.0 - blocked)):
+                    rows.append(((MISSED, i, 0, three, block, 1), missed[three] * pb * oreb))
+                    rows.append(((MISSED, i, 0, three, block, 0), missed[three] * pb * (1.0 - oreb)))
+            made2, made3 = made[0] + made[1], made[2] + made[3]
+            slopes.append((lost[0] / made2 if made2 else 0.0, lost[1] / made3 if made3 else 0.0))
+        for j, p in enumerate(fouls):
+            rows.append(((FOUL, 0, j, 0, 0, 0), p))
+
+        # Outcome tuples repeat across tables; keep one copy of each
+        intern = self._outcomes.setdefault
+        outcomes, cum_weights, acc = [], [], 0.0
+        for outcome, p in rows:
+            if p > 0.0:
+                acc += p
+                outcomes.append(intern(outcome, outcome))
+                cum_weights.append(acc)
+        return OutcomeTable(tuple(outcomes), tuple(cum_weights), tuple(slopes))
+
+
+# --------------------------------------------------------------------
+# Lazy rotation
+# --------------------------------------------------------------------
+
+class LazyTeamRotation(TeamRotation):
+    """
+    TeamRotation keeping on-court stamina and minutes as (clock, stamina,
+    seconds played) anchors. The substitution pass runs when the next player
+    can cross sub_out_stamina, after touch() (a foul) or on a new quarter;
+    materialize() writes stamina, fatigue and minutes back to the players.
+    """
+    def __init__(self, match, team, params):
+        super().__init__(match, team, params)
+        self.played = 0.0           # game seconds ticked (self.clock also counts breaks)
+        self._rates: Dict[Player, float] = {}
+        self._on: Dict[Player, Tuple[float, float, float]] = {}
+        self._next_check = -1.0
+        self._quarter: Optional[int] = None
+        for p in team.lineup:
+            self._enter(p)
+
+    def _rate(self, player: Player) -> float:
+        rate = self._rates.get(player)
+        if rate is None:
+            rate = self._rates[player] = self.params.stamina_drain * (1.6 - player.attributes.stamina / 100.0)
+        return rate
+
+    def _enter(self, player: Player):
+        self._on[player] = (self.clock, player.stamina, self.played)
+
+    def stamina(self, player: Player) -> float:
+        clock, stamina, _ = self._on[player]
+        return max(0.0, stamina - self._rate(player) * (self.clock - clock))
+
+    def fatigue(self, player: Player) -> float:
+        return 1.0 - self.stamina(player) / 100.0
+
+    def materialize(self):
+        for p in self.team.lineup:
+            p.stamina = self.stamina(p)
+            p.fatigue = 1.0 - p.stamina / 100.0
+            p.stats['MIN'] += (self.played - self._on[p][2]) / 60.0
+            self._enter(p)
+
+    def touch(self):
+        self._next_check = -1.0
+
+    def foul(self, player: Player):
+        player.stats['FOUL'] += 1
+        player.fouls += 1
+        if player.fouls >= min(self.foul_limit(self.match.quarter), self.params.foul_out):
+            self._next_check = -1.0
+
+    def rest(self, seconds: float):
+        self.materialize()
+        super().rest(seconds)
+        for p in self.team.lineup:
+            self._enter(p)
+
+    def tick(self, seconds: float, quarter: int):
+        self.clock += seconds
+        self.played += seconds
+        if self.clock <= self._next_check and quarter == self._quarter:
+            return
+        self._quarter = quarter
+        self.materialize()
+        foul_limit = self.foul_limit(quarter)
+        before = list(self.team.lineup)
+        pending = False
+        for p in before:
+            pending = self.check(p, foul_limit) or pending
+        for p in before:
+            if not p.on_court:
+                del self._on[p]
+        for p in self.team.lineup:
+            if p not in self._on:
+                self._enter(p)
+        self._schedule(foul_limit, pending)
+
+    def _schedule(self, foul_limit: int, pending: bool):
+        # Next clock at which check() can act: an on-court player tiring or,
+        # when someone is due off, a bench player becoming ready
+        params = self.params
+        sub_out = params.sub_out_stamina
+        times = [self.clock + (p.stamina - sub_out) / self._rate(p)
+                 for p in self.team.lineup if p.stamina >= sub_out and self._rate(p) > 0.0]
+        if pending:
+            times.append(self.ready_at(foul_limit))
+        self._next_check = min(times, default=math.inf)
+
+
+class LazyRotationManager(RotationManager):
+    team_rotation = LazyTeamRotation
+
+    def materialize(self):
+        for rotation in self.teams:
+            rotation.materialize()
+
+    def touch(self):
+        for rotation in self.teams:
+            rotation.touch()
+
+
+# --------------------------------------------------------------------
+# Match
+# --------------------------------------------------------------------
+
+class CoarseMatch(Match):
+    """
+    Match whose half-court possessions are single draws from outcome tables.
+    Play-by-play is not produced (this is always a fast-mode match).
+    """
+    rotation_manager = LazyRotationManager
+
+    def __init__(self, team_a: Team, team_b: Team, *, tables: Optional[OutcomeTables] = None,
+                 params: Optional[EngineParams] = None, instrumentation=None, rng=None, seed: Optional[int] = None,
+                 copy_teams: bool = False):
+        if tables is None:
+            tables = OutcomeTables(params)
+        elif params is not None and params is not tables.params and params.fingerprint() != tables.params.fingerprint():
+            raise ValueError("params differ from the OutcomeTables params")
+        self.tables = tables
+        # Per offense: table in use, reused until a lineup or the bonus state changes
+        self._current: Dict[str, tuple] = {}
+        super().__init__(team_a, team_b, instrumentation=instrumentation, params=tables.params, logged=False,
+                         rng=rng, seed=seed, copy_teams=copy_teams)
+
+    def init_lineups(self):
+        super().init_lineups()
+        self._current.clear()
+        self._rotations = {r.team.name: r for r in self.rotation.teams}
+
+    def update_minutes_played(self):
+        # minutes are credited per stint by LazyTeamRotation
+        self.rotation.tick(self._last_possession_time, self.quarter)
+
+    def finish(self):
+        self.rotation.materialize()
+        super().finish()
+
+    def _table(self, offense: Team, defense: Team):
+        bonus = bonus_state(self.team_fouls[defense.name][self.quarter], self.params.bonus_threshold)
+        off_tables, def_tables = offense.tables, defense.tables
+        current = self._current.get(offense.name)
+        if current is None or current[0] is not off_tables or current[1] is not def_tables or current[2] != bonus:
+            off, de = sorted(offense.lineup, key=by_name), sorted(defense.lineup, key=by_name)
+            table = self.tables.get(self, offense, defense, off, de, bonus)
+            current = self._current[offense.name] = (off_tables, def_tables, bonus, table, off, de)
+        return current[3], current[4], current[5]
+
+    def _add_points(self, team: Team, points: int):
+        team.score += points
+        team.quarter_scores[self.quarter] += points
+
+    def _rebound(self, team: Team):
+        tables = team.tables
+        self.rng.weighted(tables.players, tables.rebound).stats['REB'] += 1
+
+    def _foul(self, defense: Team, fouler: Player):
+        self._rotations[defense.name].foul(fouler)
+        self.team_fouls[defense.name][self.quarter] += 1
+
+    def _miss(self, offense: Team, defense: Team, shooter: Player, three: bool, blocked: bool, offensive: bool):
+        stats = shooter.stats
+        stats['FGA'] += 1
+        if three:
+            stats['3PA'] += 1
+        if blocked:
+            tables = defense.tables
+            self.rng.weighted(tables.players, tables.block).stats['BLK'] += 1
+        if offensive:
+            self._rebound(offense)
+            self.last_event = "offensive_rebound"
+            self.shot_clock = max(self.shot_clock, 14)
+        else:
+            self._rebound(defense)
+            self.set_possession(defense)
+
+    def play_trip(self, fast_break: bool):
+        if fast_break or self.time_remaining < 24:
+            self.rotation.materialize()
+            super().play_trip(fast_break)
+            self.rotation.touch()
+            return
+        rng = self.rng
+        params = self.params
+        offense = self.possession_team
+        defense = self.get_defensive_team()
+        table, off, de = self._table(offense, defense)
+        kind, i, j, a, b, c = rng.weighted(table.outcomes, table.cum_weights)
+        self.instrumentation.event("coarse_possession")
+
+        if kind == MADE:
+            shooter = off[i]
+            fatigue = self._rotations[offense.name].fatigue(shooter)
+            if fatigue and rng.random() < fatigue * table.fatigue_slopes[i][a == 3]:
+                # Tired legs: the rested make becomes a miss
+                self._miss(offense, defense, shooter, a == 3, rng.random() < params.block_rate,
+                           rng.random() < params.oreb_rate)
+                return
+            stats = shooter.stats
+            stats['FGA'] += 1
+            stats['FGM'] += 1
+            stats['PTS'] += a
+            if a == 3:
+                stats['3PA'] += 1
+                stats['3PM'] += 1
+            self._add_points(offense, a)
+            if b:
+                mates, cum_weights = offense.tables.assist[offense.lineup.index(shooter)]
+                rng.weighted(mates, cum_weights).stats['AST'] += 1
+            self.set_possession(defense)
+        elif kind == MISSED:
+            self._miss(offense, defense, off[i], a, b, c)
+        elif kind == FREE_THROWS:
+            shooter = off[i]
+            self._foul(defense, de[j])
+            made, last_missed = rng.weighted(*self.tables.trip(shooter, a))
+            stats = shooter.stats
+            stats['FTA'] += a
+            stats['FTM'] += made
+            stats['PTS'] += made
+            self._add_points(offense, made)
+            if last_missed and rng.random() < params.ft_oreb_rate:
+                self._rebound(offense)
+                self.last_event = "offensive_rebound"
+                self.shot_clock = max(self.shot_clock, 14)
+            else:
+                if last_missed:
+                    self._rebound(defense)
+                self.set_possession(defense)
+        elif kind == FOUL:
+            # Outside the bonus: whistle, the offense keeps the ball
+            self._foul(defense, de[j])
+            self.last_event = "non_shooting_foul"
+            self.shot_clock = max(self.shot_clock, 14)
+        else:
+            handler = off[i]
+            handler.stats['TO'] += 1
+            if a == STEAL:
+                rng.choice(defense.lineup).stats['STL'] += 1
+            elif a == OFFENSIVE_FOUL:
+                self._rotations[offense.name].foul(handler)
+            self.set_possession(defense)
@@ -0,0 +1,213 @@
+# dynasty.py
+# Consecutive seasons with player aging, development, decline and retirement.
+#
+# All progression is array math over the league attribute matrix: one
+# (players, 24) delta per off-season from each player's age, their
+# development factor and noise. The persistent Player objects then get their
+# new attributes and their rating caches are re-primed in one bulk call from
+# League.ratings(). Each season is kept as a small compressed .npz snapshot
+# (attributes quantized to 0.1, ages, ids, standings).
+#
+#   dynasty = Dynasty(generate_league(30, seed=1), seed=1, snapshot_dir="dynasty")
+#   for year in dynasty.run(20, workers=8):
+#       print(year.format())
+
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from league_generator import (
+    ATTRIBUTE_INDEX, ATTRIBUTE_MAX, ATTRIBUTE_MIN, ATTRIBUTE_NAMES, POSITIONS, League, draw_attributes,
+)
+from multiball_basketball import EngineParams, Player, PlayerAttributes, invalidate_ratings
+from season import Standings, round_robin, simulate_season
+
+# Aging curve per attribute group: (peak age, growth per year before the
+# peak, decline per year after it). Growth tapers over the last four years
+# before the peak; decline steepens over the six after it.
+ATTRIBUTE_GROUPS = {
+    'physical': ('grip_strength', 'arm_strength', 'core_strength', 'agility', 'acceleration', 'top_speed',
+                 'jumping', 'reactions', 'stamina', 'balance'),
+    'skill': ('hand_eye_coordination', 'throw_accuracy', 'form_technique', 'finesse'),
+    'mental': ('awareness', 'creativity', 'determination', 'bravery', 'consistency', 'composure',
+               'deception', 'teamwork', 'patience'),
+}
+AGING_CURVES = {
+    'physical': (26.0, 2.0, 1.8),
+    'skill': (28.0, 2.5, 1.0),
+    'mental': (31.0, 1.5, 0.6),
+}
+PROGRESSION_NOISE_SD = 1.0
+DEVELOPMENT_SD = 0.25       # lognormal spread of per-player growth multipliers
+
+START_AGES = (20, 35)       # initial ages, uniform integers [lo, hi)
+ROOKIE_AGES = (19, 23)
+ROOKIE_DISCOUNT = 8.0       # rookies start this far below a league-average draw
+RETIREMENT_AGE = 37
+LATE_RETIREMENT_AGE = 33
+LATE_RETIREMENT_RATE = 0.25
+
+SNAPSHOT_SCALE = 10         # attributes stored as uint16 tenths
+
+
+def _curve_vectors() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    peak, growth, decline = (np.zeros(len(ATTRIBUTE_NAMES)) for _ in range(3))
+    for group, names in ATTRIBUTE_GROUPS.items():
+        idx = [ATTRIBUTE_INDEX[n] for n in names]
+        peak[idx], growth[idx], decline[idx] = AGING_CURVES[group]
+    return peak, growth, decline
+
+
+def progression(ages: np.ndarray, development: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """(players, 24) attribute change for one off-season; height never changes."""
+    peak, growth, decline = _curve_vectors()
+    age = ages[:, None].astype(float)
+    up = growth * np.minimum(peak - age, 4.0) / 4.0 * development[:, None]
+    down = -decline * np.minimum(age - peak, 6.0) / 3.0
+    delta = np.where(age < peak, up, down)
+    delta += rng.normal(0.0, PROGRESSION_NOISE_SD, size=delta.shape)
+    delta[:, ATTRIBUTE_INDEX['height']] = 0.0
+    return delta
+
+
+@dataclass
+class SeasonSummary:
+    year: int
+    team_names: List[str]
+    standings: Standings
+    mean_age: float
+    retired: int
+
+    def format(self) -> str:
+        order = np.argsort(-self.standings.wins, kind='stable')
+        best, worst = order[0], order[-1]
+        s = self.standings
+        return (f"Year {self.year}: best {self.team_names[best]} {s.wins[best]}-{s.losses[best]}, "
+                f"worst {self.team_names[worst]} {s.wins[worst]}-{s.losses[worst]}, "
+                f"mean age {self.mean_age:.1f}, {self.retired} retired")
+
+
+class Dynasty:
+    def __init__(self, league: League, *, seed: int = 0, params: Optional[EngineParams] = None,
+                 cycles: int = 2, backend: str = "python", snapshot_dir: Optional[str] = None,
+                 name_format: str = "P{id:05d}"):
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.params = params
+        self.cycles = cycles
+        self.backend = backend
+        self.snapshot_dir = snapshot_dir
+        self.name_format = name_format
+        self.league = league
+        self.year = 0
+        n = league.num_players
+        self.ages = self.rng.integers(*START_AGES, size=n)
+        self.development = self.rng.lognormal(0.0, DEVELOPMENT_SD, size=n)
+        self._next_id = int(league.player_ids.max()) + 1
+        # Persistent objects, updated in place between seasons
+        self.teams = league.teams()
+        self.players: List[Player] = [p for t in self.teams for p in t.roster]
+        invalidate_ratings(self.players, league.ratings().tolist())
+
+    # ---------- Off-season ----------
+    def _retire(self) -> np.ndarray:
+        late = (self.ages >= LATE_RETIREMENT_AGE) & (self.rng.random(len(self.ages)) < LATE_RETIREMENT_RATE)
+        return np.flatnonzero((self.ages >= RETIREMENT_AGE) | late)
+
+    def offseason(self) -> int:
+        """Age, develop and retire players (rookies take the retired slots); returns retirements."""
+        league = self.league
+        attrs = league.attributes + progression(self.ages, self.development, self.rng)
+        np.clip(attrs, ATTRIBUTE_MIN, ATTRIBUTE_MAX, out=attrs)
+        self.ages = self.ages + 1
+
+        retired = self._retire()
+        ids, names = league.player_ids.copy(), list(league.names)
+        if len(retired):
+            pos_codes = np.array([POSITIONS.index(p) for p in league.positions[retired]])
+            rookies = draw_attributes(self.rng, pos_codes)
+            height = ATTRIBUTE_INDEX['height']
+            rookies[:, :height] -= ROOKIE_DISCOUNT
+            rookies[:, height + 1:] -= ROOKIE_DISCOUNT
+            attrs[retired] = np.clip(rookies, ATTRIBUTE_MIN, ATTRIBUTE_MAX)
+            self.ages[retired] = self.rng.integers(*ROOKIE_AGES, size=len(retired))
+            self.development[retired] = self.rng.lognormal(0.0, DEVELOPMENT_SD, size=len(retired))
+            new_ids = np.arange(self._next_id, self._next_id + len(retired))
+            self._next_id += len(retired)
+            ids[retired] = new_ids
+            for i, pid in zip(retired, new_ids):
+                names[i] = self.name_format.format(id=int(pid))
+        self.league = replace(league, attributes=attrs, player_ids=ids, names=names)
+        self._sync(retired)
+        return len(retired)
+
+    def _sync(self, retired: np.ndarray):
+        # Push the matrix into the persistent Player objects, then re-prime every rating cache at once
+        rows = self.league.attributes.tolist()
+        names = self.league.names
+        for i, p in enumerate(self.players):
+            p.attributes = PlayerAttributes(*rows[i])
+        for i in retired:
+            self.players[i].name = names[i]
+        invalidate_ratings(self.players, self.league.ratings().tolist())
+
+    # ---------- Seasons ----------
+    def play_season(self, workers: Optional[int] = None) -> SeasonSummary:
+        self.year += 1
+        schedule = round_robin(self.league.num_teams, self.cycles, seed=(self.seed, self.year))
+        results = simulate_season(self.teams, schedule, params=self.params, backend=self.backend, workers=workers)
+        standings = results.standings()
+        summary = SeasonSummary(self.year, list(self.league.team_names), standings, float(self.ages.mean()), 0)
+        if self.snapshot_dir is not None:
+            self.save_snapshot(os.path.join(self.snapshot_dir, f"season_{self.year:03d}.npz"), standings)
+        return summary
+
+    def run(self, seasons: int, workers: Optional[int] = None) -> Iterator[SeasonSummary]:
+        for _ in range(seasons):
+            retired = self.offseason() if self.year else 0
+            summary = self.play_season(workers)
+            summary.retired = retired
+            yield summary
+
+    # ---------- Snapshots ----------
+    def save_snapshot(self, path: str, standings: Optional[Standings] = None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays: Dict[str, np.ndarray] = dict(
+            year=np.array(self.year, dtype=np.int16),
+            attributes=np.round(self.league.attributes * SNAPSHOT_SCALE).astype(np.uint16),
+            ages=self.ages.astype(np.uint8),
+            player_ids=self.league.player_ids.astype(np.int32),
+            positions=np.array([POSITIONS.index(p) for p in self.league.positions], dtype=np.uint8),
+            roster_size=np.array(self.league.roster_size, dtype=np.int16),
+            team_names=np.array(self.league.team_names),
+            name_format=np.array(self.name_format),
+        )
+        if standings is not None:
+            arrays.update(wins=standings.wins.astype(np.int16), losses=standings.losses.astype(np.int16),
+                          points_for=standings.points_for.astype(np.int32),
+                          points_against=standings.points_against.astype(np.int32))
+        np.savez_compressed(path, **arrays)
+
+
+def load_snapshot(path: str) -> Tuple[League, np.ndarray, Optional[Standings]]:
+    """(league, ages, standings or None) from a save_snapshot file."""
+    with np.load(path) as z:
+        ids = z['player_ids'].astype(np.int64)
+        roster_size = int(z['roster_size'])
+        name_format = str(z['name_format'])
+        league = League(
+            attributes=z['attributes'].astype(float) / SNAPSHOT_SCALE,
+            positions=np.array(POSITIONS)[z['positions']],
+            player_ids=ids,
+            names=[name_format.format(id=int(i)) for i in ids],
+            team_of=np.repeat(np.arange(len(z['team_names'])), roster_size),
+            team_names=z['team_names'].tolist(),
+            roster_size=roster_size,
+        )
+        standings = None
+        if 'wins' in z:
+            standings = Standings(z['wins'].astype(np.int64), z['losses'].astype(np.int64),
+                                  z['points_for'].astype(np.int64), z['points_against'].astype(np.int64))
+        return league, z['ages'].astype(np.int64), standings
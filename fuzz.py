@@ -0,0 +1,169 @@
+# fuzz.py
+# In-process seed fuzzing against the tools/validate_log.py rules.
+#
+# Seed s fixes both rosters (the test harness's Testers/Debuggers ranges) and
+# the game's random stream, so every failure is reproducible from its seed.
+# Failures are grouped by error category (the message with line numbers,
+# player ids and team names masked); for each category the report gives the
+# smallest failing seed and the shortest play-by-play prefix that still
+# reproduces it.
+#
+#   python fuzz.py --seeds 10000 --workers 8
+#   python fuzz.py --repro 4711 --prefix 312
+
+import argparse
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from calibration import seeded_team
+from multiball_basketball import EngineParams, Match
+from rng import make_rng
+from tools.validate_log import TEAM_TAGS, validate_lines
+
+re_line_no = re.compile(r"^Line \d+: ")
+re_player = re.compile(r"\b[TD]\d+\b")
+re_team = re.compile("|".join(TEAM_TAGS))
+re_number = re.compile(r"\d+")
+
+
+def category(message: str) -> str:
+    message = re_line_no.sub("", message)
+    message = re_player.sub("<player>", message)
+    message = re_team.sub("<team>", message)
+    return re_number.sub("<n>", message)
+
+
+def play_game(seed: int, params: Optional[EngineParams] = None, backend: str = "python") -> List[str]:
+    """Play-by-play of fuzz seed `seed`."""
+    rng = random.Random(seed)
+    team_a = seeded_team(rng, TEAM_TAGS[0], "T")
+    team_b = seeded_team(rng, TEAM_TAGS[1], "D")
+    return Match(team_a, team_b, params=params, rng=make_rng(seed, backend=backend)).simulate().play_by_play
+
+
+def shortest_prefix(lines: Sequence[str], cat: str) -> int:
+    """
+    Fewest leading lines whose validation still raises `cat`. The validator
+    walks lines in order, so an error seen in a prefix stays in every longer
+    one and the length can be bisected.
+    """
+    def fails(k):
+        return any(category(e) == cat for e in validate_lines(lines[:k]))
+
+    lo, hi = 1, len(lines)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if fails(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+@dataclass
+class Repro:
+    seed: int
+    prefix: int     # play-by-play lines needed
+    message: str
+
+
+@dataclass
+class CategoryReport:
+    category: str
+    games: int = 0              # failing games
+    smallest_seed: Optional[Repro] = None
+    shortest: Optional[Repro] = None
+
+    def add(self, repro: Repro, games: int = 1):
+        self.games += games
+        if self.smallest_seed is None or repro.seed < self.smallest_seed.seed:
+            self.smallest_seed = repro
+        if self.shortest is None or (repro.prefix, repro.seed) < (self.shortest.prefix, self.shortest.seed):
+            self.shortest = repro
+
+    def merge(self, other: "CategoryReport"):
+        self.games += other.games
+        for repro in (other.smallest_seed, other.shortest):
+            self.add(repro, games=0)
+
+
+def _fuzz_chunk(seeds: Sequence[int], params: Optional[EngineParams], backend: str,
+                play: Callable) -> Tuple[int, Dict[str, CategoryReport]]:
+    reports: Dict[str, CategoryReport] = {}
+    for seed in seeds:
+        lines = play(seed, params, backend)
+        first: Dict[str, str] = {}
+        for message in validate_lines(lines):
+            first.setdefault(category(message), message)
+        for cat, message in first.items():
+            reports.setdefault(cat, CategoryReport(cat)).add(Repro(seed, shortest_prefix(lines, cat), message))
+    return len(seeds), reports
+
+
+@dataclass
+class FuzzReport:
+    games: int = 0
+    categories: Dict[str, CategoryReport] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.categories)
+
+    def format(self) -> str:
+        if not self.categories:
+            return f"{self.games} games, no validator failures"
+        lines = [f"{self.games} games, {len(self.categories)} failure categories"]
+        for rep in sorted(self.categories.values(), key=lambda r: -r.games):
+            s, p = rep.smallest_seed, rep.shortest
+            lines.append(f"\n[{rep.games} games] {rep.category}")
+            lines.append(f"  smallest seed: {s.seed} (prefix {s.prefix} lines)  {s.message}")
+            lines.append(f"  shortest:      {p.seed} (prefix {p.prefix} lines)  {p.message}")
+        return "\n".join(lines)
+
+
+def fuzz(seeds: Sequence[int], *, params: Optional[EngineParams] = None, backend: str = "python",
+         workers: Optional[int] = None, chunk_size: int = 50, play: Callable = play_game) -> FuzzReport:
+    """Simulate and validate every seed (in parallel unless workers=1)."""
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    if workers == 1:
+        parts = [_fuzz_chunk(chunk, params, backend, play) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_fuzz_chunk, chunks, *zip(*[(params, backend, play)] * len(chunks))))
+    report = FuzzReport()
+    for games, reports in parts:
+        report.games += games
+        for cat, rep in reports.items():
+            if cat in report.categories:
+                report.categories[cat].merge(rep)
+            else:
+                report.categories[cat] = rep
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fuzz the engine against the play-by-play validator.")
+    ap.add_argument("--seeds", type=int, default=2000, help="number of seeds to try")
+    ap.add_argument("--start", type=int, default=0, help="first seed")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--rng", choices=("python", "pcg64", "philox"), default="python")
+    ap.add_argument("--repro", type=int, default=None, help="print the play-by-play of one seed")
+    ap.add_argument("--prefix", type=int, default=None, help="with --repro: only the first N lines")
+    args = ap.parse_args(argv)
+
+    if args.repro is not None:
+        lines = play_game(args.repro, backend=args.rng)[:args.prefix]
+        print("\n".join(lines))
+        for message in validate_lines(lines):
+            print(f"! {message}")
+        return
+    report = fuzz(range(args.start, args.start + args.seeds), backend=args.rng, workers=args.workers)
+    print(report.format())
+    raise SystemExit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# game_night.py
+# Many live games on one asyncio event loop, published to socket subscribers.
+#
+# Each Match is driven through Match.run(): after every possession its new
+# play-by-play lines go out as one newline-delimited JSON message, and the game
+# then sleeps until the wall clock catches up with its game clock
+# (clock_ratio game seconds per wall second; 0 = as fast as possible).
+#
+# Every message is encoded once and shared by all subscribers. Each subscriber
+# has a bounded queue and a writer task; when a consumer falls behind, its
+# queue overflows and the subscriber's policy applies:
+#   drop_oldest  discard the oldest queued message (a "dropped" notice is sent)
+#   drop_newest  discard the incoming message (a "dropped" notice is sent)
+#   disconnect   close the connection
+#
+#   python game_night.py --games 12 --ratio 60 --port 8765
+#   nc 127.0.0.1 8765
+
+import argparse
+import asyncio
+import json
+import random
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from multiball_basketball import Match
+
+POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+WRITE_BUFFER_HIGH = 64 * 1024
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode() + b"\n"
+
+
+class Subscriber:
+    def __init__(self, writer: Optional[asyncio.StreamWriter], maxsize: int = 1000, policy: str = "drop_oldest"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}")
+        self.writer = writer
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queue: deque = deque()
+        self.dropped = 0        # total over the connection
+        self._unreported = 0    # dropped since the last notice
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def offer(self, data: bytes) -> bool:
+        """Queue one message without blocking; False once the subscriber is closed."""
+        if self.closed:
+            return False
+        if len(self.queue) >= self.maxsize:
+            if self.policy == "disconnect":
+                self.close()
+                return False
+            self.dropped += 1
+            self._unreported += 1
+            if self.policy == "drop_newest":
+                return True
+            self.queue.popleft()
+        self.queue.append(data)
+        self._ready.set()
+        return True
+
+    def close(self):
+        self.closed = True
+        self.queue.clear()
+        self._ready.set()
+        if self.writer is not None:
+            self.writer.close()
+
+    def finish(self):
+        # Stop after what is already queued has been written
+        self.queue.append(None)
+        self._ready.set()
+
+    async def pump(self):
+        writer = self.writer
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                batch = list(self.queue)
+                self.queue.clear()
+                done = batch and batch[-1] is None
+                if done:
+                    batch.pop()
+                if self._unreported:
+                    batch.insert(0, encode({"type": "dropped", "count": self._unreported}))
+                    self._unreported = 0
+                if batch:
+                    writer.write(b"".join(batch))
+                    await writer.drain()
+                if done:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if not self.closed:
+                self.close()
+
+
+class GameNight:
+    def __init__(self, clock_ratio: float = 60.0, *, queue_size: int = 1000, policy: str = "drop_oldest"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}")
+        self.clock_ratio = clock_ratio
+        self.queue_size = queue_size
+        self.policy = policy
+        self.games: Dict[int, Match] = {}
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.disconnected = 0
+        self._pumps: List[asyncio.Task] = []
+        self._server = None
+
+    def add_game(self, match: Match) -> int:
+        if not match.logged:
+            raise ValueError("GameNight publishes play-by-play; the Match must be logged")
+        game_id = len(self.games) + 1
+        self.games[game_id] = match
+        return game_id
+
+    # ---------- Subscribers ----------
+    def publish(self, message: dict):
+        data = encode(message)
+        self.published += 1
+        for sub in list(self.subscribers):
+            if not sub.offer(data):
+                self.subscribers.discard(sub)
+                self.disconnected += 1
+
+    def attach(self, writer: Optional[asyncio.StreamWriter]) -> Subscriber:
+        sub = Subscriber(writer, self.queue_size, self.policy)
+        self.subscribers.add(sub)
+        return sub
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        sub = self.attach(writer)
+        writer.write(encode({"type": "hello", "games": {gid: [m.team_a.name, m.team_b.name]
+                                                        for gid, m in self.games.items()}}))
+        task = asyncio.current_task()
+        self._pumps.append(task)
+        try:
+            await sub.pump()
+        finally:
+            self.subscribers.discard(sub)
+            self._pumps.remove(task)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0, *, path: Optional[str] = None):
+        """Start listening (TCP on localhost, or a Unix socket at `path`); returns the server."""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=path, backlog=4096)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port, backlog=4096)
+        return self._server
+
+    # ---------- Games ----------
+    async def _play(self, game_id: int, match: Match):
+        loop = asyncio.get_running_loop()
+        self.publish({"type": "start", "game": game_id, "home": match.team_a.name, "away": match.team_b.name})
+        start = loop.time()
+        elapsed = 0.0
+        sent = 0
+        for seconds in match.run():
+            elapsed += seconds
+            lines = match.play_by_play[sent:]
+            sent = len(match.play_by_play)
+            self.publish({"type": "possession", "game": game_id, "quarter": match.quarter,
+                          "clock": match.format_time(), "score": [match.team_a.score, match.team_b.score],
+                          "lines": lines})
+            if self.clock_ratio > 0:
+                await asyncio.sleep(max(0.0, start + elapsed / self.clock_ratio - loop.time()))
+            else:
+                await asyncio.sleep(0)
+        self.publish({"type": "final", "game": game_id, "score": [match.team_a.score, match.team_b.score],
+                      "lines": match.play_by_play[sent:]})
+
+    async def run(self, *, linger: float = 5.0):
+        """
+        Play every added game concurrently, then send "end", give subscribers up
+        to `linger` seconds to drain, and close the server.
+        """
+        await asyncio.gather(*(self._play(gid, m) for gid, m in self.games.items()))
+        self.publish({"type": "end"})
+        if self._server is not None:
+            self._server.close()
+        for sub in self.subscribers:
+            sub.finish()
+        if self._pumps:
+            await asyncio.wait(list(self._pumps), timeout=linger)
+        for sub in list(self.subscribers):
+            sub.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+
+
+def main(argv=None):
+    from calibration import seeded_team
+
+    ap = argparse.ArgumentParser(description="Serve a night of live games over a local socket.")
+    ap.add_argument("--games", type=int, default=12)
+    ap.add_argument("--ratio", type=float, default=60.0, help="game seconds per wall second (0 = unpaced)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", default=None, help="serve on a Unix socket path instead of TCP")
+    ap.add_argument("--queue-size", type=int, default=1000)
+    ap.add_argument("--policy", choices=POLICIES, default="drop_oldest")
+    ap.add_argument("--wait", type=float, default=5.0, help="seconds to wait for subscribers before tip-off")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    async def night():
+        rng = random.Random(args.seed)
+        server = GameNight(args.ratio, queue_size=args.queue_size, policy=args.policy)
+        for g in range(args.games):
+            home = seeded_team(rng, f"Home{g + 1}", f"H{g + 1}_")
+            away = seeded_team(rng, f"Away{g + 1}", f"A{g + 1}_")
+            server.add_game(Match(home, away, seed=rng.randrange(2 ** 31)))
+        await server.serve(args.host, args.port, path=args.unix)
+        print(f"Serving {args.games} games on {args.unix or f'{args.host}:{args.port}'}")
+        await asyncio.sleep(args.wait)
+        await server.run()
+        print(f"{server.published} messages published, {server.disconnected} slow consumers disconnected")
+
+    asyncio.run(night())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# instrumentation.py
+# Opt-in per-phase timers and event counters for the Match engine.
+
+from time import perf_counter
+from typing import Dict, Iterable, Optional
+
+# Hot-path phases timed inside a possession (order is the report order)
+PHASES = (
+    "shot_selection",
+    "defender_selection",
+    "foul_check",
+    "shot_resolution",
+    "assist",
+    "rebound",
+    "logging",
+    "possession_change",
+)
+
+
+class NullInstrumentation:
+    """
+    Default hooks used by Match when instrumentation is off. Every method is a
+    no-op so the engine never branches on whether it is being measured.
+    """
+    enabled = False
+
+    def begin_match(self):
+        pass
+
+    def start(self) -> float:
+        return 0.0
+
+    def stop(self, phase: str, t0: float):
+        pass
+
+    def event(self, kind: str):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class Instrumentation(NullInstrumentation):
+    """
+    Collects call counts and cumulative wall time per phase, plus a count of
+    every logged event type. Pass one instance to many matches to aggregate,
+    or merge per-match instances afterwards.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.matches = 0
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.events: Dict[str, int] = {}
+
+    def begin_match(self):
+        self.matches += 1
+
+    def start(self) -> float:
+        return perf_counter()
+
+    def stop(self, phase: str, t0: float):
+        self.seconds[phase] += perf_counter() - t0
+        self.calls[phase] += 1
+
+    def event(self, kind: str):
+        self.events[kind] = self.events.get(kind, 0) + 1
+
+    # ---------- Aggregation / reporting ----------
+    def merge(self, other: "Instrumentation") -> "Instrumentation":
+        self.matches += other.matches
+        for phase, n in other.calls.items():
+            self.calls[phase] = self.calls.get(phase, 0) + n
+        for phase, s in other.seconds.items():
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + s
+        for kind, n in other.events.items():
+            self.events[kind] = self.events.get(kind, 0) + n
+        return self
+
+    @classmethod
+    def combined(cls, parts: Iterable["Instrumentation"]) -> "Instrumentation":
+        total = cls()
+        for part in parts:
+            total.merge(part)
+        return total
+
+    def report(self) -> dict:
+        """Plain-dict snapshot (JSON-serialisable) suitable for storing and diffing."""
+        return {
+            "matches": self.matches,
+            "phases": {
+                phase: {"calls": self.calls.get(phase, 0), "seconds": self.seconds.get(phase, 0.0)}
+                for phase in sorted(set(self.calls) | set(self.seconds), key=_phase_order)
+            },
+            "events": dict(sorted(self.events.items())),
+        }
+
+    def format_report(self) -> str:
+        return format_report(self.report())
+
+
+def _phase_order(phase: str):
+    return (PHASES.index(phase), phase) if phase in PHASES else (len(PHASES), phase)
+
+
+def _per_match(value: float, matches: int) -> float:
+    return value / matches if matches else float(value)
+
+
+def format_report(report: dict) -> str:
+    matches = report.get("matches", 0)
+    lines = [f"--- Instrumentation ({matches} matches) ---",
+             f"{'phase':<20}{'calls/match':>14}{'ms/match':>12}{'us/call':>10}"]
+    for phase, row in report["phases"].items():
+        calls, seconds = row["calls"], row["seconds"]
+        us_per_call = (seconds / calls * 1e6) if calls else 0.0
+        lines.append(f"{phase:<20}{_per_match(calls, matches):>14.1f}"
+                     f"{_per_match(seconds, matches) * 1e3:>12.3f}{us_per_call:>10.2f}")
+    lines.append(f"{'event':<20}{'count/match':>14}")
+    for kind, n in report["events"].items():
+        lines.append(f"{kind:<20}{_per_match(n, matches):>14.2f}")
+    return "\n".join(lines)
+
+
+def diff_reports(base: dict, new: dict, *, threshold: Optional[float] = None) -> str:
+    """
+    Per-match comparison of two report() dicts (e.g. two engine versions).
+    With threshold set, only rows whose relative change exceeds it are shown.
+    """
+    bm, nm = base.get("matches", 0), new.get("matches", 0)
+
+    def row(label, b, n, fmt):
+        b, n = _per_match(b, bm), _per_match(n, nm)
+        change = (n - b) / b if b else (0.0 if n == b else float("inf"))
+        if threshold is not None and abs(change) <= threshold:
+            return None
+        return f"{label:<28}{format(b, fmt):>12}{format(n, fmt):>12}{change:>+10.1%}"
+
+    lines = [f"{'per match':<28}{'base':>12}{'new':>12}{'change':>10}"]
+    phases = sorted(set(base["phases"]) | set(new["phases"]), key=_phase_order)
+    empty = {"calls": 0, "seconds": 0.0}
+    for phase in phases:
+        b, n = base["phases"].get(phase, empty), new["phases"].get(phase, empty)
+        lines.append(row(f"{phase} calls", b["calls"], n["calls"], ".1f"))
+        lines.append(row(f"{phase} ms", b["seconds"] * 1e3, n["seconds"] * 1e3, ".3f"))
+    for kind in sorted(set(base["events"]) | set(new["events"])):
+        lines.append(row(f"event {kind}", base["events"].get(kind, 0), new["events"].get(kind, 0), ".2f"))
+    return "\n".join(line for line in lines if line is not None)
@@ -0,0 +1,160 @@
+# league_generator.py
+# Seeded, vectorized synthetic rosters: whole leagues are drawn as NumPy
+# attribute matrices and only wrapped as Player/Team objects on demand.
+#
+#   league = generate_league(num_teams=30, roster_size=13, seed=7)
+#   home, away = league.team(0), league.team(1)   # fresh Player/Team objects
+
+from dataclasses import dataclass, fields, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from multiball_basketball import (
+    DEFENSE_RATING_WEIGHTS, OFFENSE_RATING_WEIGHTS, TEAM_BOOST_ATTRIBUTES, Player, PlayerAttributes, Team,
+)
+
+ATTRIBUTE_NAMES = tuple(f.name for f in fields(PlayerAttributes))
+ATTRIBUTE_INDEX = {name: i for i, name in enumerate(ATTRIBUTE_NAMES)}
+HEIGHT = ATTRIBUTE_INDEX['height']
+
+POSITIONS = ('G', 'F', 'C')
+# Roster order: starters first (lineup = roster[:5]), then a bench that keeps
+# every position covered for the rotation.
+ROSTER_POSITIONS = ('G', 'G', 'F', 'F', 'C', 'G', 'F', 'C', 'G', 'F', 'C', 'G', 'F', 'F', 'C')
+
+# Skill attributes are drawn around a league mean with a shared per-player
+# talent factor (so good players are good at several things) plus noise.
+ATTRIBUTE_MEAN = 66.0
+TALENT_SD = 6.0
+NOISE_SD = 9.0
+ATTRIBUTE_MIN, ATTRIBUTE_MAX = 30.0, 99.0
+
+# Position offsets on top of ATTRIBUTE_MEAN
+POSITION_OFFSETS = {
+    'G': {'agility': 6, 'acceleration': 6, 'top_speed': 5, 'finesse': 4, 'hand_eye_coordination': 4,
+          'creativity': 4, 'deception': 4, 'throw_accuracy': 4, 'form_technique': 3,
+          'core_strength': -4, 'grip_strength': -3, 'jumping': -2},
+    'F': {'balance': 2, 'jumping': 2, 'core_strength': 2, 'determination': 2, 'form_technique': 1},
+    'C': {'core_strength': 8, 'grip_strength': 6, 'arm_strength': 4, 'jumping': 4, 'balance': 3, 'bravery': 3,
+          'agility': -6, 'acceleration': -6, 'top_speed': -6, 'finesse': -3, 'throw_accuracy': -4},
+}
+
+# Height ranges in inches (uniform), by position
+HEIGHT_RANGES = {'G': (72.0, 78.0), 'F': (77.0, 82.0), 'C': (81.0, 87.0)}
+
+
+def _offset_matrix() -> np.ndarray:
+    offsets = np.zeros((len(POSITIONS), len(ATTRIBUTE_NAMES)))
+    for p, pos in enumerate(POSITIONS):
+        for name, delta in POSITION_OFFSETS[pos].items():
+            offsets[p, ATTRIBUTE_INDEX[name]] = delta
+    return offsets
+
+
+@dataclass
+class League:
+    attributes: np.ndarray        # (players, 24) in PlayerAttributes field order
+    positions: np.ndarray         # (players,) 'G' / 'F' / 'C'
+    player_ids: np.ndarray        # (players,) int
+    names: List[str]
+    team_of: np.ndarray           # (players,) team index
+    team_names: List[str]
+    roster_size: int
+
+    @property
+    def num_teams(self) -> int:
+        return len(self.team_names)
+
+    @property
+    def num_players(self) -> int:
+        return len(self.names)
+
+    def roster_indices(self, team: int) -> range:
+        # players are stored team-major, roster order within a team
+        start = team * self.roster_size
+        return range(start, start + self.roster_size)
+
+    def player(self, index: int) -> Player:
+        attrs = PlayerAttributes(*self.attributes[index].tolist())
+        return Player(self.names[index], attrs, position=str(self.positions[index]))
+
+    def team(self, team: int) -> Team:
+        """A fresh Team (clean stats) built from the current attribute matrix."""
+        return Team(self.team_names[team], [self.player(i) for i in self.roster_indices(team)])
+
+    def teams(self, indices: Optional[Sequence[int]] = None) -> List[Team]:
+        return [self.team(t) for t in (range(self.num_teams) if indices is None else indices)]
+
+    def ratings(self) -> np.ndarray:
+        """(players, 3) Player.ratings() for every player at once: offense, defense, boost sum."""
+        weights = np.zeros((len(ATTRIBUTE_NAMES), 3))
+        for col, table in enumerate((OFFENSE_RATING_WEIGHTS, DEFENSE_RATING_WEIGHTS)):
+            for name, w in table:
+                weights[ATTRIBUTE_INDEX[name], col] += w
+        for name in TEAM_BOOST_ATTRIBUTES:
+            weights[ATTRIBUTE_INDEX[name], 2] += 1.0
+        return self.attributes @ weights
+
+    def column(self, name: str) -> np.ndarray:
+        return self.attributes[:, ATTRIBUTE_INDEX[name]]
+
+    def index_of(self, name: str) -> int:
+        return self.names.index(name)
+
+    def trade(self, swaps: Sequence[Tuple[int, int]]) -> "League":
+        """
+        A copy of the league with each (i, j) pair of players exchanging roster
+        slots, and so teams; players keep their attributes and position.
+        """
+        attrs, positions, ids = self.attributes.copy(), self.positions.copy(), self.player_ids.copy()
+        names = list(self.names)
+        for i, j in swaps:
+            attrs[[i, j]] = attrs[[j, i]]
+            positions[[i, j]] = positions[[j, i]]
+            ids[[i, j]] = ids[[j, i]]
+            names[i], names[j] = names[j], names[i]
+        return replace(self, attributes=attrs, positions=positions, player_ids=ids, names=names)
+
+
+def draw_attributes(rng: np.random.Generator, pos_codes: np.ndarray) -> np.ndarray:
+    """(len(pos_codes), 24) attribute rows for players at the given position codes."""
+    n = len(pos_codes)
+    talent = rng.normal(0.0, TALENT_SD, size=(n, 1))
+    attrs = ATTRIBUTE_MEAN + talent + rng.normal(0.0, NOISE_SD, size=(n, len(ATTRIBUTE_NAMES)))
+    attrs += _offset_matrix()[pos_codes]
+    np.clip(attrs, ATTRIBUTE_MIN, ATTRIBUTE_MAX, out=attrs)
+
+    lo = np.array([HEIGHT_RANGES[p][0] for p in POSITIONS])[pos_codes]
+    hi = np.array([HEIGHT_RANGES[p][1] for p in POSITIONS])[pos_codes]
+    attrs[:, HEIGHT] = lo + (hi - lo) * rng.random(n)
+    return attrs
+
+
+def generate_league(num_teams: int = 30, roster_size: int = 13, seed: int = 0, *,
+                    team_names: Optional[Sequence[str]] = None,
+                    name_format: str = "P{id:05d}") -> League:
+    """
+    Draw a whole league in one shot. Same seed, same league: every matrix
+    comes from one numpy Generator in a fixed order.
+    """
+    if roster_size > len(ROSTER_POSITIONS):
+        raise ValueError(f"roster_size must be <= {len(ROSTER_POSITIONS)}")
+    if team_names is not None and len(team_names) != num_teams:
+        raise ValueError("team_names must have one entry per team")
+    rng = np.random.default_rng(seed)
+    n = num_teams * roster_size
+
+    pos_codes = np.tile(np.array([POSITIONS.index(p) for p in ROSTER_POSITIONS[:roster_size]]), num_teams)
+    attrs = draw_attributes(rng, pos_codes)
+
+    ids = np.arange(n)
+    return League(
+        attributes=attrs,
+        positions=np.array(POSITIONS)[pos_codes],
+        player_ids=ids,
+        names=[name_format.format(id=i) for i in range(n)],
+        team_of=np.repeat(np.arange(num_teams), roster_size),
+        team_names=list(team_names) if team_names is not None else [f"Team {t + 1:02d}" for t in range(num_teams)],
+        roster_size=roster_size,
+    )
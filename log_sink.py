@@ -0,0 +1,204 @@
+# log_sink.py
+# Compressed, rotating play-by-play archives.
+#
+# Each game is written as its own gzip member / xz stream, so a file is a
+# valid .gz/.xz as a whole (zcat, xzcat) and any one game can be decompressed
+# on its own. Compressed members are buffered in memory and written in large
+# chunks; a file is rotated once it reaches max_bytes or max_games, and gets a
+# "<file>.idx.json" sidecar listing each game's offset and length.
+#
+#   with CompressedLogSink("logs", codec="lzma", max_games=1000) as sink:
+#       for seed in seeds:
+#           sink.write_match(Match(home.copy(), away.copy(), seed=seed).simulate())
+#
+#   for lines in iter_games("logs/play_by_play-00000.log.xz"): ...
+#   lines = read_game("logs/play_by_play-00000.log.xz", 41)
+
+import gzip
+import json
+import lzma
+import os
+import zlib
+from dataclasses import astuple, dataclass
+from typing import Iterator, List, Optional, Sequence
+
+CODECS = ("gzip", "lzma")
+EXTENSIONS = {"gzip": ".gz", "lzma": ".xz"}
+INDEX_SUFFIX = ".idx.json"
+
+DEFAULT_BUFFER_SIZE = 4 << 20
+DEFAULT_MAX_BYTES = 256 << 20
+READ_CHUNK = 1 << 20
+
+
+@dataclass
+class GameEntry:
+    game: int       # sink-wide game number
+    offset: int     # byte offset of the member in its file
+    length: int     # compressed length
+    lines: int
+    label: str
+
+
+def _compress(codec: str, data: bytes, level: Optional[int]) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+    return lzma.compress(data, preset=level)
+
+
+def _decompressor(codec: str):
+    return zlib.decompressobj(wbits=31) if codec == "gzip" else lzma.LZMADecompressor()
+
+
+def codec_for(path: str) -> Optional[str]:
+    """Codec from the file suffix; None for plain text."""
+    if path.endswith((".gz", ".gzip")):
+        return "gzip"
+    if path.endswith((".xz", ".lzma")):
+        return "lzma"
+    return None
+
+
+class CompressedLogSink:
+    def __init__(self, directory: str = ".", prefix: str = "play_by_play", *, codec: str = "gzip",
+                 level: Optional[int] = None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES, max_games: Optional[int] = None):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}")
+        self.directory = directory
+        self.prefix = prefix
+        self.codec = codec
+        self.level = level
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.max_games = max_games
+        self.games_written = 0
+        self.paths: List[str] = []     # every file opened so far, in order
+        self._file = None
+        self._buffer = bytearray()
+        self._size = 0                 # bytes in the current file, buffered included
+        self._entries: List[GameEntry] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.paths[-1] if self._file is not None else None
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths):05d}.log{EXTENSIONS[self.codec]}")
+        self._file = open(path, "wb")
+        self.paths.append(path)
+        self._size = 0
+        self._entries = []
+
+    def write_match(self, match, label: Optional[str] = None):
+        if label is None:
+            label = f"{match.team_a.name} vs {match.team_b.name}"
+        self.write_game(match.play_by_play, label)
+
+    def write_game(self, lines: Sequence[str], label: str = ""):
+        member = _compress(self.codec, ("\n".join(lines) + "\n").encode("utf-8"), self.level)
+        if self._file is None:
+            self._open()
+        self._entries.append(GameEntry(self.games_written, self._size, len(member), len(lines), label))
+        self._buffer += member
+        self._size += len(member)
+        self.games_written += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        if ((self.max_bytes is not None and self._size >= self.max_bytes)
+                or (self.max_games is not None and len(self._entries) >= self.max_games)):
+            self.rotate()
+
+    def flush(self):
+        if self._buffer and self._file is not None:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def rotate(self):
+        """Finish the current file (data + index); the next game opens a new one."""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        with open(self.paths[-1] + INDEX_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump({"codec": self.codec, "games": [astuple(e) for e in self._entries]}, f)
+
+    def close(self):
+        self.rotate()
+
+
+# --------------------------------------------------------------------
+# Reading
+# --------------------------------------------------------------------
+
+def read_index(path: str) -> Optional[List[GameEntry]]:
+    try:
+        with open(path + INDEX_SUFFIX, encoding="utf-8") as f:
+            return [GameEntry(*row) for row in json.load(f)["games"]]
+    except FileNotFoundError:
+        return None
+
+
+def _decode(data: bytes) -> List[str]:
+    return data.decode("utf-8").splitlines()
+
+
+def read_game(path: str, position: int) -> List[str]:
+    """Lines of the position-th game (0-based) in one file, decompressing only that game."""
+    if position < 0:
+        raise IndexError(f"game positions start at 0, got {position}")
+    codec = codec_for(path)
+    if codec is None:
+        if position != 0:
+            raise IndexError("plain-text logs hold a single game")
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+    index = read_index(path)
+    if index is None:
+        for n, lines in enumerate(iter_games(path)):
+            if n == position:
+                return lines
+        raise IndexError(f"{path} has no game {position}")
+    entry = index[position]
+    with open(path, "rb") as f:
+        f.seek(entry.offset)
+        data = f.read(entry.length)
+    d = _decompressor(codec)
+    return _decode(d.decompress(data))
+
+
+def iter_games(path: str) -> Iterator[List[str]]:
+    """
+    Every game in a file, one member at a time, streaming the compressed file
+    in READ_CHUNK pieces (no index needed). A plain-text log is one game.
+    """
+    codec = codec_for(path)
+    if codec is None:
+        with open(path, encoding="utf-8") as f:
+            yield f.read().splitlines()
+        return
+    with open(path, "rb") as f:
+        d = _decompressor(codec)
+        parts = []
+        while True:
+            data = f.read(READ_CHUNK)
+            if not data:
+                break
+            while data:
+                parts.append(d.decompress(data))
+                if not d.eof:
+                    break
+                yield _decode(b"".join(parts))
+                parts = []
+                data = d.unused_data
+                d = _decompressor(codec)
+        if parts:
+            raise ValueError(f"{path}: truncated final game")
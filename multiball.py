@@ -0,0 +1,310 @@
+# multiball.py
+# Command-line entry point:
+#
+#   python -m multiball simulate -n 1000 --workers 8 --format csv -o games.csv
+#   python -m multiball simulate -n 200 --mode logged --log-dir logs --codec lzma
+#   python -m multiball validate logs/play_by_play-00000.log.xz [--game 7]
+#   python -m multiball benchmark -n 300 --rng pcg64 --profile
+#   python -m multiball benchmark -n 2000 --pool
+#   python -m multiball export -n 500 --format sqlite -o box.sqlite
+#
+# Only argparse is imported at startup; the engine, multiprocessing, NumPy
+# (through the pcg64/philox backends) and sqlite3 are imported by the
+# subcommands that need them.
+#
+# Game k of a run uses seed --seed + k for both the Testers/Debuggers rosters
+# and the match RNG, so any game can be replayed on its own.
+
+import argparse
+import sys
+
+RNG_BACKENDS = ("python", "pcg64", "philox")
+TEAM_NAMES = (("Testers", "T"), ("Debuggers", "D"))
+
+
+# --------------------------------------------------------------------
+# Running games
+# --------------------------------------------------------------------
+
+def play_game(seed: int, logged: bool = False, backend: str = "python", box: bool = False) -> dict:
+    import random
+
+    from calibration import STAT_KEYS, seeded_team
+    from multiball_basketball import Match
+    from rng import make_rng
+    from rotation import ForfeitError
+
+    rng = random.Random(seed)
+    teams = [seeded_team(rng, name, prefix) for name, prefix in TEAM_NAMES]
+    match = Match(*teams, logged=logged, rng=make_rng(seed, backend=backend))
+    try:
+        match.simulate()
+    except ForfeitError as e:
+        return {"seed": seed, "forfeit": str(e)}
+    result = {
+        "seed": seed,
+        "teams": [t.name for t in teams],
+        "scores": [t.score for t in teams],
+        "totals": [{k: sum(p.stats[k] for p in t.roster) for k in STAT_KEYS} for t in teams],
+    }
+    if logged:
+        result["log"] = match.play_by_play
+    if box:
+        result["box"] = [(t.name, p.name, dict(p.stats, MIN=round(p.stats['MIN'], 1)))
+                         for t in teams for p in t.roster]
+    return result
+
+
+def _play_chunk(seeds, logged, backend, box):
+    return [play_game(s, logged, backend, box) for s in seeds]
+
+
+def iter_games(start: int, count: int, *, workers: int = 1, logged: bool = False,
+               backend: str = "python", box: bool = False, chunk_size: int = 25):
+    """Results for seeds start .. start+count-1, in seed order, streamed as chunks finish."""
+    seeds = range(start, start + count)
+    if workers == 1 or count <= chunk_size:
+        for s in seeds:
+            yield play_game(s, logged, backend, box)
+        return
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [seeds[i:i + chunk_size] for i in range(0, count, chunk_size)]
+    n = len(chunks)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for part in executor.map(_play_chunk, chunks, [logged] * n, [backend] * n, [box] * n):
+            yield from part
+
+
+def _open_output(path):
+    return sys.stdout if path in (None, "-") else open(path, "w", encoding="utf-8", newline="")
+
+
+# --------------------------------------------------------------------
+# Subcommands
+# --------------------------------------------------------------------
+
+def cmd_simulate(args) -> int:
+    logged = args.mode == "logged"
+    if logged and args.log_dir is None:
+        raise SystemExit("simulate: --mode logged needs --log-dir")
+    sink = None
+    if logged:
+        from log_sink import CompressedLogSink
+        sink = CompressedLogSink(args.log_dir, codec=args.codec, max_games=args.max_games)
+    out = _open_output(args.output)
+    writer = None
+    totals = [{}, {}]
+    played = forfeits = 0
+    try:
+        if args.format == "json":
+            import json
+        elif args.format == "csv":
+            import csv
+            writer = csv.writer(out)
+            writer.writerow(["seed", "home", "away", "home_score", "away_score", "forfeit"])
+        for g in iter_games(args.seed, args.games, workers=args.workers, logged=logged, backend=args.rng):
+            if "forfeit" in g:
+                forfeits += 1
+                row = {"seed": g["seed"], "forfeit": g["forfeit"]}
+            else:
+                played += 1
+                for acc, team_totals in zip(totals, g["totals"]):
+                    for k, v in team_totals.items():
+                        acc[k] = acc.get(k, 0) + v
+                if sink is not None:
+                    sink.write_game(g["log"], f"seed {g['seed']}")
+                row = {"seed": g["seed"], "home": g["teams"][0], "away": g["teams"][1],
+                       "home_score": g["scores"][0], "away_score": g["scores"][1]}
+            if args.format == "json":
+                out.write(json.dumps(row) + "\n")
+            elif writer is not None:
+                writer.writerow([row.get(k, "") for k in ("seed", "home", "away", "home_score", "away_score",
+                                                         "forfeit")])
+        if args.format == "text":
+            # Same block as test_100_game_stat_averages, so calibration.py can read it as targets
+            out.write(f"--- {played} Game Stat Averages ---\n")
+            for (name, _), acc in zip(TEAM_NAMES, totals):
+                out.write(f"{name}:\n")
+                for k, v in acc.items():
+                    out.write(f"  {k}: {v / max(played, 1):.2f}\n")
+            out.write(f"\nForfeits: {forfeits} out of {args.games}\n")
+    finally:
+        if sink is not None:
+            sink.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_validate(args) -> int:
+    from tools.validate_log import validate_file
+
+    failed = False
+    for path in args.paths:
+        count, errors = validate_file(path, args.game)
+        status = "FAILED" if errors else "PASSED"
+        print(f"{path}: {count} games, VALIDATION {status}")
+        for e in errors:
+            print(f"  {e}")
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+def cmd_benchmark(args) -> int:
+    import gc
+    import random
+    import time
+
+    from calibration import seeded_team
+    from instrumentation import Instrumentation
+    from multiball_basketball import Match
+    from pool import MatchPool
+    from rng import make_rng
+    from rotation import ForfeitError
+
+    logged = args.mode == "logged"
+    ins = Instrumentation() if args.profile else None
+    rosters = []
+    for k in range(args.games):
+        rng = random.Random(args.seed + k)
+        rosters.append([seeded_team(rng, name, prefix) for name, prefix in TEAM_NAMES])
+    pool = MatchPool(instrumentation=ins, logged=logged) if args.pool else None
+    forfeits = 0
+    collections = sum(s['collections'] for s in gc.get_stats())
+    t0 = time.perf_counter()
+    for k, teams in enumerate(rosters):
+        rng = make_rng(args.seed + k, backend=args.rng)
+        if pool is not None:
+            match = pool.acquire(*teams, rng)
+        else:
+            match = Match(*teams, instrumentation=ins, logged=logged, rng=rng)
+        try:
+            match.simulate()
+        except ForfeitError:
+            forfeits += 1
+        if pool is not None:
+            pool.release(match)
+    elapsed = time.perf_counter() - t0
+    collections = sum(s['collections'] for s in gc.get_stats()) - collections
+    pooled = ", pooled" if pool is not None else ""
+    print(f"{args.games} games ({args.mode}, rng={args.rng}{pooled}): {elapsed:.2f} s, "
+          f"{1000 * elapsed / args.games:.2f} ms/game, {args.games / elapsed:.0f} games/s, "
+          f"{collections} GC collections" + (f", {forfeits} forfeits" if forfeits else ""))
+    if ins is not None:
+        print(ins.format_report())
+    return 0
+
+
+BOX_COLUMNS = ('PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'MIN', 'FOUL')
+
+
+def cmd_export(args) -> int:
+    games = iter_games(args.seed, args.games, workers=args.workers, backend=args.rng, box=True)
+    if args.format == "sqlite":
+        import sqlite3
+
+        db = sqlite3.connect(args.output)
+        stat_cols = ", ".join(f'"{c}" REAL' for c in BOX_COLUMNS)
+        db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS games (seed INTEGER PRIMARY KEY, home TEXT, away TEXT,
+                                              home_score INTEGER, away_score INTEGER, forfeit TEXT);
+            CREATE TABLE IF NOT EXISTS box (seed INTEGER, team TEXT, player TEXT, {stat_cols});
+        """)
+        placeholders = ", ".join("?" * (3 + len(BOX_COLUMNS)))
+        with db:
+            for g in games:
+                if "forfeit" in g:
+                    db.execute("INSERT OR REPLACE INTO games VALUES (?, NULL, NULL, NULL, NULL, ?)",
+                               (g["seed"], g["forfeit"]))
+                    continue
+                db.execute("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, NULL)",
+                           (g["seed"], *g["teams"], *g["scores"]))
+                db.execute("DELETE FROM box WHERE seed = ?", (g["seed"],))
+                db.executemany(f"INSERT INTO box VALUES ({placeholders})",
+                               [(g["seed"], team, player, *(stats[c] for c in BOX_COLUMNS))
+                                for team, player, stats in g["box"]])
+        db.close()
+    else:
+        import csv
+
+        out = _open_output(args.output)
+        try:
+            writer = csv.writer(out)
+            writer.writerow(("seed", "team", "player") + BOX_COLUMNS)
+            for g in games:
+                for team, player, stats in g.get("box", ()):
+                    writer.writerow([g["seed"], team, player, *(stats[c] for c in BOX_COLUMNS)])
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    return 0
+
+
+# --------------------------------------------------------------------
+# Parser
+# --------------------------------------------------------------------
+
+def game_number(text: str) -> int:
+    # Same check as tools.validate_log.game_number, without importing it at startup
+    n = int(text)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"game numbers start at 1, got {n}")
+    return n
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m multiball", description="Multiball basketball simulator.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    def run_options(p, workers=True):
+        p.add_argument("-n", "--games", type=int, default=100)
+        p.add_argument("--seed", type=int, default=0, help="seed of the first game")
+        p.add_argument("--rng", choices=RNG_BACKENDS, default="python")
+        if workers:
+            p.add_argument("--workers", type=int, default=1, help="processes (0 = one per CPU)")
+
+    p = sub.add_parser("simulate", help="simulate games and report results")
+    run_options(p)
+    p.add_argument("--mode", choices=("fast", "logged"), default="fast")
+    p.add_argument("--format", choices=("text", "json", "csv"), default="text")
+    p.add_argument("-o", "--output", default=None, help="output file (default: stdout)")
+    p.add_argument("--log-dir", default=None, help="logged mode: directory for compressed play-by-play")
+    p.add_argument("--codec", choices=("gzip", "lzma"), default="gzip")
+    p.add_argument("--max-games", type=int, default=1000, help="logged mode: games per archive file")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("validate", help="validate play-by-play logs (plain, .gz or .xz)")
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--game", type=game_number, default=None, help="only the N-th game of each file (1-based)")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("benchmark", help="time the engine")
+    run_options(p, workers=False)
+    p.add_argument("--mode", choices=("fast", "logged"), default="fast")
+    p.add_argument("--profile", action="store_true", help="per-phase instrumentation report")
+    p.add_argument("--pool", action="store_true", help="reuse matches through a MatchPool")
+    p.set_defaults(func=cmd_benchmark)
+
+    p = sub.add_parser("export", help="simulate games and export player box scores")
+    run_options(p)
+    p.add_argument("--format", choices=("sqlite", "csv"), default="sqlite")
+    p.add_argument("-o", "--output", required=True)
+    p.set_defaults(func=cmd_export)
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Output piped into head & co.: stop quietly
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
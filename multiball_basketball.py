@@ -1,9 +1,14 @@
 # multiball_basketball.py
 # Drop-in replacement with rebound/FT/possession guard and labeled rebounds.
 
-from typing import List, Optional, Tuple
-from dataclasses import dataclass
-import random
+from typing import Dict, List, Optional, Tuple
+from dataclasses import astuple, dataclass, field
+from itertools import accumulate
+import hashlib
+
+from instrumentation import NULL_INSTRUMENTATION
+from rng import PythonRNG
+from rotation import RotationManager
 
 # --------------------------------------------------------------------
 # Public API dataclasses/classes (kept stable for test harness import)
@@ -39,6 +44,76 @@ class PlayerAttributes:
     height: float
 
 
+# Lineup rating formulas used by Team.recalculate_ratings
+OFFENSE_RATING_WEIGHTS = (
+    ('throw_accuracy', 0.30), ('finesse', 0.25), ('form_technique', 0.20),
+    ('teamwork', 0.10), ('awareness', 0.10), ('stamina', 0.05),
+)
+DEFENSE_RATING_WEIGHTS = (
+    ('awareness', 0.25), ('reactions', 0.20), ('balance', 0.20),
+    ('agility', 0.15), ('determination', 0.10), ('stamina', 0.10),
+)
+
+# Shooter attributes averaged into offense skill, per shot type
+SHOT_ATTRIBUTES = {
+    '3PT Catch & Shoot': ('form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork'),
+    '3PT Pull-Up':       ('form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork','agility','acceleration'),
+    '3PT Heave':         ('arm_strength','finesse','composure','bravery'),
+    'Mid Catch & Shoot': ('form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork'),
+    'Mid Pull-Up':       ('form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork','agility','acceleration'),
+    'Floater':           ('finesse','creativity','reactions','balance','hand_eye_coordination','composure'),
+    'Fadeaway':          ('finesse','form_technique','core_strength','balance','composure','creativity'),
+    'Layup':             ('finesse','core_strength','acceleration','agility','composure','balance','jumping','hand_eye_coordination'),
+    'Dunk':              ('grip_strength','jumping','balance','acceleration','bravery'),
+    'Hook Shot':         ('form_technique','finesse','core_strength','balance','composure'),
+    'Reverse Layup':     ('finesse','balance','agility','creativity','composure','grip_strength'),
+}
+DEFAULT_SHOT_ATTRIBUTES = ('form_technique','finesse','hand_eye_coordination')
+
+# Shots drawing the close-range shooting foul rate (EngineParams.base_foul_close)
+CLOSE_SHOT_TYPES = ('Layup', 'Dunk', 'Reverse Layup', 'Floater', 'Hook Shot')
+
+# Lineup-wide attributes behind the offensive team boost on every shot
+TEAM_BOOST_ATTRIBUTES = ('teamwork','patience','awareness')
+
+
+# In-game player selection: each player's weight is the attribute score below
+# raised to SELECTION_EXPONENT. Height (inches) is mapped onto the 0-100 scale.
+SELECTION_ATTRIBUTES = {
+    'rebound': (('height', 0.4), ('jumping', 0.35), ('reactions', 0.25)),
+    'assist': (('teamwork', 0.5), ('creativity', 0.5)),
+    'block': (('height', 0.4), ('jumping', 0.4), ('reactions', 0.2)),
+    'help_defense': (('awareness', 0.4), ('reactions', 0.3), ('agility', 0.3)),
+}
+SELECTION_EXPONENT = 2.0
+
+
+def weighted_rating(attributes: PlayerAttributes, weights) -> float:
+    total = 0.0
+    for name, w in weights:
+        total += w * getattr(attributes, name)
+    return total
+
+
+def shot_skill(attributes: PlayerAttributes, shot_type: str) -> float:
+    """Shooter's skill on a shot type, before the lineup boost and fatigue."""
+    use_attrs = SHOT_ATTRIBUTES.get(shot_type, DEFAULT_SHOT_ATTRIBUTES)
+    vals = [getattr(attributes, a) for a in use_attrs]
+    skill = sum(vals) / len(vals)
+    height_factor = (attributes.height - 72) / 15
+    skill *= (1.0 + 0.1 * height_factor)
+    skill *= attributes.stamina / 100.0
+    return skill
+
+
+def defense_pressure(attributes: PlayerAttributes) -> float:
+    return (attributes.awareness + attributes.balance + attributes.reactions) / 3.0
+
+
+def free_throw_skill(attributes: PlayerAttributes) -> float:
+    return 0.4 * attributes.form_technique + 0.3 * attributes.hand_eye_coordination + 0.3 * attributes.composure
+
+
 class Player:
     def __init__(self, name: str, attributes: PlayerAttributes, position: Optional[str] = None, disc_type: Optional[str] = None):
         self.name = name
@@ -47,12 +122,117 @@ class Player:
         self.disc_type = disc_type
         self.stats = {
             'PTS': 0, 'REB': 0, 'AST': 0, 'STL': 0, 'BLK': 0, 'TO': 0,
-            'FGM': 0, 'FGA': 0, '3PM': 0, 'FTM': 0, 'FTA': 0, 'MIN': 0, 'FOUL': 0
+            'FGM': 0, 'FGA': 0, '3PM': 0, 'FTM': 0, 'FTA': 0, 'MIN': 0, 'FOUL': 0, '3PA': 0
         }
         self.fouls = 0
         self.fatigue = 0.0
         self.on_court = False
         self.stamina = 100.0
+        self._ratings: Optional[Tuple[float, float, float]] = None
+        self._selection: Optional[Dict[str, float]] = None
+
+    @property
+    def attributes(self) -> PlayerAttributes:
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes: PlayerAttributes):
+        # A new attributes object drops the rating and selection caches
+        self._attributes = attributes
+        self._ratings = None
+        self._selection = None
+
+    def ratings(self) -> Tuple[float, float, float]:
+        # (offense, defense, team-boost sum); cached until attributes change
+        if self._ratings is None:
+            a = self.attributes
+            self._ratings = (
+                weighted_rating(a, OFFENSE_RATING_WEIGHTS),
+                weighted_rating(a, DEFENSE_RATING_WEIGHTS),
+                sum(getattr(a, name) for name in TEAM_BOOST_ATTRIBUTES),
+            )
+        return self._ratings
+
+    def selection_weights(self) -> Dict[str, float]:
+        # SELECTION_ATTRIBUTES kind -> selection weight; cached like ratings()
+        if self._selection is None:
+            self._selection = {kind: selection_weight(self.attributes, weights)
+                               for kind, weights in SELECTION_ATTRIBUTES.items()}
+        return self._selection
+
+    def invalidate_ratings(self):
+        # call after mutating the attributes object in place
+        self._ratings = None
+        self._selection = None
+
+    def reset(self):
+        # Fresh per-game state; the stats dict is zeroed in place, not replaced
+        stats = self.stats
+        for k in stats:
+            stats[k] = 0
+        self.fouls = 0
+        self.fatigue = 0.0
+        self.on_court = False
+        self.stamina = 100.0
+
+
+def invalidate_ratings(players, ratings=None):
+    """
+    Bulk Player.invalidate_ratings. With `ratings` (one (offense, defense,
+    boost sum) row per player, e.g. computed over a whole attribute matrix)
+    the caches are primed instead of cleared.
+    """
+    if ratings is None:
+        for p in players:
+            p._ratings = None
+            p._selection = None
+    else:
+        for p, r in zip(players, ratings):
+            p._ratings = tuple(r)
+            p._selection = None
+
+
+def selection_weight(attributes: PlayerAttributes, weights) -> float:
+    total = 0.0
+    for name, w in weights:
+        v = getattr(attributes, name)
+        if name == 'height':
+            v = (v - 66.0) * 5.0
+        total += w * v
+    return max(total, 1.0) ** SELECTION_EXPONENT
+
+
+def reset_periods(per_period: Dict[int, int]):
+    # Zero a per-period counter in place, dropping overtime periods
+    for q in [q for q in per_period if q > 4]:
+        del per_period[q]
+    for q in per_period:
+        per_period[q] = 0
+
+
+class LineupTables:
+    """
+    Selection tables for one lineup, built once per lineup change: cumulative
+    weights per SELECTION_ATTRIBUTES kind, assist tables per shooter slot
+    (the other four players), and players by position.
+    """
+    __slots__ = ('players', 'rebound', 'block', 'help_defense', 'assist', 'by_position')
+
+    def __init__(self, lineup: List[Player]):
+        self.players = tuple(lineup)
+        weights = [p.selection_weights() for p in self.players]
+        self.rebound = tuple(accumulate(w['rebound'] for w in weights))
+        self.block = tuple(accumulate(w['block'] for w in weights))
+        self.help_defense = tuple(accumulate(w['help_defense'] for w in weights))
+        assist_w = [w['assist'] for w in weights]
+        self.assist = tuple(
+            (self.players[:i] + self.players[i + 1:], tuple(accumulate(assist_w[:i] + assist_w[i + 1:])))
+            for i in range(len(self.players))
+        )
+        by_position: Dict[Optional[str], List[Player]] = {}
+        for p in self.players:
+            by_position.setdefault(p.position, []).append(p)
+        self.by_position = {pos: tuple(ps) for pos, ps in by_position.items()}
 
 
 class Team:
@@ -64,36 +244,172 @@ class Team:
         self.quarter_scores = {1: 0, 2: 0, 3: 0, 4: 0}
         self.offensive_rating = 0.0
         self.defensive_rating = 0.0
+        self.team_boost = 0.0
+        # Lineup sums behind the ratings, kept current by substitute()
+        self._offense_sum = 0.0
+        self._defense_sum = 0.0
+        self._boost_sum = 0.0
+        self._tables: Optional[LineupTables] = None
+
+    @property
+    def tables(self) -> LineupTables:
+        if self._tables is None:
+            self._tables = LineupTables(self.lineup)
+        return self._tables
 
     def recalculate_ratings(self):
+        self._tables = None
         if not self.lineup:
+            self._offense_sum = self._defense_sum = self._boost_sum = 0.0
             self.offensive_rating = 0.0
             self.defensive_rating = 0.0
+            self.team_boost = 0.0
             return
-        offense_attrs = [
-            (
-                0.30 * p.attributes.throw_accuracy +
-                0.25 * p.attributes.finesse +
-                0.20 * p.attributes.form_technique +
-                0.10 * p.attributes.teamwork +
-                0.10 * p.attributes.awareness +
-                0.05 * p.attributes.stamina
-            )
-            for p in self.lineup
-        ]
-        defense_attrs = [
-            (
-                0.25 * p.attributes.awareness +
-                0.20 * p.attributes.reactions +
-                0.20 * p.attributes.balance +
-                0.15 * p.attributes.agility +
-                0.10 * p.attributes.determination +
-                0.10 * p.attributes.stamina
-            )
-            for p in self.lineup
-        ]
-        self.offensive_rating = sum(offense_attrs) / len(self.lineup)
-        self.defensive_rating = sum(defense_attrs) / len(self.lineup)
+        ratings = [p.ratings() for p in self.lineup]
+        self._offense_sum = sum(r[0] for r in ratings)
+        self._defense_sum = sum(r[1] for r in ratings)
+        self._boost_sum = sum(r[2] for r in ratings)
+        self._update_ratings()
+
+    def _update_ratings(self):
+        n = len(self.lineup)
+        self.offensive_rating = self._offense_sum / n
+        self.defensive_rating = self._defense_sum / n
+        # mean of the TEAM_BOOST_ATTRIBUTES lineup averages, on a 0-1 scale
+        self.team_boost = self._boost_sum / (n * 100 * len(TEAM_BOOST_ATTRIBUTES))
+
+    def copy(self) -> "Team":
+        # Same roster definition, fresh per-game state (stats, fouls, score)
+        roster = []
+        for p in self.roster:
+            q = Player(p.name, p.attributes, position=p.position, disc_type=p.disc_type)
+            q._ratings = p._ratings  # same attributes object, so the caches carry over
+            q._selection = p._selection
+            roster.append(q)
+        return Team(self.name, roster)
+
+    def reset(self):
+        # Same roster, fresh per-game state (counters zeroed in place)
+        self.lineup.clear()
+        self.score = 0
+        reset_periods(self.quarter_scores)
+        self.recalculate_ratings()
+        for p in self.roster:
+            p.reset()
+
+    def copy_from(self, source: "Team"):
+        # Point this per-game copy at another roster definition of the same
+        # size (as copy() would), then reset it. The caches always come from
+        # the source: its attributes may have been edited in place since.
+        if len(source.roster) != len(self.roster):
+            raise ValueError(f"roster sizes differ: {len(source.roster)} != {len(self.roster)}")
+        self.name = source.name
+        for q, p in zip(self.roster, source.roster):
+            q.name, q.attributes, q.position, q.disc_type = p.name, p.attributes, p.position, p.disc_type
+            q._ratings, q._selection = p._ratings, p._selection
+        self.reset()
+
+    def fingerprint(self) -> str:
+        # Changes whenever the roster, its order or any player attribute changes
+        h = hashlib.sha1(self.name.encode())
+        for p in self.roster:
+            h.update(repr((p.name, p.position, astuple(p.attributes))).encode())
+        return h.hexdigest()
+
+    def substitute(self, out_player: Player, in_player: Player):
+        # Swap in place (keeps lineup slot order) and update ratings incrementally
+        self.lineup[self.lineup.index(out_player)] = in_player
+        out_r, in_r = out_player.ratings(), in_player.ratings()
+        self._offense_sum += in_r[0] - out_r[0]
+        self._defense_sum += in_r[1] - out_r[1]
+        self._boost_sum += in_r[2] - out_r[2]
+        out_player.on_court = False
+        in_player.on_court = True
+        self._tables = None
+        self._update_ratings()
+
+
+# --------------------------------------------------------------------
+# Engine tuning parameters
+# --------------------------------------------------------------------
+
+ShotWeights = Tuple[Tuple[str, float], ...]
+
+# Shot-type distributions by situation. Keys 'G'/'F'/'C' are half-court
+# distributions by shooter position (unknown positions use 'C').
+DEFAULT_SHOT_WEIGHTS: Dict[str, ShotWeights] = {
+    'buzzer_heave': (('3PT Heave', 0.70), ('3PT Pull-Up', 0.10), ('3PT Catch & Shoot', 0.10),
+                     ('Layup', 0.05), ('Hook Shot', 0.05)),
+    'buzzer': (('3PT Pull-Up', 0.35), ('3PT Catch & Shoot', 0.30), ('Fadeaway', 0.15),
+               ('Floater', 0.10), ('Layup', 0.10)),
+    'fast_break': (('Layup', 0.45), ('Dunk', 0.35), ('Floater', 0.10),
+                   ('3PT Pull-Up', 0.05), ('3PT Catch & Shoot', 0.05)),
+    'pressure_heave': (('3PT Heave', 0.40), ('3PT Pull-Up', 0.20), ('3PT Catch & Shoot', 0.15),
+                       ('Fadeaway', 0.10), ('Floater', 0.05), ('Layup', 0.10)),
+    'pressure': (('3PT Pull-Up', 0.28), ('3PT Catch & Shoot', 0.25), ('Fadeaway', 0.15),
+                 ('Floater', 0.12), ('Layup', 0.10), ('Mid Pull-Up', 0.10)),
+    'G': (('3PT Catch & Shoot', 0.20), ('3PT Pull-Up', 0.17), ('Mid Pull-Up', 0.14),
+          ('Layup', 0.15), ('Floater', 0.11), ('Mid Catch & Shoot', 0.09),
+          ('Fadeaway', 0.06), ('Reverse Layup', 0.05), ('Dunk', 0.03)),
+    'F': (('Mid Catch & Shoot', 0.17), ('3PT Catch & Shoot', 0.15), ('Mid Pull-Up', 0.15),
+          ('Layup', 0.15), ('Fadeaway', 0.11), ('Dunk', 0.09), ('Floater', 0.07),
+          ('Reverse Layup', 0.05), ('3PT Pull-Up', 0.06)),
+    'C': (('Layup', 0.25), ('Dunk', 0.23), ('Hook Shot', 0.15), ('Fadeaway', 0.12),
+          ('Mid Catch & Shoot', 0.08), ('Reverse Layup', 0.07), ('Floater', 0.05),
+          ('3PT Catch & Shoot', 0.05)),
+}
+
+
+@dataclass
+class EngineParams:
+    # Rebounding / blocks
+    oreb_rate: float = 0.30            # live-ball misses rebounded by the offense
+    ft_oreb_rate: float = 0.30         # missed last FTs rebounded by the shooting team
+    block_rate: float = 0.10           # share of missed FGs that are blocks
+    # Defender matchup
+    random_defender_rate: float = 0.10  # help/switch: any defender instead of same position
+    # Fouls
+    base_foul_close: float = 0.07      # shooting foul base on layups/dunks/floaters/hooks
+    base_foul_jumper: float = 0.02     # shooting foul base on jumpers
+    base_foul_non_shooting: float = 0.008
+    bonus_foul_bump: float = 0.10      # extra non-shooting foul chance once in the bonus
+    bonus_threshold: int = 5
+    # Shot success
+    success_min: float = 0.10
+    success_max: float = 0.95
+    heave_success: float = 0.03
+    # Free throws
+    ft_min: float = 0.10
+    ft_max: float = 0.90
+    # Stamina / rotation (see rotation.py); drain and recovery are per game second
+    stamina_drain: float = 0.09        # scaled by (1.6 - stamina attribute / 100)
+    stamina_recovery: float = 0.12
+    sub_out_stamina: float = 55.0
+    sub_in_stamina: float = 85.0
+    fatigue_penalty: float = 0.15      # offense skill lost at zero stamina
+    # Possession outcomes outside the shot model
+    turnover_rate: float = 0.16        # scaled by the handler's care with the ball
+    steal_rate: float = 0.55           # live-ball turnovers credited as steals
+    fast_break_after_steal: float = 0.50
+    fast_break_after_rebound: float = 0.12
+    foul_trouble: Tuple[int, int, int, int] = (2, 3, 4, 5)  # sit at this many fouls, by quarter
+    foul_out: int = 6
+    shot_weights: Dict[str, ShotWeights] = field(default_factory=lambda: dict(DEFAULT_SHOT_WEIGHTS))
+
+    def fingerprint(self) -> str:
+        return hashlib.sha1(repr(sorted(self.__dict__.items())).encode()).hexdigest()
+
+    def shot_tables(self) -> Dict[str, Tuple[Tuple[str, ...], Tuple[float, ...]]]:
+        # (types, cumulative weights) per situation, built once per Match
+        tables = {}
+        for key, dist in self.shot_weights.items():
+            types, weights = zip(*dist)
+            cum, total = [], 0.0
+            for w in weights:
+                total += w
+                cum.append(total)
+            tables[key] = (types, tuple(cum))
+        return tables
 
 
 # --------------------------------------------------------------------
@@ -168,38 +484,140 @@ class PossessionGuard:
 # Match engine
 # --------------------------------------------------------------------
 
+QUARTER_SECONDS = 12 * 60
+OVERTIME_SECONDS = 5 * 60
+PERIOD_BREAK_SECONDS = 130
+HALFTIME_SECONDS = 15 * 60
+
+# Seconds per half-court possession; sampled through a precomputed quantile
+# table so a draw is one uniform and one index.
+POSSESSION_SECONDS = (
+    (4, 1), (5, 2), (6, 3), (7, 4), (8, 5), (9, 6), (10, 7), (11, 8), (12, 9), (13, 9),
+    (14, 9), (15, 8), (16, 8), (17, 7), (18, 6), (19, 5), (20, 4), (21, 3), (22, 2), (23, 2), (24, 1),
+)
+POSSESSION_QUANTILE_COUNT = 1024
+
+
+def _quantile_table(dist, size: int) -> Tuple[int, ...]:
+    total = sum(w for _, w in dist)
+    table, cum, j = [], 0.0, 0
+    for i in range(size):
+        u = (i + 0.5) / size * total
+        while cum + dist[j][1] < u:
+            cum += dist[j][1]
+            j += 1
+        table.append(dist[j][0])
+    return tuple(table)
+
+
+POSSESSION_QUANTILES = _quantile_table(POSSESSION_SECONDS, POSSESSION_QUANTILE_COUNT)
+FAST_BREAK_SECONDS = (3, 4, 4, 5, 5, 6)
+FAST_BREAK_TRIGGERS = ("steal", "defensive_rebound")
+
+TURNOVER_TYPES = ('bad pass', 'travel', 'stepped out of bounds', 'offensive foul', 'lost ball', 'shot clock violation')
+LIVE_BALL_TURNOVERS = ('bad pass', 'lost ball')
+
+
 class Match:
-    def __init__(self, team_a: Team, team_b: Team):
+    rotation_manager = RotationManager
+
+    def __init__(self, team_a: Team, team_b: Team, instrumentation=None,
+                 params: Optional[EngineParams] = None, logged: bool = True,
+                 rng=None, seed: Optional[int] = None, copy_teams: bool = False):
+        # copy_teams=True plays on Team.copy()s: the teams passed in (which may
+        # be shared with other threads) are only read, and the box score lives
+        # in this match's team_a / team_b.
+        if copy_teams:
+            team_a, team_b = team_a.copy(), team_b.copy()
+        self.copy_teams = copy_teams
         self.team_a = team_a
         self.team_b = team_b
-        self.quarter = 1
-        self.time_remaining = 12 * 60
-        self.shot_clock = 24
-        self.possession_team: Optional[Team] = None
-        self.possession_start_time: Optional[int] = None
-        self.possession_changed_last_play = False
-        self.possession_number = 0
-        self.fast_break_eligible = False
-        self.initial_tip_winner: Optional[Team] = None
-
         self.team_fouls = {
             self.team_a.name: {1: 0, 2: 0, 3: 0, 4: 0},
             self.team_b.name: {1: 0, 2: 0, 3: 0, 4: 0},
         }
 
+        # Fast mode (logged=False) skips formatting play-by-play lines
+        self.logged = logged
         self.play_by_play: List[str] = []
 
+        # Random draws go through a backend from rng.py; by default a private
+        # stdlib stream (seeded from seed=, or from OS entropy), so no match
+        # touches the module-global generator.
+        self.rng = rng if rng is not None else PythonRNG(seed=seed)
+
+        # Tuning constants (see EngineParams) and the shot tables derived from them
+        self.params = params if params is not None else EngineParams()
+        self._shot_tables = self.params.shot_tables()
+
         # Guard to keep sequences valid
         self.guard = PossessionGuard()
 
+        # Opt-in timers/counters (see instrumentation.py); no-op hooks by default
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
+        self._start_game()
+
+    def _start_game(self):
+        # Per-game state; containers built in __init__ are zeroed in place
+        self.quarter = 1
+        self.time_remaining = 12 * 60
+        self.shot_clock = 24
+        self.possession_team: Optional[Team] = None
+        self.possession_start_time: Optional[int] = None
+        self.possession_changed_last_play = False
+        self.possession_number = 0
+        self.fast_break_eligible = False
+        self.initial_tip_winner: Optional[Team] = None
+        for fouls in self.team_fouls.values():
+            reset_periods(fouls)
+        self.play_by_play.clear()
+        self.last_event: Optional[str] = None
+        self._last_possession_time = 12
+        self.guard.mark_shot_made()
+        self.instrumentation.begin_match()
         self.init_lineups()
 
+    def reset(self, team_a: Optional[Team] = None, team_b: Optional[Team] = None, rng=None, *,
+              seed: Optional[int] = None):
+        """
+        Ready this match for another game, reusing its Team and Player objects
+        and their stats dicts (zeroed in place). With team_a / team_b (only
+        for copy_teams=True matches) the per-game copies are first pointed at
+        those rosters, which must have the same sizes.
+        """
+        if team_a is not None or team_b is not None:
+            if not self.copy_teams:
+                raise ValueError("only copy_teams=True matches can be reset to other teams")
+            names = (self.team_a.name, self.team_b.name)
+            self.team_a.copy_from(team_a if team_a is not None else self.team_a)
+            self.team_b.copy_from(team_b if team_b is not None else self.team_b)
+            if names != (self.team_a.name, self.team_b.name):
+                fouls = self.team_fouls
+                self.team_fouls = {self.team_a.name: fouls[names[0]], self.team_b.name: fouls[names[1]]}
+        else:
+            self.team_a.reset()
+            self.team_b.reset()
+        self.rng = rng if rng is not None else PythonRNG(seed=seed)
+        self._start_game()
+        return self
+
     # ---------- Helpers ----------
     def format_time(self) -> str:
         m = self.time_remaining // 60
         s = self.time_remaining % 60
         return f"{int(m)}:{int(s):02d}"
 
+    def log(self, kind: str, template: str, *args):
+        # Lines are only formatted in logged mode; fast mode still counts the
+        # event and tracks the last event kind, so both modes run the same code.
+        self.last_event = kind
+        ins = self.instrumentation
+        ins.event(kind)
+        if self.logged:
+            t0 = ins.start()
+            self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] " + template.format(*args))
+            ins.stop("logging", t0)
+
     def get_defensive_team(self) -> Team:
         return self.team_b if self.possession_team == self.team_a else self.team_a
 
@@ -207,25 +625,33 @@ class Match:
         if not force and self.possession_team == team:
             self.possession_changed_last_play = False
             return
+        ins = self.instrumentation
+        t0 = ins.start()
         prev = self.possession_team
         self.possession_team = team
         if prev != team or force:
-            self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] Possession: {team.name}")
+            self.log("possession", "Possession: {}", team.name)
             # Dead ball state -> no rebound expected
             self.guard.mark_shot_made()
             self.possession_changed_last_play = True
             self.possession_start_time = self.time_remaining
             self.shot_clock = 24
+        ins.stop("possession_change", t0)
 
     def update_minutes_played(self):
-        # minimal: credit ~1 possession worth of time to players on court
+        # credit ~1 possession worth of time to players on court, then let the
+        # rotation drain stamina and make any substitutions
         t = getattr(self, "_last_possession_time", 12)
         for team in (self.team_a, self.team_b):
             for p in team.lineup:
                 p.stats["MIN"] += t / 60.0
+        self.rotation.tick(t, self.quarter)
+
+    def log_substitution(self, team: Team, out_player: Player, in_player: Player):
+        self.log("substitution", "Substitution ({}): {} in for {}", team.name, in_player.name, out_player.name)
 
     def get_team_defense_modifier(self, team: Team) -> float:
-        team.recalculate_ratings()
+        # lineup ratings are maintained incrementally by Team.substitute
         return team.defensive_rating
 
     def allow_heave(self) -> bool:
@@ -244,41 +670,58 @@ class Match:
     def init_lineups(self):
         self.team_a.lineup = self.team_a.roster[:5]
         self.team_b.lineup = self.team_b.roster[:5]
+        for p in self.team_a.roster + self.team_b.roster:
+            p.on_court = False
+            p.stamina = 100.0
+            p.fatigue = 0.0
         for p in self.team_a.lineup + self.team_b.lineup:
             p.on_court = True
-            p.stamina = 100.0
+        self.team_a.recalculate_ratings()
+        self.team_b.recalculate_ratings()
+        self.rotation = self.rotation_manager(self, self.params)
 
     def tip_off(self):
+        # Opening tip (and the jump ball starting each overtime)
         a_center = max(self.team_a.lineup, key=lambda p: (p.attributes.height, p.attributes.jumping))
         b_center = max(self.team_b.lineup, key=lambda p: (p.attributes.height, p.attributes.jumping))
         a_score = a_center.attributes.height + a_center.attributes.jumping
         b_score = b_center.attributes.height + b_center.attributes.jumping
-        self.possession_team = self.team_a if (a_score > b_score or (a_score == b_score and random.random() > 0.5)) else self.team_b
-        self.initial_tip_winner = self.possession_team
-        self.play_by_play.append(f"[Q1 12:00] Tip-off won by {self.possession_team.name}")
+        winner = self.team_a if (a_score > b_score or (a_score == b_score and self.rng.random() > 0.5)) else self.team_b
+        if self.initial_tip_winner is None:
+            self.initial_tip_winner = winner
+        self.log("tip_off", "Tip-off won by {}", winner.name)
+        self.set_possession(winner)
         self.guard.whistle()  # dead-ball to start
 
     # ---------- Fouling ----------
-    def should_commit_foul(self, defender: Player, *, shooting: bool, team_fouls: int, base_foul: float = 0.04) -> bool:
+    def foul_chance(self, defender: Player, *, shooting: bool, team_fouls: int, base_foul: float = 0.04) -> float:
+        params = self.params
         discipline = (defender.attributes.awareness + defender.attributes.composure + defender.attributes.patience) / 3
         aggression = (defender.attributes.bravery + defender.attributes.determination) / 2
-        base = base_foul if shooting else 0.008
-        foul_chance = base + (1 - discipline / 100) * 0.08 + (aggression / 100) * 0.04
-        if not shooting and team_fouls >= 5:  # bonus
-            foul_chance += 0.10
-        return random.random() < foul_chance
+        base = base_foul if shooting else params.base_foul_non_shooting
+        chance = base + (1 - discipline / 100) * 0.08 + (aggression / 100) * 0.04
+        if not shooting and team_fouls >= params.bonus_threshold:  # bonus
+            chance += params.bonus_foul_bump
+        return chance
+
+    def should_commit_foul(self, defender: Player, *, shooting: bool, team_fouls: int, base_foul: float = 0.04) -> bool:
+        ins = self.instrumentation
+        t0 = ins.start()
+        fouled = self.rng.random() < self.foul_chance(defender, shooting=shooting, team_fouls=team_fouls,
+                                                      base_foul=base_foul)
+        ins.stop("foul_check", t0)
+        return fouled
 
     # ---------- Free throws ----------
     def simulate_free_throws(self, shooter: Player, num_shots: int = 1) -> bool:
-        ft_skill = (0.4 * shooter.attributes.form_technique +
-                    0.3 * shooter.attributes.hand_eye_coordination +
-                    0.3 * shooter.attributes.composure)
-        ft_pct = max(0.1, min(0.90, ft_skill / 100 + random.uniform(-0.05, 0.05)))
+        rng = self.rng
+        ft_skill = free_throw_skill(shooter.attributes)
+        ft_pct = max(self.params.ft_min, min(self.params.ft_max, ft_skill / 100 + rng.uniform(-0.05, 0.05)))
 
         last_made = None
         for i in range(1, num_shots + 1):
             shooter.stats['FTA'] += 1
-            made = random.random() < ft_pct
+            made = rng.random() < ft_pct
             last_made = made
 
             is_last = (i == num_shots)
@@ -287,12 +730,10 @@ class Match:
                 shooter.stats['PTS'] += 1
                 self.possession_team.score += 1
                 self.possession_team.quarter_scores[self.quarter] += 1
-                self.play_by_play.append(
-                    f"[Q{self.quarter} {self.format_time()}] {shooter.name} Made Free Throw "
-                    f"[{self.team_a.name}: {self.team_a.score} | {self.team_b.name}: {self.team_b.score}]"
-                )
+                self.log("ft_made", "{} Made Free Throw [{}: {} | {}: {}]", shooter.name,
+                         self.team_a.name, self.team_a.score, self.team_b.name, self.team_b.score)
             else:
-                self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] {shooter.name} Missed Free Throw")
+                self.log("ft_missed", "{} Missed Free Throw", shooter.name)
 
             # Update FT context in guard after each attempt
             self.guard.mark_ft_sequence(self.possession_team.name, last_made is False, is_last)
@@ -303,97 +744,89 @@ class Match:
             return True
 
         # Otherwise (last FT missed) -> rebound expected
+        ins = self.instrumentation
+        t0 = ins.start()
         shooting_team = self.possession_team
         def_team = self.team_b if shooting_team == self.team_a else self.team_a
 
         # Slight bias to defense on FTs
-        if random.random() < 0.30:
+        if rng.random() < self.params.ft_oreb_rate:
             rebound_team = shooting_team
             pos_changed = False
         else:
             rebound_team = def_team
             pos_changed = True
 
-        rebounder = random.choice(rebound_team.lineup)
+        tables = rebound_team.tables
+        rebounder = rng.weighted(tables.players, tables.rebound)
         rebounder.stats['REB'] += 1
+        ins.stop("rebound", t0)
         if rebound_team is shooting_team:
-            self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] Offensive rebound by {rebounder.name}")
+            self.log("offensive_rebound", "Offensive rebound by {}", rebounder.name)
+            self.shot_clock = max(self.shot_clock, 14)
         else:
-            self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] Defensive rebound by {rebounder.name}")
+            self.log("defensive_rebound", "Defensive rebound by {}", rebounder.name)
 
         # After rebound, sequence consumed
         self.guard.consume_rebound()
         return pos_changed
 
     # ---------- Shots / Possessions ----------
+    def success_chance(self, shot_type: str, offense_skill: float, pressure: float) -> float:
+        if shot_type == '3PT Heave':
+            return self.params.heave_success
+        return max(self.params.success_min, min(self.params.success_max, (offense_skill - pressure + 50) / 150.0))
+
     def simulate_shot(self, *, fast_break_override: Optional[bool] = None,
                       return_type: bool = False, log_possession: bool = True,
                       buzzer_beater: bool = False, force_allow_heave: bool = False):
+        rng = self.rng
+        ins = self.instrumentation
+        t0 = ins.start()
         fast_break_flag = fast_break_override if fast_break_override is not None else False
-        shooter = random.choice(self.possession_team.lineup)
+        shooter = rng.choice(self.possession_team.lineup)
         pos = shooter.position
         time_pressure = (self.time_remaining < 24)
         can_heave = self.allow_heave() or force_allow_heave
 
         # Shot-type distribution (shortened; keeps behavior reasonable)
         if buzzer_beater:
-            if can_heave:
-                shot_types = [('3PT Heave', 0.70), ('3PT Pull-Up', 0.10), ('3PT Catch & Shoot', 0.10),
-                              ('Layup', 0.05), ('Hook Shot', 0.05)]
-            else:
-                shot_types = [('3PT Pull-Up', 0.35), ('3PT Catch & Shoot', 0.30), ('Fadeaway', 0.15),
-                              ('Floater', 0.10), ('Layup', 0.10)]
+            situation = 'buzzer_heave' if can_heave else 'buzzer'
         elif fast_break_flag:
-            shot_types = [('Layup', 0.45), ('Dunk', 0.35), ('Floater', 0.10),
-                          ('3PT Pull-Up', 0.05), ('3PT Catch & Shoot', 0.05)]
+            situation = 'fast_break'
         elif time_pressure:
-            if can_heave:
-                shot_types = [('3PT Heave', 0.40), ('3PT Pull-Up', 0.20), ('3PT Catch & Shoot', 0.15),
-                              ('Fadeaway', 0.10), ('Floater', 0.05), ('Layup', 0.10)]
-            else:
-                shot_types = [('3PT Pull-Up', 0.28), ('3PT Catch & Shoot', 0.25), ('Fadeaway', 0.15),
-                              ('Floater', 0.12), ('Layup', 0.10), ('Mid Pull-Up', 0.10)]
+            situation = 'pressure_heave' if can_heave else 'pressure'
         else:
-            if pos == 'G':
-                shot_types = [('3PT Catch & Shoot', 0.20), ('3PT Pull-Up', 0.17), ('Mid Pull-Up', 0.14),
-                              ('Layup', 0.15), ('Floater', 0.11), ('Mid Catch & Shoot', 0.09),
-                              ('Fadeaway', 0.06), ('Reverse Layup', 0.05), ('Dunk', 0.03)]
-            elif pos == 'F':
-                shot_types = [('Mid Catch & Shoot', 0.17), ('3PT Catch & Shoot', 0.15), ('Mid Pull-Up', 0.15),
-                              ('Layup', 0.15), ('Fadeaway', 0.11), ('Dunk', 0.09), ('Floater', 0.07),
-                              ('Reverse Layup', 0.05), ('3PT Pull-Up', 0.06)]
-            else:  # 'C' or unknown
-                shot_types = [('Layup', 0.25), ('Dunk', 0.23), ('Hook Shot', 0.15), ('Fadeaway', 0.12),
-                              ('Mid Catch & Shoot', 0.08), ('Reverse Layup', 0.07), ('Floater', 0.05),
-                              ('3PT Catch & Shoot', 0.05)]
-
-        types, weights = zip(*shot_types)
-        shot_type = random.choices(types, weights=weights, k=1)[0]
+            situation = pos if pos in ('G', 'F') else 'C'
+
+        types, cum_weights = self._shot_tables[situation]
+        shot_type = rng.weighted(types, cum_weights)
+        ins.stop("shot_selection", t0)
 
+        t0 = ins.start()
         defense_team = self.get_defensive_team()
-        defenders = defense_team.lineup
-        if random.random() < 0.10:
-            responsible_defender = random.choice(defenders)
+        tables = defense_team.tables
+        same_pos = tables.by_position.get(pos)
+        if same_pos is None or rng.random() < self.params.random_defender_rate:
+            # help defense (or nobody at the shooter's position)
+            responsible_defender = rng.weighted(tables.players, tables.help_defense)
         else:
-            same_pos = [d for d in defenders if d.position == pos]
-            responsible_defender = random.choice(same_pos) if same_pos else random.choice(defenders)
+            responsible_defender = same_pos[0] if len(same_pos) == 1 else rng.choice(same_pos)
         defenders_involved = [responsible_defender]
+        ins.stop("defender_selection", t0)
 
         # Fouls
         team_fouls = self.team_fouls[defense_team.name][self.quarter]
-        base_foul = 0.07 if shot_type in ('Layup', 'Dunk', 'Reverse Layup', 'Floater', 'Hook Shot') else 0.02
+        base_foul = self.params.base_foul_close if shot_type in CLOSE_SHOT_TYPES else self.params.base_foul_jumper
 
         # Shooting foul
         if self.should_commit_foul(responsible_defender, shooting=True, team_fouls=team_fouls, base_foul=base_foul):
             responsible_defender.stats['FOUL'] += 1
             responsible_defender.fouls += 1
             self.team_fouls[defense_team.name][self.quarter] += 1
-            self.play_by_play.append(
-                f"[Q{self.quarter} {self.format_time()}] {shooter.name} misses {shot_type} "
-                f"but is fouled by {responsible_defender.name} "
-                f"(Personal Fouls: {responsible_defender.fouls} | "
-                f"Team Fouls: {self.team_fouls[defense_team.name][self.quarter]})"
-            )
+            self.log("shooting_foul", "{} misses {} but is fouled by {} (Personal Fouls: {} | Team Fouls: {})",
+                     shooter.name, shot_type, responsible_defender.name, responsible_defender.fouls,
+                     self.team_fouls[defense_team.name][self.quarter])
             # Dead-ball during FT sequence is handled inside simulate_free_throws
             shots = 3 if '3PT' in shot_type else 2
             pos_changed = self.simulate_free_throws(shooter, num_shots=shots)
@@ -408,80 +841,53 @@ class Match:
             responsible_defender.stats['FOUL'] += 1
             responsible_defender.fouls += 1
             self.team_fouls[defense_team.name][self.quarter] += 1
-            self.play_by_play.append(
-                f"[Q{self.quarter} {self.format_time()}] Non-shooting foul by {responsible_defender.name} "
-                f"(Personal Fouls: {responsible_defender.fouls} | "
-                f"Team Fouls: {self.team_fouls[defense_team.name][self.quarter]}) "
-                f"on {shooter.name}{' [Fast Break]' if fast_break_flag else ''}"
-            )
+            in_bonus = self.team_fouls[defense_team.name][self.quarter] >= self.params.bonus_threshold
+            self.log("non_shooting_foul", "Non-shooting foul by {} (Personal Fouls: {} | Team Fouls: {}) on {}{}{}",
+                     responsible_defender.name, responsible_defender.fouls,
+                     self.team_fouls[defense_team.name][self.quarter], shooter.name,
+                     ' [Fast Break]' if fast_break_flag else '', ' [Bonus]' if in_bonus else '')
             # Dead-ball whistle -> no rebound expected
             self.guard.whistle()
 
-            # Bonus free throws?
-            if self.team_fouls[defense_team.name][self.quarter] >= 5:
-                shots = 3 if '3PT' in shot_type else 2
-                pos_changed = self.simulate_free_throws(shooter, num_shots=shots)
+            # Bonus free throws (always two on a non-shooting foul)
+            if in_bonus:
+                pos_changed = self.simulate_free_throws(shooter, num_shots=2)
                 if log_possession and pos_changed:
                     self.set_possession(self.get_defensive_team())
                 if return_type:
                     return shooter, defenders_involved, shot_type, fast_break_flag, pos_changed
                 return shooter, defenders_involved
 
+            # Offense keeps the ball; the shot clock resets like after an offensive rebound
+            self.shot_clock = max(self.shot_clock, 14)
             if return_type:
                 return shooter, defenders_involved, shot_type, fast_break_flag, False
             return shooter, defenders_involved
 
         # Shot resolution
         # Compute success chance (coarse but stable)
-        offense_skill = 0.0
-        attr_map = {
-            '3PT Catch & Shoot': ['form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork'],
-            '3PT Pull-Up':       ['form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork','agility','acceleration'],
-            '3PT Heave':         ['arm_strength','finesse','composure','bravery'],
-            'Mid Catch & Shoot': ['form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork'],
-            'Mid Pull-Up':       ['form_technique','finesse','hand_eye_coordination','balance','composure','consistency','awareness','teamwork','agility','acceleration'],
-            'Floater':           ['finesse','creativity','reactions','balance','hand_eye_coordination','composure'],
-            'Fadeaway':          ['finesse','form_technique','core_strength','balance','composure','creativity'],
-            'Layup':             ['finesse','core_strength','acceleration','agility','composure','balance','jumping','hand_eye_coordination'],
-            'Dunk':              ['grip_strength','jumping','balance','acceleration','bravery'],
-            'Hook Shot':         ['form_technique','finesse','core_strength','balance','composure'],
-            'Reverse Layup':     ['finesse','balance','agility','creativity','composure','grip_strength'],
-        }
-        use_attrs = attr_map.get(shot_type, ['form_technique','finesse','hand_eye_coordination'])
-        vals = [getattr(shooter.attributes, a) for a in use_attrs]
-        offense_skill = sum(vals) / len(vals)
-        height_factor = (shooter.attributes.height - 72) / 15
-        offense_skill *= (1.0 + 0.1 * height_factor)
-        offense_skill *= shooter.attributes.stamina / 100.0
-
-        team_attrs = ['teamwork','patience','awareness']
-        team_vals = [
-            sum(getattr(p.attributes, a) for p in self.possession_team.lineup) / len(self.possession_team.lineup)
-            for a in team_attrs
-        ]
-        team_boost = sum(team_vals) / (100 * len(team_attrs))
-        offense_skill *= (1.0 + 0.1 * team_boost)
-
-        defense_pressure = (responsible_defender.attributes.awareness +
-                            responsible_defender.attributes.balance +
-                            responsible_defender.attributes.reactions) / 3.0
-
-        if shot_type == '3PT Heave':
-            success_chance = 0.03
-        else:
-            success_chance = max(0.10, min(0.95, (offense_skill - defense_pressure + 50) / 150.0))
+        t0 = ins.start()
+        offense_skill = shot_skill(shooter.attributes, shot_type)
+        offense_skill *= (1.0 + 0.1 * self.possession_team.team_boost)
+        offense_skill *= 1.0 - self.params.fatigue_penalty * shooter.fatigue
+        success_chance = self.success_chance(shot_type, offense_skill, defense_pressure(responsible_defender.attributes))
 
         shooter.stats['FGA'] += 1
-        made = random.random() < success_chance
+        if '3PT' in shot_type:
+            shooter.stats['3PA'] += 1
+        made = rng.random() < success_chance
+        ins.stop("shot_resolution", t0)
 
         # Assist logic (simple)
         assist = None
         if made:
-            if 'Catch & Shoot' in shot_type or (random.random() < 0.5 and shot_type not in ('3PT Heave',)):
-                mates = [p for p in self.possession_team.lineup if p != shooter]
+            t0 = ins.start()
+            if 'Catch & Shoot' in shot_type or (rng.random() < 0.5 and shot_type not in ('3PT Heave',)):
+                mates, cum_weights = self.possession_team.tables.assist[self.possession_team.lineup.index(shooter)]
                 if mates:
-                    assist = random.choice(mates)
+                    assist = rng.weighted(mates, cum_weights)
                     assist.stats['AST'] += 1
+            ins.stop("assist", t0)
 
         # Make/miss logging
         if made:
@@ -493,13 +899,9 @@ class Match:
             self.possession_team.score += pts
             self.possession_team.quarter_scores[self.quarter] += pts
             simple = shot_type.replace("Catch & Shoot ", "").replace("Pull-Up ", "")
-            line = f"[Q{self.quarter} {self.format_time()}] {shooter.name} Made {simple}"
-            if assist:
-                line += f" (assist: {assist.name})"
-            if fast_break_flag:
-                line += " [Fast Break]"
-            line += f" [{self.team_a.name}: {self.team_a.score} | {self.team_b.name}: {self.team_b.score}]"
-            self.play_by_play.append(line)
+            self.log("fg_made", "{} Made {}{}{} [{}: {} | {}: {}]", shooter.name, simple,
+                     f" (assist: {assist.name})" if assist else "", " [Fast Break]" if fast_break_flag else "",
+                     self.team_a.name, self.team_a.score, self.team_b.name, self.team_b.score)
 
             # Dead-ball after a made FG
             self.guard.mark_shot_made()
@@ -512,10 +914,8 @@ class Match:
 
         # Missed shot (buzzer beater special case)
         if buzzer_beater:
-            self.play_by_play.append(
-                f"[Q{self.quarter} {self.format_time()}] {shooter.name} missed a {shot_type}"
-                f"{' [Fast Break]' if fast_break_flag else ''}"
-            )
+            self.log("fg_missed", "{} missed a {}{}", shooter.name, shot_type,
+                     " [Fast Break]" if fast_break_flag else "")
             # End of period -> no rebound expected
             self.guard.whistle()
             if return_type:
@@ -524,47 +924,47 @@ class Match:
 
         # Miss with possible block
         block = None
-        if random.random() < 0.10:
-            pool = self.get_defensive_team().lineup
-            block = random.choice(pool)
+        if rng.random() < self.params.block_rate:
+            tables = self.get_defensive_team().tables
+            block = rng.weighted(tables.players, tables.block)
             block.stats['BLK'] += 1
             defenders_involved.append(block)
-            self.play_by_play.append(
-                f"[Q{self.quarter} {self.format_time()}] {shooter.name} had {shot_type} blocked by {block.name}"
-                f"{' [Fast Break]' if fast_break_flag else ''}"
-            )
+            # logged as a miss so the attempt is tallied like any other FGA
+            self.log("block", "{} missed a {} (blocked by {}){}", shooter.name, shot_type, block.name,
+                     " [Fast Break]" if fast_break_flag else "")
         else:
-            self.play_by_play.append(
-                f"[Q{self.quarter} {self.format_time()}] {shooter.name} missed a {shot_type}"
-                f"{' [Fast Break]' if fast_break_flag else ''}"
-            )
+            self.log("fg_missed", "{} missed a {}{}", shooter.name, shot_type,
+                     " [Fast Break]" if fast_break_flag else "")
 
         # We now expect a rebound (default: defense)
         self.guard.mark_shot_missed(self.possession_team.name)
 
         # Rebound logic
+        t0 = ins.start()
         off_team = self.possession_team
         def_team = self.get_defensive_team()
         # Slightly favor defense on live-ball rebounds
-        if random.random() < 0.30:
+        if rng.random() < self.params.oreb_rate:
             rebound_team = off_team
             pos_changed = False
         else:
             rebound_team = def_team
             pos_changed = True
 
-        rebounder = random.choice(rebound_team.lineup)
+        tables = rebound_team.tables
+        rebounder = rng.weighted(tables.players, tables.rebound)
         rebounder.stats['REB'] += 1
+        ins.stop("rebound", t0)
         if rebound_team == off_team:
-            self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] Offensive rebound by {rebounder.name}")
+            self.log("offensive_rebound", "Offensive rebound by {}", rebounder.name)
         else:
-            self.play_by_play.append(f"[Q{self.quarter} {self.format_time()}] Defensive rebound by {rebounder.name}")
+            self.log("defensive_rebound", "Defensive rebound by {}", rebounder.name)
 
         # Rebound consumes the expectation
         self.guard.consume_rebound()
 
         # Shot clock reset: assume rim hit on most non-heave attempts
-        ball_hit_rim = (shot_type != '3PT Heave') or (random.random() < 0.2)
+        ball_hit_rim = (shot_type != '3PT Heave') or (rng.random() < 0.2)
         if ball_hit_rim:
             if rebound_team == def_team:
                 self.shot_clock = 24
@@ -579,10 +979,148 @@ class Match:
         return shooter, defenders_involved
 
     def simulate_turnover(self, shooter: Player, log_possession: bool = True):
-        turnover_types = ['bad pass', 'travel', 'stepped out of bounds', 'offensive foul', 'lost ball', 'shot clock violation']
-        ttype = random.choice(turnover_types)
+        rng = self.rng
+        ttype = rng.choice(TURNOVER_TYPES)
         shooter.stats['TO'] += 1
-        event = f"[Q{self.quarter} {self.format_time()}] Turnover by {shooter.name} ({ttype})"
+        defense_team = self.get_defensive_team()
 
         # Potential steal only on live-ball TOs
-        defense_team = self.get_def
+        stealer = None
+        if ttype in LIVE_BALL_TURNOVERS and rng.random() < self.params.steal_rate:
+            stealer = rng.choice(defense_team.lineup)
+            stealer.stats['STL'] += 1
+        elif ttype == 'offensive foul':
+            shooter.stats['FOUL'] += 1
+            shooter.fouls += 1
+
+        if stealer:
+            self.log("steal", "Turnover by {} ({}), stolen by {}", shooter.name, ttype, stealer.name)
+        else:
+            self.log("turnover", "Turnover by {} ({})", shooter.name, ttype)
+
+        # Dead-ball (or change of possession on a steal) -> no rebound expected
+        self.guard.whistle()
+        if log_possession:
+            self.set_possession(defense_team)
+        return stealer
+
+    # ---------- Game driver ----------
+    def turnover_chance(self, handler: Player) -> float:
+        care = (handler.attributes.awareness + handler.attributes.composure +
+                handler.attributes.hand_eye_coordination) / 300.0
+        return self.params.turnover_rate * (1.5 - care)
+
+    def play_possession(self) -> int:
+        """
+        Play one trip down the floor (an offensive rebound starts another one)
+        and return the game seconds it used.
+        """
+        rng = self.rng
+        params = self.params
+        team = self.possession_team
+        self.possession_number += 1
+
+        # Dribble out: leading team with the game decided just runs the clock
+        if self.should_dribble_out_q4() and team is self.leading_team():
+            seconds = self.time_remaining
+            self.time_remaining = 0
+            self._last_possession_time = seconds
+            self.log("dribble_out", "{} dribble out the clock", team.name)
+            self.update_minutes_played()
+            return seconds
+
+        fast_break = False
+        if self.fast_break_eligible:
+            chance = params.fast_break_after_steal if self.last_event == "steal" else params.fast_break_after_rebound
+            fast_break = rng.random() < chance
+        if fast_break:
+            seconds = FAST_BREAK_SECONDS[int(rng.random() * len(FAST_BREAK_SECONDS))]
+        else:
+            seconds = min(POSSESSION_QUANTILES[int(rng.random() * POSSESSION_QUANTILE_COUNT)], self.shot_clock)
+
+        # Possession that cannot finish before the horn is the period's last shot
+        buzzer = seconds >= self.time_remaining
+        if buzzer:
+            seconds = self.time_remaining
+        self.time_remaining -= seconds
+        self.shot_clock -= seconds
+        self._last_possession_time = seconds
+
+        if buzzer:
+            self.simulate_shot(fast_break_override=fast_break, buzzer_beater=True)
+        else:
+            self.play_trip(fast_break)
+
+        self.fast_break_eligible = self.last_event in FAST_BREAK_TRIGGERS
+        self.update_minutes_played()
+        return seconds
+
+    def play_trip(self, fast_break: bool):
+        """Resolve a possession that beats the horn: a turnover or a shot."""
+        rng = self.rng
+        handler = rng.choice(self.possession_team.lineup)
+        if not fast_break and rng.random() < self.turnover_chance(handler):
+            self.simulate_turnover(handler)
+        else:
+            self.simulate_shot(fast_break_override=fast_break)
+
+    def start_period(self, length: int):
+        self.time_remaining = length
+        self.shot_clock = 24
+        self.fast_break_eligible = False
+        for team in (self.team_a, self.team_b):
+            self.team_fouls[team.name].setdefault(self.quarter, 0)
+            team.quarter_scores.setdefault(self.quarter, 0)
+        if self.quarter == 1 or self.quarter > 4:
+            self.tip_off()
+        else:
+            # Tip loser starts Q2 and Q3, tip winner starts Q4
+            winner = self.initial_tip_winner
+            loser = self.team_b if winner is self.team_a else self.team_a
+            self.set_possession(winner if self.quarter == 4 else loser)
+        self.possession_start_time = self.time_remaining
+        self.guard.whistle()
+
+    def run(self):
+        """
+        Generator driving the whole game; yields the seconds used by each
+        possession so callers can pace or interleave games. simulate() just
+        drains it, so fast and logged runs go through the same loop.
+        """
+        quarter = 0
+        while quarter < 4 or self.team_a.score == self.team_b.score:
+            quarter += 1
+            self.quarter = quarter
+            self.start_period(QUARTER_SECONDS if quarter <= 4 else OVERTIME_SECONDS)
+            while self.time_remaining > 0:
+                yield self.play_possession()
+            self.log("end_of_quarter", "End of quarter. Score: {} {} - {} {}",
+                     self.team_a.name, self.team_a.score, self.team_b.score, self.team_b.name)
+            self.rotation.rest(HALFTIME_SECONDS if quarter == 2 else PERIOD_BREAK_SECONDS)
+        self.finish()
+
+    def simulate(self):
+        for _ in self.run():
+            pass
+        return self
+
+    def finish(self):
+        if not self.logged:
+            return
+        a, b = self.team_a, self.team_b
+        self.play_by_play.append("--- Game Over ---")
+        self.play_by_play.append(f"Final Score: {a.name} {a.score} - {b.score} {b.name}")
+        self.play_by_play.extend(self.box_score_lines())
+
+    def box_score_lines(self) -> List[str]:
+        lines = []
+        for team in (self.team_a, self.team_b):
+            lines.append(f"{team.name}:")
+            for p in team.roster:
+                stats = dict(p.stats, MIN=round(p.stats['MIN'], 1))
+                lines.append(f"  {p.name}: {stats}")
+        return lines
+
+    def write_log(self, path: str = "play_by_play_log.txt"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.play_by_play) + "\n")
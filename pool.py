@@ -0,0 +1,59 @@
+# pool.py
+# Reusable matches for long-running simulation services.
+#
+# A MatchPool hands out copy_teams=True matches and takes them back after
+# the game. A returned match is reset() onto the next game's rosters, so a
+# worker playing millions of games keeps reusing the same Match, Team and
+# Player objects, stats dicts, team-foul tables and possession guard instead
+# of allocating them per game. Idle matches are grouped by roster sizes; any
+# matchup with the same sizes can reuse them.
+#
+#   pool = MatchPool(logged=False)
+#   for seed in seeds:
+#       with pool.match(home, away, rng=make_rng(seed)) as match:
+#           match.simulate()
+#           record(match.team_a.score, match.team_b.score)
+#
+# Whatever the block reads from the match is overwritten by the next game:
+# copy out what you keep. A pool is not thread-safe; give each worker thread
+# its own.
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from multiball_basketball import Match, Team
+
+
+class MatchPool:
+    def __init__(self, match_class=Match, *, max_idle: int = 16, **match_kwargs):
+        # match_kwargs go to match_class, e.g. params=, logged=, tables= (CoarseMatch)
+        self.match_class = match_class
+        self.match_kwargs = match_kwargs
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._idle: Dict[Tuple[int, int], List[Match]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(matches) for matches in self._idle.values())
+
+    def acquire(self, team_a: Team, team_b: Team, rng=None, *, seed: Optional[int] = None) -> Match:
+        """A match between copies of team_a and team_b, ready to simulate."""
+        idle = self._idle.get((len(team_a.roster), len(team_b.roster)))
+        if idle:
+            self.reused += 1
+            return idle.pop().reset(team_a, team_b, rng, seed=seed)
+        self.created += 1
+        return self.match_class(team_a, team_b, rng=rng, seed=seed, copy_teams=True, **self.match_kwargs)
+
+    def release(self, match: Match):
+        if len(self) < self.max_idle:
+            self._idle.setdefault((len(match.team_a.roster), len(match.team_b.roster)), []).append(match)
+
+    @contextmanager
+    def match(self, team_a: Team, team_b: Team, rng=None, *, seed: Optional[int] = None) -> Iterator[Match]:
+        match = self.acquire(team_a, team_b, rng, seed=seed)
+        try:
+            yield match
+        finally:
+            self.release(match)
@@ -0,0 +1,233 @@
+# projections.py
+# Per-player stat projections (props) for single upcoming games.
+#
+# A batch of simulations of one matchup is reduced to a histogram of every
+# player's box-score value per stat. Quantiles and over/under probabilities
+# for any line are then read off the histograms, and batches are cached by
+# the two roster fingerprints, so re-querying a matchup with new lines costs
+# nothing. Chunks of games run in parallel (processes, or threads on
+# free-threaded builds); a slate's chunks all share one executor.
+#
+#   projector = Projector(games=2000, workers=8, engine="coarse")
+#   projection = projector.project(home, away)
+#   projection.quantiles("T1", "PTS")            # {0.1: 9, 0.25: 12, 0.5: 15, ...}
+#   projector.props(home, away, [("T1", "PTS", 14.5), ("D3", "REB", 6.5)])
+#   projector.project_slate([(home, away), (h2, a2), ...])
+#
+# Game k of every batch uses seed `seed + k`, so projections are reproducible
+# and do not depend on the number of workers.
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from multiball_basketball import EngineParams, Team
+from pool import MatchPool
+from rng import make_rng
+from rotation import ForfeitError
+
+PROP_STATS = ('PTS', 'REB', 'AST', '3PM', 'FTA')
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+ENGINES = ("detailed", "coarse")
+EXECUTORS = ("process", "thread")
+
+
+class Prop(NamedTuple):
+    player: str
+    stat: str
+    line: float
+    mean: float
+    over: float     # P(value > line)
+    under: float    # P(value < line); 1 - over - under is the push probability on integer lines
+
+
+@dataclass
+class Projection:
+    teams: List[str]
+    games: int = 0                  # completed games (forfeits excluded)
+    forfeits: int = 0
+    team_of: Dict[str, int] = field(default_factory=dict)  # player name -> side
+    hist: Dict[str, Dict[str, Dict[int, int]]] = field(default_factory=dict)  # player -> stat -> value -> games
+
+    def add(self, team_a: Team, team_b: Team, stats: Sequence[str] = PROP_STATS):
+        self.games += 1
+        for side, team in enumerate((team_a, team_b)):
+            for p in team.roster:
+                per_stat = self.hist.get(p.name)
+                if per_stat is None:
+                    if p.name in self.team_of:
+                        raise ValueError(f"player name {p.name!r} appears in both rosters")
+                    self.team_of[p.name] = side
+                    per_stat = self.hist[p.name] = {k: {} for k in stats}
+                for k, h in per_stat.items():
+                    v = p.stats[k]
+                    h[v] = h.get(v, 0) + 1
+
+    def merge(self, other: "Projection"):
+        self.games += other.games
+        self.forfeits += other.forfeits
+        self.team_of.update(other.team_of)
+        for name, per_stat in other.hist.items():
+            mine = self.hist.setdefault(name, {k: {} for k in per_stat})
+            for k, theirs in per_stat.items():
+                h = mine[k]
+                for v, n in theirs.items():
+                    h[v] = h.get(v, 0) + n
+
+    def players(self, side: Optional[int] = None) -> List[str]:
+        return [name for name, s in self.team_of.items() if side is None or s == side]
+
+    def _hist(self, player: str, stat: str) -> Dict[int, int]:
+        if not self.games:
+            raise ValueError(f"no completed games for {self.teams[0]} vs {self.teams[1]}"
+                             f" ({self.forfeits} forfeits)")
+        try:
+            return self.hist[player][stat]
+        except KeyError:
+            raise KeyError(f"no {stat!r} distribution for {player!r}") from None
+
+    # ---------- Distribution queries ----------
+    def distribution(self, player: str, stat: str) -> Dict[int, float]:
+        """P(value) for each simulated value, ascending."""
+        h = self._hist(player, stat)
+        return {v: h[v] / self.games for v in sorted(h)}
+
+    def mean(self, player: str, stat: str) -> float:
+        h = self._hist(player, stat)
+        return sum(v * n for v, n in h.items()) / self.games
+
+    def quantiles(self, player: str, stat: str, qs: Sequence[float] = DEFAULT_QUANTILES) -> Dict[float, int]:
+        """Smallest value whose CDF reaches q, per q."""
+        h = self._hist(player, stat)
+        values = sorted(h)
+        out = {}
+        cum, i = 0, -1
+        for q in sorted(qs):
+            while i + 1 < len(values) and cum < q * self.games:
+                i += 1
+                cum += h[values[i]]
+            out[q] = values[max(i, 0)]
+        return {q: out[q] for q in qs}
+
+    def prop(self, player: str, stat: str, line: float) -> Prop:
+        h = self._hist(player, stat)
+        over = sum(n for v, n in h.items() if v > line) / self.games
+        under = sum(n for v, n in h.items() if v < line) / self.games
+        return Prop(player, stat, line, self.mean(player, stat), over, under)
+
+    def format(self, stats: Sequence[str] = PROP_STATS) -> str:
+        lines = [f"{self.teams[0]} vs {self.teams[1]}: {self.games} games"
+                 + (f", {self.forfeits} forfeits" if self.forfeits else "")]
+        if not self.games:
+            return lines[0]
+        lines.append(f"{'player':<12}" + "".join(f"{k:>16}" for k in stats))
+        for name in self.players():
+            cells = []
+            for k in stats:
+                q = self.quantiles(name, k, (0.1, 0.5, 0.9))
+                cells.append(f"{self.mean(name, k):5.1f} [{q[0.1]}-{q[0.9]}]")
+            lines.append(f"{name:<12}" + "".join(f"{c:>16}" for c in cells))
+        return "\n".join(lines)
+
+
+def _simulate_chunk(team_a: Team, team_b: Team, params: Optional[EngineParams], backend: str, engine: str,
+                    stats: Tuple[str, ...], seeds: range) -> Projection:
+    projection = Projection([team_a.name, team_b.name])
+    if engine == "coarse":
+        from coarse import CoarseMatch, OutcomeTables
+
+        pool = MatchPool(CoarseMatch, tables=OutcomeTables(params))
+    else:
+        pool = MatchPool(params=params, logged=False)
+    for s in seeds:
+        with pool.match(team_a, team_b, rng=make_rng(s, backend=backend)) as match:
+            try:
+                match.simulate()
+            except ForfeitError:
+                projection.forfeits += 1
+                continue
+            projection.add(match.team_a, match.team_b, stats)
+    return projection
+
+
+class Projector:
+    def __init__(self, games: int = 1000, seed: int = 0, *, params: Optional[EngineParams] = None,
+                 backend: str = "python", engine: str = "detailed", stats: Sequence[str] = PROP_STATS,
+                 workers: int = 1, executor: str = "process", chunk_size: Optional[int] = None,
+                 max_cached: int = 64):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}; expected one of {EXECUTORS}")
+        if games < 1:
+            raise ValueError(f"games must be at least 1, got {games}")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.games = games
+        self.seed = seed
+        self.params = params
+        self.backend = backend
+        self.engine = engine
+        self.stats = tuple(stats)
+        self.workers = workers
+        self.executor = executor
+        # Default: each matchup's games split evenly over the workers; long
+        # chunks keep the coarse engine's outcome tables warm
+        self.chunk_size = chunk_size or -(-games // (workers or os.cpu_count() or 1))
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
+        self._cache: Dict[Tuple[str, str], Projection] = {}
+
+    def _key(self, team_a: Team, team_b: Team) -> Tuple[str, str]:
+        return team_a.fingerprint(), team_b.fingerprint()
+
+    def project(self, team_a: Team, team_b: Team) -> Projection:
+        return self.project_slate([(team_a, team_b)])[0]
+
+    def project_slate(self, matchups: Sequence[Tuple[Team, Team]]) -> List[Projection]:
+        """Projections for every (home, away) pair; uncached ones are simulated together."""
+        keys = [self._key(a, b) for a, b in matchups]
+        todo = {}
+        for key, (a, b) in zip(keys, matchups):
+            if key in self._cache:
+                self.hits += 1
+                self._cache[key] = self._cache.pop(key)  # most recently used last
+            elif key not in todo:
+                self.misses += 1
+                todo[key] = (a, b)
+        for key, projection in zip(todo, self._simulate(list(todo.values()))):
+            self._cache[key] = projection
+        out = [self._cache[key] for key in keys]
+        while len(self._cache) > self.max_cached:
+            del self._cache[next(iter(self._cache))]
+        return out
+
+    def props(self, team_a: Team, team_b: Team, lines: Iterable[Tuple[str, str, float]]) -> List[Prop]:
+        """Over/under for (player, stat, line) triples, from the matchup's cached batch."""
+        projection = self.project(team_a, team_b)
+        return [projection.prop(player, stat, line) for player, stat, line in lines]
+
+    def _simulate(self, matchups: List[Tuple[Team, Team]]) -> List[Projection]:
+        seeds = range(self.seed, self.seed + self.games)
+        chunks = [seeds[i:i + self.chunk_size] for i in range(0, self.games, self.chunk_size)]
+        jobs = [(m, chunk) for m in range(len(matchups)) for chunk in chunks]
+        args = [(matchups[m][0], matchups[m][1], self.params, self.backend, self.engine, self.stats, chunk)
+                for m, chunk in jobs]
+        if self.workers == 1 or len(jobs) <= 1:
+            parts = [_simulate_chunk(*a) for a in args]
+        else:
+            if self.executor == "thread":
+                from concurrent.futures import ThreadPoolExecutor as Executor
+
+                from threaded import prime
+
+                prime(t for pair in matchups for t in pair)
+            else:
+                from concurrent.futures import ProcessPoolExecutor as Executor
+            with Executor(max_workers=self.workers or None) as executor:
+                parts = list(executor.map(_simulate_chunk, *zip(*args)))
+        results = [Projection([a.name, b.name]) for a, b in matchups]
+        for (m, _), part in zip(jobs, parts):
+            results[m].merge(part)
+        return results
@@ -0,0 +1,261 @@
+# result_cache.py
+# On-disk, content-addressed cache of aggregated matchup simulations.
+#
+# The key hashes both rosters (Team.fingerprint), the EngineParams, the seed
+# range, the RNG backend and the engine version (a hash of the source of every
+# module that affects a game), so any change to attributes, params or engine
+# code addresses a different entry and stale ones simply age out. Entries are
+# small JSON files; a hit refreshes the file's mtime, and once the directory
+# exceeds max_bytes the least recently used entries are evicted.
+#
+#   cache = ResultCache(".multiball_cache", max_bytes=64 << 20)
+#   result = cache.simulate(home, away, games=500, seed=0, workers=8)
+#   result.win_probability, result.averages[0]['PTS'], result.score_hist[1]
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from multiball_basketball import EngineParams, Match, Team
+from rng import make_rng
+from rotation import ForfeitError
+
+# Entry points whose source decides game outcomes; every module of this
+# repository they import, directly or not, is part of the engine version too
+ENGINE_MODULES = ("result_cache", "multiball_basketball", "coarse", "pool")
+STAT_KEYS = ('PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'FOUL', 'MIN')
+DEFAULT_MAX_BYTES = 256 << 20
+SUFFIX = ".json"
+
+_engine_version: Optional[str] = None
+
+
+def engine_modules() -> List[str]:
+    """ENGINE_MODULES and the repository modules they import, transitively, sorted."""
+    import ast
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    seen = set()
+    todo = list(ENGINE_MODULES)
+    while todo:
+        name = todo.pop()
+        path = os.path.join(root, name + ".py")
+        if name in seen or not os.path.isfile(path):
+            continue  # stdlib, third-party or already visited
+        seen.add(name)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):  # includes imports deferred into functions
+            if isinstance(node, ast.Import):
+                todo.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                todo.append(node.module)
+    return sorted(seen)
+
+
+def engine_version() -> str:
+    """Hash of the engine source files (computed once per process)."""
+    global _engine_version
+    if _engine_version is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for name in engine_modules():
+            h.update(name.encode())
+            with open(os.path.join(root, name + ".py"), "rb") as f:
+                h.update(f.read())
+        _engine_version = h.hexdigest()[:16]
+    return _engine_version
+
+
+def cache_key(team_a: Team, team_b: Team, games: int, seed: int, params: Optional[EngineParams] = None,
+              backend: str = "python") -> str:
+    parts = (team_a.fingerprint(), team_b.fingerprint(), (params or EngineParams()).fingerprint(),
+             games, seed, backend, engine_version())
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+# --------------------------------------------------------------------
+# Aggregated results
+# --------------------------------------------------------------------
+
+@dataclass
+class MatchupResult:
+    teams: List[str]
+    games: int = 0                  # completed games (forfeits excluded)
+    forfeits: int = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    score_hist: List[Dict[int, int]] = field(default_factory=lambda: [{}, {}])
+    margin_hist: Dict[int, int] = field(default_factory=dict)      # team_a score - team_b score
+    totals: List[Dict[str, float]] = field(default_factory=lambda: [{}, {}])  # team box-score sums
+    players: List[Dict[str, Dict[str, float]]] = field(default_factory=lambda: [{}, {}])  # per side, by name
+
+    @property
+    def win_probability(self) -> float:
+        return self.wins[0] / self.games if self.games else 0.5
+
+    @property
+    def averages(self) -> List[Dict[str, float]]:
+        return [{k: v / max(self.games, 1) for k, v in t.items()} for t in self.totals]
+
+    @property
+    def player_averages(self) -> List[Dict[str, Dict[str, float]]]:
+        n = max(self.games, 1)
+        return [{name: {k: v / n for k, v in stats.items()} for name, stats in side.items()} for side in self.players]
+
+    def add(self, team_a: Team, team_b: Team):
+        self.games += 1
+        a, b = team_a.score, team_b.score
+        self.wins[0 if a > b else 1] += 1
+        self.margin_hist[a - b] = self.margin_hist.get(a - b, 0) + 1
+        for side, team in enumerate((team_a, team_b)):
+            hist = self.score_hist[side]
+            hist[team.score] = hist.get(team.score, 0) + 1
+            totals = self.totals[side]
+            for p in team.roster:
+                stats = self.players[side].setdefault(p.name, {})
+                for k in STAT_KEYS:
+                    v = p.stats[k]
+                    stats[k] = stats.get(k, 0) + v
+                    totals[k] = totals.get(k, 0) + v
+
+    def merge(self, other: "MatchupResult"):
+        self.games += other.games
+        self.forfeits += other.forfeits
+        self.wins = [x + y for x, y in zip(self.wins, other.wins)]
+        for mine, theirs in zip(self.score_hist + [self.margin_hist], other.score_hist + [other.margin_hist]):
+            for k, v in theirs.items():
+                mine[k] = mine.get(k, 0) + v
+        for mine, theirs in zip(self.totals, other.totals):
+            for k, v in theirs.items():
+                mine[k] = mine.get(k, 0) + v
+        for side, theirs in zip(self.players, other.players):
+            for name, stats in theirs.items():
+                mine = side.setdefault(name, {})
+                for k, v in stats.items():
+                    mine[k] = mine.get(k, 0) + v
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> "MatchupResult":
+        d = json.loads(text)
+        # JSON object keys are strings; histograms are keyed by int
+        d['score_hist'] = [{int(k): v for k, v in h.items()} for h in d['score_hist']]
+        d['margin_hist'] = {int(k): v for k, v in d['margin_hist'].items()}
+        return cls(**d)
+
+
+def _simulate_range(team_a: Team, team_b: Team, seeds: range, params: Optional[EngineParams],
+                    backend: str) -> MatchupResult:
+    result = MatchupResult([team_a.name, team_b.name])
+    for s in seeds:
+        a, b = team_a.copy(), team_b.copy()
+        try:
+            Match(a, b, params=params, logged=False, rng=make_rng(s, backend=backend)).simulate()
+        except ForfeitError:
+            result.forfeits += 1
+            continue
+        result.add(a, b)
+    return result
+
+
+def simulate_matchup(team_a: Team, team_b: Team, games: int, seed: int = 0, *,
+                     params: Optional[EngineParams] = None, backend: str = "python",
+                     workers: int = 1, chunk_size: int = 50) -> MatchupResult:
+    """Games on seeds seed .. seed+games-1, aggregated (in parallel if workers != 1)."""
+    seeds = range(seed, seed + games)
+    if workers == 1 or games <= chunk_size:
+        return _simulate_range(team_a, team_b, seeds, params, backend)
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [seeds[i:i + chunk_size] for i in range(0, games, chunk_size)]
+    n = len(chunks)
+    result = MatchupResult([team_a.name, team_b.name])
+    with ProcessPoolExecutor(max_workers=workers or None) as executor:
+        for part in executor.map(_simulate_range, [team_a] * n, [team_b] * n, chunks, [params] * n, [backend] * n):
+            result.merge(part)
+    return result
+
+
+# --------------------------------------------------------------------
+# Cache
+# --------------------------------------------------------------------
+
+class ResultCache:
+    def __init__(self, directory: str = ".multiball_cache", max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in self._entries())
+
+    def _entries(self):
+        return [e for e in os.scandir(self.directory) if e.name.endswith(SUFFIX) and e.is_file()]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[MatchupResult]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # LRU clock
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return MatchupResult.from_json(text)
+
+    def put(self, key: str, result: MatchupResult):
+        data = result.to_json().encode("utf-8")
+        path = self._path(key)
+        try:
+            old = os.path.getsize(path)
+        except FileNotFoundError:
+            old = 0
+        # Atomic publish: concurrent readers see the old entry or the new one, never a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self._size += len(data) - old
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, target: Optional[int] = None):
+        """Delete least recently used entries until the cache is at most `target` bytes (default 90% of max)."""
+        target = int(self.max_bytes * 0.9) if target is None else target
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in self._entries()]
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def clear(self):
+        self.evict(target=0)
+
+    def simulate(self, team_a: Team, team_b: Team, games: int = 100, seed: int = 0, *,
+                 params: Optional[EngineParams] = None, backend: str = "python",
+                 workers: int = 1) -> MatchupResult:
+        """Cached simulate_matchup: computed once per (rosters, params, seeds, backend, engine version)."""
+        key = cache_key(team_a, team_b, games, seed, params, backend)
+        result = self.get(key)
+        if result is None:
+            result = simulate_matchup(team_a, team_b, games, seed, params=params, backend=backend, workers=workers)
+            self.put(key, result)
+        return result
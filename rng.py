@@ -0,0 +1,100 @@
+# rng.py
+# Random-number backends for the Match engine.
+#
+# Every backend exposes the four draws the engine makes:
+#   random()                      uniform in [0, 1)
+#   uniform(a, b)
+#   choice(seq)
+#   weighted(population, cum_weights)   (same contract as random.choices(..., cum_weights=..., k=1)[0])
+#
+# PythonRNG wraps a private stdlib generator (seeded from `seed`, or from OS
+# entropy), never the module-global one, so matches on different threads
+# never share generator state. BlockRNG pre-draws uniforms in large blocks
+# from a numpy.random.Generator (PCG64 or Philox) and serves them from a
+# buffer; numpy is imported only when a BlockRNG is built.
+
+import random as _random
+from bisect import bisect
+from itertools import chain
+from typing import Optional, Sequence, Union
+
+DEFAULT_BLOCK_SIZE = 8192
+BIT_GENERATORS = ("pcg64", "philox")
+
+
+class PythonRNG:
+    def __init__(self, source=None, seed: Union[int, str, None] = None):
+        if source is None:
+            source = _random.Random(seed)
+        self.source = source
+        self.random = source.random
+        self.uniform = source.uniform
+        self.choice = source.choice
+
+    def weighted(self, population: Sequence, cum_weights: Sequence[float]):
+        return population[bisect(cum_weights, self.random() * cum_weights[-1], 0, len(cum_weights) - 1)]
+
+
+class BlockRNG:
+    """
+    Buffered numpy-backed stream. random() is the __next__ of an iterator over
+    pre-drawn blocks, so serving a draw never runs Python code except once per
+    block refill.
+    """
+    def __init__(self, bit_generator, block_size: int = DEFAULT_BLOCK_SIZE):
+        import numpy as np
+
+        self.bit_generator = bit_generator
+        self.block_size = block_size
+        self._generator = np.random.Generator(bit_generator)
+        self.random = chain.from_iterable(self._blocks()).__next__
+
+    def _blocks(self):
+        draw, size = self._generator.random, self.block_size
+        while True:
+            yield draw(size).tolist()
+
+    @classmethod
+    def stream(cls, seed: int, index: int = 0, *, bit_generator: str = "pcg64",
+               block_size: int = DEFAULT_BLOCK_SIZE) -> "BlockRNG":
+        """
+        Stream `index` of the family rooted at `seed`: the root bit generator
+        jumped ahead `index` times, so streams never overlap and any one of them
+        can be recreated without drawing the others.
+        """
+        import numpy as np
+
+        if bit_generator == "pcg64":
+            root = np.random.PCG64(seed)
+        elif bit_generator == "philox":
+            root = np.random.Philox(seed)
+        else:
+            raise ValueError(f"Unknown bit generator {bit_generator!r}; expected one of {BIT_GENERATORS}")
+        return cls(root.jumped(index) if index else root, block_size)
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def choice(self, seq: Sequence):
+        return seq[int(self.random() * len(seq))]
+
+    def weighted(self, population: Sequence, cum_weights: Sequence[float]):
+        return population[bisect(cum_weights, self.random() * cum_weights[-1], 0, len(cum_weights) - 1)]
+
+
+def make_rng(seed: Optional[int] = None, *, backend: str = "python", index: int = 0,
+             block_size: int = DEFAULT_BLOCK_SIZE):
+    """
+    Build a backend by name. For "python", stream `index` of `seed` is a stdlib
+    generator seeded with the string "seed/index" (hashed with SHA-512 by
+    random.seed, so distinct pairs never share a seed); index 0 is seeded
+    with `seed` itself. "pcg64"/"philox" give jump-ahead numpy streams.
+    """
+    if backend == "python":
+        if seed is None:
+            return PythonRNG()
+        return PythonRNG(seed=f"{seed}/{index}" if index else seed)
+    if backend in BIT_GENERATORS:
+        return BlockRNG.stream(seed if seed is not None else _random.SystemRandom().randrange(2 ** 63),
+                               index, bit_generator=backend, block_size=block_size)
+    raise ValueError(f"Unknown RNG backend {backend!r}")
@@ -0,0 +1,163 @@
+# rotation.py
+# Stamina drain, foul trouble and substitutions for the Match engine.
+#
+# Per possession only the ten players on court are touched. Bench players
+# recover lazily (their stamina is derived from the time they were benched),
+# and replacements come from per-position heaps ordered by player quality,
+# so the cost of a possession does not grow with roster size.
+
+import heapq
+import math
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+
+class ForfeitError(RuntimeError):
+    """A team cannot field five eligible players."""
+
+
+class TeamRotation:
+    def __init__(self, match, team, params):
+        self.match = match
+        self.team = team
+        self.params = params
+        self.clock = 0.0  # game seconds elapsed, for lazy bench recovery
+        self.fouled_out = set()
+        self._tiebreak = count()
+        self._bench: Dict[Optional[str], List[Tuple[float, int, object]]] = {}
+        self._benched_at: Dict[object, Tuple[float, float]] = {}
+        # While a substitution is pending: no bench player can be ready
+        # before this clock under this foul limit
+        self._wait_until = -math.inf
+        self._wait_limit: Optional[int] = None
+        on_court = set(map(id, team.lineup))
+        for p in team.roster:
+            if id(p) not in on_court:
+                self._bench_player(p)
+
+    # ---------- Bench bookkeeping ----------
+    @staticmethod
+    def quality(player) -> float:
+        off, dfn, _ = player.ratings()
+        return off + dfn
+
+    def _bench_player(self, player):
+        player.on_court = False
+        self._benched_at[player] = (self.clock, player.stamina)
+        self._wait_until = -math.inf
+        heapq.heappush(self._bench.setdefault(player.position, []),
+                       (-self.quality(player), next(self._tiebreak), player))
+
+    def bench_stamina(self, player) -> float:
+        since, stamina = self._benched_at[player]
+        return min(100.0, stamina + (self.clock - since) * self.params.stamina_recovery)
+
+    def _ready(self, player, foul_limit: int) -> bool:
+        return player.fouls < foul_limit and self.bench_stamina(player) >= self.params.sub_in_stamina
+
+    def ready_at(self, foul_limit: int) -> float:
+        """Earliest clock at which a bench player under foul_limit reaches sub_in_stamina."""
+        params = self.params
+        if params.stamina_recovery <= 0.0:
+            return math.inf
+        return min((since + (params.sub_in_stamina - stamina) / params.stamina_recovery
+                    for p, (since, stamina) in self._benched_at.items() if p.fouls < foul_limit),
+                   default=math.inf)
+
+    def _best_ready(self, heap, foul_limit: int, forced: bool):
+        # Pop past not-yet-ready players (restored afterwards); the top ready
+        # entry stays on the heap and is returned for the caller to claim.
+        skipped = []
+        found = None
+        while heap:
+            entry = heap[0]
+            if forced or self._ready(entry[2], foul_limit):
+                found = entry
+                break
+            skipped.append(heapq.heappop(heap))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+    def _take_candidate(self, position, foul_limit: int, forced: bool):
+        own = self._bench.get(position)
+        best = self._best_ready(own, foul_limit, forced) if own else None
+        best_heap = own
+        if best is None:
+            for pos, heap in self._bench.items():
+                if pos == position or not heap:
+                    continue
+                entry = self._best_ready(heap, foul_limit, forced)
+                if entry is not None and (best is None or entry < best):
+                    best, best_heap = entry, heap
+        if best is None:
+            return None
+        best_heap.remove(best)
+        heapq.heapify(best_heap)
+        player = best[2]
+        player.stamina = self.bench_stamina(player)
+        del self._benched_at[player]
+        return player
+
+    def rest(self, seconds: float):
+        # Break between periods: bench keeps recovering lazily, starters recover here
+        self.clock += seconds
+        for p in self.team.lineup:
+            p.stamina = min(100.0, p.stamina + seconds * self.params.stamina_recovery)
+            p.fatigue = 1.0 - p.stamina / 100.0
+
+    # ---------- Per possession ----------
+    def foul_limit(self, quarter: int) -> int:
+        trouble = self.params.foul_trouble
+        return trouble[min(quarter, len(trouble)) - 1]
+
+    def check(self, player, foul_limit: int) -> bool:
+        """
+        Substitute `player` if tired or in foul trouble. Returns True when they
+        should come out but nobody is ready to replace them.
+        """
+        params = self.params
+        forced = player.fouls >= params.foul_out
+        if not (forced or player.fouls >= foul_limit or player.stamina < params.sub_out_stamina):
+            return False
+        if not forced and foul_limit == self._wait_limit and self.clock < self._wait_until:
+            return True  # nobody on the bench can be ready yet: skip the heap scan
+        replacement = self._take_candidate(player.position, foul_limit, forced)
+        if replacement is None:
+            if forced:
+                raise ForfeitError(f"FORFEIT: {self.team.name} cannot field five eligible players")
+            # Slack so float rounding in bench_stamina never makes the wait outlast readiness
+            self._wait_until, self._wait_limit = self.ready_at(foul_limit) - 1e-6, foul_limit
+            return True
+        self.team.substitute(player, replacement)
+        if forced:
+            self.fouled_out.add(player)
+        else:
+            self._bench_player(player)
+        self.match.log_substitution(self.team, player, replacement)
+        return False
+
+    def tick(self, seconds: float, quarter: int):
+        params = self.params
+        self.clock += seconds
+        drain = seconds * params.stamina_drain
+        foul_limit = self.foul_limit(quarter)
+        for p in list(self.team.lineup):
+            p.stamina = max(0.0, p.stamina - drain * (1.6 - p.attributes.stamina / 100.0))
+            p.fatigue = 1.0 - p.stamina / 100.0
+            self.check(p, foul_limit)
+
+
+class RotationManager:
+    team_rotation = TeamRotation
+
+    def __init__(self, match, params):
+        self.teams = (self.team_rotation(match, match.team_a, params), self.team_rotation(match, match.team_b, params))
+
+    def tick(self, seconds: float, quarter: int):
+        for rotation in self.teams:
+            rotation.tick(seconds, quarter)
+
+    def rest(self, seconds: float):
+        for rotation in self.teams:
+            rotation.rest(seconds)
@@ -0,0 +1,221 @@
+# season.py
+# Seeded seasons and incremental what-if re-simulation.
+#
+# Every scheduled game carries its own seed, and baseline results are stored
+# with those seeds and each team's roster fingerprint. A roster change (say a
+# trade) then only re-plays the games of teams whose fingerprint changed, on
+# the same seeds (common random numbers), and the standings are updated from
+# the difference on those games alone.
+#
+#   league = generate_league(30, seed=1)
+#   base = simulate_season(league.teams(), round_robin(30, seed=1), workers=8)
+#   base.save("season.npz")
+#   whatif = WhatIf(base, workers=8)
+#   delta = whatif.apply(league.trade([(i, j)]).teams())
+#   print(delta.format())
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from multiball_basketball import EngineParams, Match, Team
+from rng import make_rng
+
+
+@dataclass
+class Schedule:
+    home: np.ndarray    # (games,) team index
+    away: np.ndarray
+    seeds: np.ndarray   # (games,) per-game RNG seed
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+
+def round_robin(num_teams: int, cycles: int = 2, seed: Union[int, Sequence[int]] = 0) -> Schedule:
+    """
+    Every pair meets `cycles` times, alternating home court, in a shuffled
+    order. `seed` may be a sequence of ints, e.g. (league seed, year).
+    """
+    rng = np.random.default_rng(seed)
+    pairs = [(i, j) for i in range(num_teams) for j in range(i + 1, num_teams)]
+    home, away = [], []
+    for c in range(cycles):
+        for i, j in pairs:
+            h, a = (i, j) if c % 2 == 0 else (j, i)
+            home.append(h)
+            away.append(a)
+    order = rng.permutation(len(home))
+    seeds = rng.integers(0, 2 ** 62, size=len(home), dtype=np.int64)
+    return Schedule(np.array(home)[order], np.array(away)[order], seeds)
+
+
+@dataclass
+class Standings:
+    wins: np.ndarray
+    losses: np.ndarray
+    points_for: np.ndarray
+    points_against: np.ndarray
+
+    def __sub__(self, other: "Standings") -> "Standings":
+        return Standings(self.wins - other.wins, self.losses - other.losses,
+                         self.points_for - other.points_for, self.points_against - other.points_against)
+
+    def __add__(self, other: "Standings") -> "Standings":
+        return Standings(self.wins + other.wins, self.losses + other.losses,
+                         self.points_for + other.points_for, self.points_against + other.points_against)
+
+
+def tally(num_teams: int, home: np.ndarray, away: np.ndarray,
+          home_score: np.ndarray, away_score: np.ndarray) -> Standings:
+    home_won = home_score > away_score
+    winners = np.where(home_won, home, away)
+    losers = np.where(home_won, away, home)
+    scored = np.bincount(home, home_score, num_teams) + np.bincount(away, away_score, num_teams)
+    allowed = np.bincount(home, away_score, num_teams) + np.bincount(away, home_score, num_teams)
+    return Standings(np.bincount(winners, minlength=num_teams), np.bincount(losers, minlength=num_teams),
+                     scored.astype(np.int64), allowed.astype(np.int64))
+
+
+def _play_games(teams: dict, games: Sequence[Tuple[int, int, int]], params: Optional[EngineParams],
+                backend: str) -> List[Tuple[int, int]]:
+    scores = []
+    for home, away, seed in games:
+        h, a = teams[home].copy(), teams[away].copy()
+        Match(h, a, params=params, logged=False, rng=make_rng(seed, backend=backend)).simulate()
+        scores.append((h.score, a.score))
+    return scores
+
+
+def simulate_games(teams: Sequence[Team], schedule: Schedule, games: np.ndarray, *,
+                   params: Optional[EngineParams] = None, backend: str = "python",
+                   workers: Optional[int] = None, chunk_size: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores of schedule games `games` (indices), in that order."""
+    jobs = [(int(schedule.home[g]), int(schedule.away[g]), int(schedule.seeds[g])) for g in games]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    # Ship each chunk only the teams it plays
+    team_maps = [{t: teams[t] for h, a, _ in chunk for t in (h, a)} for chunk in chunks]
+    if workers == 1 or len(chunks) <= 1:
+        parts = [_play_games(m, c, params, backend) for m, c in zip(team_maps, chunks)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_play_games, team_maps, chunks,
+                                      [params] * len(chunks), [backend] * len(chunks)))
+    scores = np.array([s for part in parts for s in part], dtype=np.int64).reshape(-1, 2)
+    return scores[:, 0], scores[:, 1]
+
+
+@dataclass
+class SeasonResults:
+    schedule: Schedule
+    home_score: np.ndarray
+    away_score: np.ndarray
+    team_names: List[str]
+    fingerprints: List[str]     # Team.fingerprint() per team at simulation time
+    params_fingerprint: str
+
+    @property
+    def num_teams(self) -> int:
+        return len(self.team_names)
+
+    def standings(self) -> Standings:
+        return tally(self.num_teams, self.schedule.home, self.schedule.away, self.home_score, self.away_score)
+
+    def save(self, path: str):
+        s = self.schedule
+        np.savez_compressed(path, home=s.home, away=s.away, seeds=s.seeds, home_score=self.home_score,
+                            away_score=self.away_score, team_names=np.array(self.team_names),
+                            fingerprints=np.array(self.fingerprints),
+                            params_fingerprint=np.array(self.params_fingerprint))
+
+    @classmethod
+    def load(cls, path: str) -> "SeasonResults":
+        with np.load(path) as z:
+            return cls(Schedule(z['home'], z['away'], z['seeds']), z['home_score'], z['away_score'],
+                       z['team_names'].tolist(), z['fingerprints'].tolist(), str(z['params_fingerprint']))
+
+
+def _params_fingerprint(params: Optional[EngineParams]) -> str:
+    return (params or EngineParams()).fingerprint()
+
+
+def simulate_season(teams: Sequence[Team], schedule: Schedule, *, params: Optional[EngineParams] = None,
+                    backend: str = "python", workers: Optional[int] = None) -> SeasonResults:
+    home_score, away_score = simulate_games(teams, schedule, np.arange(len(schedule)), params=params,
+                                            backend=backend, workers=workers)
+    return SeasonResults(schedule, home_score, away_score, [t.name for t in teams],
+                         [t.fingerprint() for t in teams], _params_fingerprint(params))
+
+
+# --------------------------------------------------------------------
+# What-if
+# --------------------------------------------------------------------
+
+@dataclass
+class SeasonDelta:
+    affected: List[int]         # teams whose roster changed
+    games: np.ndarray           # schedule indices that were re-played
+    before: Standings
+    after: Standings
+    results: SeasonResults      # full season with the change applied
+
+    @property
+    def change(self) -> Standings:
+        return self.after - self.before
+
+    def format(self) -> str:
+        names = self.results.team_names
+        change = self.change
+        lines = [f"{len(self.games)} of {len(self.results.schedule)} games re-simulated "
+                 f"({len(self.affected)} teams changed)",
+                 f"{'team':<20}{'W-L before':>12}{'W-L after':>12}{'dW':>5}{'dPD':>7}"]
+        order = np.argsort(-np.abs(change.wins), kind='stable')
+        for t in order:
+            if not (change.wins[t] or change.points_for[t] or change.points_against[t]):
+                continue
+            before = f"{self.before.wins[t]}-{self.before.losses[t]}"
+            after = f"{self.after.wins[t]}-{self.after.losses[t]}"
+            diff = int(change.points_for[t] - change.points_against[t])
+            mark = "*" if t in self.affected else " "
+            lines.append(f"{mark}{names[t]:<19}{before:>12}{after:>12}{int(change.wins[t]):>+5}{diff:>+7}")
+        return "\n".join(lines)
+
+
+class WhatIf:
+    def __init__(self, baseline: SeasonResults, *, params: Optional[EngineParams] = None,
+                 backend: str = "python", workers: Optional[int] = None):
+        if _params_fingerprint(params) != baseline.params_fingerprint:
+            raise ValueError("params differ from the baseline's; re-simulate the baseline first")
+        self.baseline = baseline
+        self.params = params
+        self.backend = backend
+        self.workers = workers
+        self._standings = baseline.standings()
+
+    def affected_teams(self, teams: Sequence[Team]) -> List[int]:
+        if len(teams) != self.baseline.num_teams:
+            raise ValueError("expected one Team per baseline team")
+        return [t for t, team in enumerate(teams) if team.fingerprint() != self.baseline.fingerprints[t]]
+
+    def apply(self, teams: Sequence[Team]) -> SeasonDelta:
+        """
+        Re-play only the games of teams whose roster differs from the baseline,
+        on their baseline seeds, and patch the standings with the difference.
+        """
+        base = self.baseline
+        s = base.schedule
+        affected = self.affected_teams(teams)
+        games = np.flatnonzero(np.isin(s.home, affected) | np.isin(s.away, affected))
+        new_home, new_away = simulate_games(teams, s, games, params=self.params, backend=self.backend,
+                                            workers=self.workers)
+        n = base.num_teams
+        old = tally(n, s.home[games], s.away[games], base.home_score[games], base.away_score[games])
+        new = tally(n, s.home[games], s.away[games], new_home, new_away)
+        home_score, away_score = base.home_score.copy(), base.away_score.copy()
+        home_score[games], away_score[games] = new_home, new_away
+        results = SeasonResults(s, home_score, away_score, [t.name for t in teams],
+                                [t.fingerprint() for t in teams], base.params_fingerprint)
+        return SeasonDelta(affected, games, self._standings, self._standings - old + new, results)
+
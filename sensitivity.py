@@ -0,0 +1,206 @@
+# sensitivity.py
+# Points-per-game value of each PlayerAttributes field, by paired central
+# finite differences on shared random streams.
+#
+#   python sensitivity.py --games 400 --delta 5 --workers 8
+#   python sensitivity.py --player T1
+
+import argparse
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from multiball_basketball import (
+    DEFENSE_RATING_WEIGHTS, OFFENSE_RATING_WEIGHTS, SELECTION_ATTRIBUTES, SHOT_ATTRIBUTES,
+    TEAM_BOOST_ATTRIBUTES, EngineParams, Match, Player, PlayerAttributes, Team,
+)
+from rng import make_rng
+from rotation import ForfeitError
+
+ATTRIBUTE_NAMES = tuple(f.name for f in fields(PlayerAttributes))
+
+# Attributes read by the engine outside the shot attribute map
+FOUL_ATTRIBUTES = ('awareness', 'composure', 'patience', 'bravery', 'determination')
+FREE_THROW_ATTRIBUTES = ('form_technique', 'hand_eye_coordination', 'composure')
+TIP_OFF_ATTRIBUTES = ('height', 'jumping')
+DEFENSE_PRESSURE_ATTRIBUTES = ('awareness', 'balance', 'reactions')
+TURNOVER_ATTRIBUTES = ('awareness', 'composure', 'hand_eye_coordination')
+
+# Height is in inches, everything else on the 0-100 scale
+DEFAULT_STEPS = {'height': 1.0}
+
+
+def attribute_channels() -> Dict[str, List[str]]:
+    """Where the engine reads each attribute, from its own formula tables."""
+    channels: Dict[str, List[str]] = {a: [] for a in ATTRIBUTE_NAMES}
+    for shot_type, attrs in SHOT_ATTRIBUTES.items():
+        for a in attrs:
+            channels[a].append(shot_type)
+    for label, attrs in (
+        ('team boost', TEAM_BOOST_ATTRIBUTES),
+        ('shot defense', DEFENSE_PRESSURE_ATTRIBUTES),
+        ('fouls', FOUL_ATTRIBUTES),
+        ('free throws', FREE_THROW_ATTRIBUTES),
+        ('tip-off', TIP_OFF_ATTRIBUTES),
+        ('turnovers', TURNOVER_ATTRIBUTES),
+        ('off rating', [a for a, _ in OFFENSE_RATING_WEIGHTS]),
+        ('def rating', [a for a, _ in DEFENSE_RATING_WEIGHTS]),
+    ):
+        for a in attrs:
+            channels[a].append(label)
+    for kind, weights in SELECTION_ATTRIBUTES.items():
+        for a, _ in weights:
+            channels[a].append(f"{kind.replace('_', ' ')} selection")
+    channels['height'].append('shot height factor')
+    channels['stamina'].append('shot stamina factor')
+    channels['stamina'].append('stamina drain')
+    return channels
+
+
+# --------------------------------------------------------------------
+# Paired simulation
+# --------------------------------------------------------------------
+
+def _fresh_team(team: Team, targets: Sequence[str], attribute: Optional[str], shift: float) -> Team:
+    # New Player objects (clean stats) with `attribute` shifted on the targeted players
+    roster = []
+    for p in team.roster:
+        attrs = p.attributes
+        if attribute is not None and p.name in targets:
+            attrs = replace(attrs, **{attribute: getattr(attrs, attribute) + shift})
+        roster.append(Player(p.name, attrs, position=p.position, disc_type=p.disc_type))
+    return Team(team.name, roster)
+
+
+def _play(team_a: Team, team_b: Team, params: Optional[EngineParams], seed: int) -> Optional[Tuple[int, int]]:
+    # Final score, or None when a side forfeits
+    match = Match(team_a, team_b, params=params, logged=False, rng=make_rng(seed))
+    try:
+        match.simulate()
+    except ForfeitError:
+        return None
+    return team_a.score, team_b.score
+
+
+def _run_chunk(team_a: Team, team_b: Team, side: str, targets: Sequence[str],
+               steps: Dict[str, float], params: Optional[EngineParams],
+               seeds: Sequence[int]) -> Dict[str, List[Tuple[float, float]]]:
+    """
+    For each seed and attribute, play the +step and -step versions of the game
+    on the same random stream. Returns per-attribute (points diff, margin diff)
+    pairs, already divided by the 2*step span. A seed where either version
+    forfeits contributes no pair for that attribute.
+    """
+    out: Dict[str, List[Tuple[float, float]]] = {a: [] for a in ATTRIBUTE_NAMES}
+    for seed in seeds:
+        for attribute in ATTRIBUTE_NAMES:
+            step = steps.get(attribute, steps['default'])
+            results = []
+            for shift in (step, -step):
+                if side == 'A':
+                    a, b = _fresh_team(team_a, targets, attribute, shift), _fresh_team(team_b, (), None, 0.0)
+                else:
+                    a, b = _fresh_team(team_a, (), None, 0.0), _fresh_team(team_b, targets, attribute, shift)
+                score = _play(a, b, params, seed)
+                if score is None:
+                    break
+                own, opp = score if side == 'A' else score[::-1]
+                results.append((own, own - opp))
+            if len(results) == 2:
+                (p_hi, m_hi), (p_lo, m_lo) = results
+                out[attribute].append(((p_hi - p_lo) / (2 * step), (m_hi - m_lo) / (2 * step)))
+    return out
+
+
+@dataclass
+class AttributeEffect:
+    attribute: str
+    points: float           # team PPG per attribute point
+    points_stderr: float
+    margin: float           # point differential per attribute point
+    margin_stderr: float
+    channels: List[str]
+
+
+def _mean_se(values: Sequence[float]) -> Tuple[float, float]:
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    mean = sum(values) / n
+    if n == 1:
+        return mean, 0.0
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, math.sqrt(var / n)
+
+
+def attribute_sensitivity(team_a: Team, team_b: Team, *, side: str = 'A', player: Optional[str] = None,
+                          games: int = 200, delta: float = 5.0, steps: Optional[Dict[str, float]] = None,
+                          params: Optional[EngineParams] = None, workers: Optional[int] = None,
+                          seed: int = 0, chunk_size: int = 10) -> List[AttributeEffect]:
+    """
+    Marginal value of every attribute for one player (or, with player=None,
+    every player of the chosen side at once). All 24 x 2 perturbations over
+    all seeds go out as a single batch of chunk jobs.
+    """
+    team = team_a if side == 'A' else team_b
+    targets = [player] if player is not None else [p.name for p in team.roster]
+    if player is not None and player not in {p.name for p in team.roster}:
+        raise ValueError(f"{player} is not on {team.name}")
+    step_map = dict(DEFAULT_STEPS)
+    step_map.update(steps or {})
+    step_map['default'] = delta
+
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.randrange(2 ** 31) for _ in range(games)]
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    args = (team_a, team_b, side, targets, step_map, params)
+    if workers == 1:
+        parts = [_run_chunk(*args, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_run_chunk, *zip(*[args + (chunk,) for chunk in chunks])))
+
+    channels = attribute_channels()
+    effects = []
+    for attribute in ATTRIBUTE_NAMES:
+        pairs = [pair for part in parts for pair in part[attribute]]
+        pts, pts_se = _mean_se([p for p, _ in pairs])
+        margin, margin_se = _mean_se([m for _, m in pairs])
+        effects.append(AttributeEffect(attribute, pts, pts_se, margin, margin_se, channels[attribute]))
+    return effects
+
+
+def format_effects(effects: Sequence[AttributeEffect]) -> str:
+    lines = [f"{'attribute':<24}{'PPG/pt':>9}{'se':>8}{'margin/pt':>11}{'se':>8}  used by"]
+    for e in sorted(effects, key=lambda e: -abs(e.margin)):
+        used = ", ".join(e.channels) if e.channels else "(unused)"
+        lines.append(f"{e.attribute:<24}{e.points:>9.3f}{e.points_stderr:>8.3f}"
+                     f"{e.margin:>11.3f}{e.margin_stderr:>8.3f}  {used}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from calibration import seeded_team
+
+    ap = argparse.ArgumentParser(description="Points-per-game value of each player attribute.")
+    ap.add_argument("--games", type=int, default=200)
+    ap.add_argument("--delta", type=float, default=5.0, help="perturbation in attribute points")
+    ap.add_argument("--player", default=None, help="perturb one player (default: whole team)")
+    ap.add_argument("--side", choices=("A", "B"), default="A")
+    ap.add_argument("--roster-seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.roster_seed)
+    team_a = seeded_team(rng, "Testers", "T")
+    team_b = seeded_team(rng, "Debuggers", "D")
+    effects = attribute_sensitivity(team_a, team_b, side=args.side, player=args.player, games=args.games,
+                                    delta=args.delta, workers=args.workers, seed=args.seed)
+    print(format_effects(effects))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import unittest
+from dataclasses import replace
+
+try:
+    import numpy as np
+    from bracket import BracketSimulator, MatchupCache, bracket_order, series_seed
+    from league_generator import generate_league
+except ImportError:
+    np = None
+
+from multiball_basketball import EngineParams
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestBracket(unittest.TestCase):
+    def setUp(self):
+        self.league = generate_league(4, 10, seed=2)
+        self.cache = MatchupCache(min_games=20, max_games=20, batch=10, workers=1)
+
+    def test_bracket_order(self):
+        self.assertEqual(bracket_order(8), [0, 7, 3, 4, 1, 6, 2, 5])
+
+    def test_sample_from_cache(self):
+        sim = BracketSimulator(self.league.teams(), self.cache, best_of=3)
+        result = sim.sample(20000, seed=1)
+        self.assertEqual(len(self.cache), 6)  # one entry per unordered pair
+        self.assertTrue(np.allclose(result.reach.sum(axis=0), [4, 2, 1]))
+        self.assertTrue(np.array_equal(result.reach, sim.sample(20000, seed=1).reach))
+        home, away = self.league.team(0), self.league.team(1)
+        self.assertAlmostEqual(self.cache.win_probability(home, away), 1 - self.cache.win_probability(away, home))
+
+    def test_invalidation(self):
+        teams = self.league.teams()
+        self.cache.estimate([(teams[0], teams[1]), (teams[2], teams[3])])
+        self.league.attributes[0] += 5
+        changed = self.league.team(0)
+        self.assertNotEqual(changed.fingerprint(), teams[0].fingerprint())
+        self.cache.invalidate(changed)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.params = replace(EngineParams(), turnover_rate=0.2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_series_seeds_do_not_collide(self):
+        # Consecutive pairs collided under the old seed * 1_000_003 + round * 64 + slot
+        keys = [(0, 1, 0), (0, 0, 64), (1, 0, 0), (0, 0, 1_000_003), (0, 2, 0), (0, 1, 64)]
+        self.assertEqual(len({series_seed(*key) for key in keys}), len(keys))
+        self.assertEqual(series_seed(3, 1, 2), series_seed(3, 1, 2))
+        rounds = BracketSimulator(self.league.teams(), self.cache, best_of=3).play(seed=5)
+        self.assertEqual([len(r) for r in rounds], [2, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from calibration import DEFAULT_KNOBS, calibrate, evaluate_batch, loss, seeded_team
+from multiball_basketball import EngineParams
+
+def attributes(team):
+    return [(p.name, p.attributes) for p in team.roster]
+
+class TestCalibration(unittest.TestCase):
+    def test_seeded_team_is_deterministic(self):
+        first = seeded_team(random.Random(5), "Testers", "T")
+        again = seeded_team(random.Random(5), "Testers", "T")
+        other = seeded_team(random.Random(6), "Testers", "T")
+        self.assertEqual(attributes(first), attributes(again))
+        self.assertNotEqual(attributes(first), attributes(other))
+        self.assertEqual(len(first.roster), 10)
+
+    def test_evaluate_batch_is_reproducible(self):
+        candidates = [EngineParams(), EngineParams(base_foul_non_shooting=0.02)]
+        first = evaluate_batch(candidates, [1, 2, 3], chunk_size=2)
+        again = evaluate_batch(candidates, [1, 2, 3], chunk_size=2)
+        self.assertEqual(first, again)
+        self.assertEqual(len(first), 2)
+
+    def test_tiny_budget_never_worsens_the_fit(self):
+        targets = {'PTS': 80.0, 'TO': 10.0}
+        games, population = 3, 2
+        result = calibrate(targets, budget=games + 2 * population * games, games=games,
+                           population=population, workers=1, seed=4)
+        self.assertIsInstance(result.params, EngineParams)
+        self.assertEqual(list(result.values), [k.name for k in DEFAULT_KNOBS])
+        self.assertEqual((result.generations, result.games_simulated), (2, games + 2 * population * games))
+
+        seeds_rng = random.Random(4)
+        seeds = [seeds_rng.randrange(2 ** 31) for _ in range(games)]
+        start = loss(evaluate_batch([EngineParams()], seeds)[0], targets)
+        self.assertLessEqual(result.loss, start)
+
+if __name__ == '__main__':
+    unittest.main()
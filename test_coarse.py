@@ -0,0 +1,60 @@
+import random
+import unittest
+from dataclasses import replace
+
+from calibration import seeded_team
+from coarse import CoarseMatch, OutcomeTables
+from multiball_basketball import EngineParams, Match
+from rng import make_rng
+from rotation import ForfeitError
+
+KEYS = ('PTS', 'FGA', 'FGM', '3PA', 'FTA', 'FTM', 'AST', 'REB', 'TO', 'FOUL')
+
+class TestCoarseMatch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        self.home = seeded_team(rng, "Testers", "T")
+        self.away = seeded_team(rng, "Debuggers", "D")
+
+    def averages(self, make_match, games):
+        totals = dict.fromkeys(KEYS, 0)
+        played = 0
+        for s in range(games):
+            a, b = self.home.copy(), self.away.copy()
+            try:
+                match = make_match(a, b, make_rng(s))
+                for seconds in match.run():
+                    self.assertGreater(seconds, 0)  # every possession uses time
+            except ForfeitError:
+                continue
+            played += 1
+            periods = max(len(a.quarter_scores), 4)
+            minutes = 48 + 5 * (periods - 4)
+            for team in (a, b):
+                self.assertAlmostEqual(sum(p.stats['MIN'] for p in team.roster), 5 * minutes, places=6)
+                for p in team.roster:
+                    for k in KEYS:
+                        totals[k] += p.stats[k]
+        return {k: v / played for k, v in totals.items()}
+
+    def test_aggregates_match_detailed_engine(self):
+        games = 150
+        tables = OutcomeTables()
+        detailed = self.averages(lambda a, b, rng: Match(a, b, logged=False, rng=rng), games)
+        coarse = self.averages(lambda a, b, rng: CoarseMatch(a, b, tables=tables, rng=rng), games)
+        for k in KEYS:
+            self.assertAlmostEqual(coarse[k] / detailed[k], 1.0, delta=0.08, msg=k)
+
+        builds = tables.builds
+        self.averages(lambda a, b, rng: CoarseMatch(a, b, tables=tables, rng=rng), 20)
+        self.assertLess(tables.builds - builds, builds // 10)
+
+    def test_params_must_match_tables(self):
+        tables = OutcomeTables()
+        with self.assertRaises(ValueError):
+            CoarseMatch(self.home.copy(), self.away.copy(), tables=tables,
+                        params=replace(EngineParams(), block_rate=0.2))
+        CoarseMatch(self.home.copy(), self.away.copy(), tables=tables, params=EngineParams(), seed=1).simulate()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from dynasty import Dynasty, load_snapshot
+    from league_generator import generate_league
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestDynasty(unittest.TestCase):
+    def test_seasons_progress_and_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dynasty = Dynasty(generate_league(4, 10, seed=3), seed=2, cycles=1, snapshot_dir=tmp)
+            ages = dynasty.ages.copy()
+            years = list(dynasty.run(2, workers=1))
+            self.assertEqual([y.year for y in years], [1, 2])
+            self.assertTrue(all(y.standings.wins.sum() == 6 for y in years))
+            self.assertTrue(np.all((dynasty.ages == ages + 1) | (dynasty.ages < 23)))
+
+            # Primed rating caches agree with a per-player recomputation
+            for p in dynasty.players[:10]:
+                cached = p.ratings()
+                p.invalidate_ratings()
+                self.assertTrue(np.allclose(cached, p.ratings()))
+
+            league, snap_ages, standings = load_snapshot(os.path.join(tmp, "season_002.npz"))
+            self.assertTrue(np.allclose(league.attributes, dynasty.league.attributes, atol=0.05))
+            self.assertEqual(league.names, dynasty.league.names)
+            self.assertTrue(np.array_equal(snap_ages, dynasty.ages))
+            self.assertTrue(np.array_equal(standings.wins, years[-1].standings.wins))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from fuzz import category, fuzz, play_game
+
+def corrupted_game(seed, params, backend):
+    # Every third seed gets a rebound nobody missed for, right after the tip-off
+    lines = play_game(seed, params, backend)
+    if seed % 3 == 2:
+        lines.insert(1, "[Q1 12:00] T1 grabbed the rebound (defensive)")
+    return lines
+
+class TestFuzz(unittest.TestCase):
+    def test_clean_seeds_pass(self):
+        self.assertFalse(fuzz(range(5), workers=1).failed)
+
+    def test_failures_grouped_and_shrunk(self):
+        report = fuzz(range(7), workers=1, chunk_size=3, play=corrupted_game)
+        self.assertEqual(report.games, 7)
+        self.assertEqual(list(report.categories), [category("Line 2: rebound without a preceding missed shot.")])
+        rep = next(iter(report.categories.values()))
+        self.assertEqual(rep.games, 2)
+        self.assertEqual((rep.smallest_seed.seed, rep.smallest_seed.prefix), (2, 2))
+        self.assertEqual(rep.shortest.prefix, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import random
+import unittest
+
+from calibration import seeded_team
+from game_night import GameNight, Subscriber
+from multiball_basketball import Match
+
+class TestGameNight(unittest.TestCase):
+    def test_subscribers_receive_every_game(self):
+        async def client(port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            finals = {}
+            while True:
+                message = json.loads(await reader.readline())
+                if message['type'] == 'final':
+                    finals[message['game']] = message['score']
+                if message['type'] == 'end':
+                    break
+            writer.close()
+            return finals
+
+        async def night():
+            rng = random.Random(5)
+            server = GameNight(0)
+            matches = [Match(seeded_team(rng, f"H{g}", f"H{g}_"), seeded_team(rng, f"A{g}", f"A{g}_"), seed=g)
+                       for g in range(3)]
+            for m in matches:
+                server.add_game(m)
+            port = (await server.serve(port=0)).sockets[0].getsockname()[1]
+            clients = [asyncio.create_task(client(port)) for _ in range(5)]
+            while len(server.subscribers) < 5:
+                await asyncio.sleep(0.01)
+            await server.run()
+            expected = {g + 1: [m.team_a.score, m.team_b.score] for g, m in enumerate(matches)}
+            for finals in await asyncio.gather(*clients):
+                self.assertEqual(finals, expected)
+
+        asyncio.run(night())
+
+    def test_overflow_policies(self):
+        oldest = Subscriber(None, maxsize=2, policy="drop_oldest")
+        newest = Subscriber(None, maxsize=2, policy="drop_newest")
+        strict = Subscriber(None, maxsize=2, policy="disconnect")
+        for n in range(3):
+            for sub in (oldest, newest, strict):
+                sub.offer(b"%d" % n)
+        self.assertEqual(list(oldest.queue), [b"1", b"2"])
+        self.assertEqual(list(newest.queue), [b"0", b"1"])
+        self.assertEqual((oldest.dropped, newest.dropped), (1, 1))
+        self.assertTrue(strict.closed)
+        self.assertFalse(strict.offer(b"3"))
+
+if __name__ == '__main__':
+    unittest.main()
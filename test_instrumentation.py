@@ -0,0 +1,40 @@
+import unittest
+from instrumentation import Instrumentation, NULL_INSTRUMENTATION, PHASES, diff_reports
+from multiball_basketball import Match
+from test_multiball_basketball import make_random_team
+
+class TestInstrumentation(unittest.TestCase):
+    def run_shots(self, instrumentation=None, shots=50):
+        match = Match(make_random_team("Testers", "T"), make_random_team("Debuggers", "D"),
+                      instrumentation=instrumentation)
+        match.tip_off()
+        for _ in range(shots):
+            match.simulate_shot()
+        return match
+
+    def test_disabled_by_default(self):
+        match = self.run_shots()
+        self.assertIs(match.instrumentation, NULL_INSTRUMENTATION)
+
+    def test_counts_phases_and_events(self):
+        ins = Instrumentation()
+        match = self.run_shots(ins)
+        report = ins.report()
+        self.assertEqual(report["matches"], 1)
+        self.assertEqual(report["phases"]["shot_selection"]["calls"], 50)
+        self.assertEqual(report["phases"]["defender_selection"]["calls"], 50)
+        self.assertEqual(list(report["phases"]), list(PHASES))
+        # every play-by-play line is counted as exactly one event
+        self.assertEqual(sum(report["events"].values()), len(match.play_by_play))
+
+    def test_merge_and_diff(self):
+        a, b = Instrumentation(), Instrumentation()
+        self.run_shots(a)
+        self.run_shots(b)
+        total = Instrumentation.combined([a, b])
+        self.assertEqual(total.matches, 2)
+        self.assertEqual(total.calls["shot_selection"], 100)
+        self.assertIn("shot_selection calls", diff_reports(a.report(), total.report()))
+
+if __name__ == "__main__":
+    unittest.main()
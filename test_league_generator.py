@@ -0,0 +1,38 @@
+import unittest
+
+try:
+    import numpy as np
+    from league_generator import generate_league, HEIGHT_RANGES
+except ImportError:
+    np = None
+
+from multiball_basketball import Match
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestLeagueGenerator(unittest.TestCase):
+    def test_same_seed_same_league(self):
+        a = generate_league(4, 12, seed=3)
+        b = generate_league(4, 12, seed=3)
+        self.assertTrue(np.array_equal(a.attributes, b.attributes))
+        self.assertFalse(np.array_equal(a.attributes, generate_league(4, 12, seed=4).attributes))
+
+    def test_positions_and_heights(self):
+        league = generate_league(6, 13, seed=1)
+        self.assertEqual(league.attributes.shape, (78, 24))
+        heights = league.column('height')
+        for pos, (lo, hi) in HEIGHT_RANGES.items():
+            mask = league.positions == pos
+            self.assertTrue(mask.any())
+            self.assertTrue(((heights[mask] >= lo) & (heights[mask] <= hi)).all())
+        team = league.team(2)
+        self.assertEqual([p.position for p in team.roster[:5]], ['G', 'G', 'F', 'F', 'C'])
+        self.assertEqual(len({p.name for p in league.teams()[0].roster + team.roster}), 26)
+
+    def test_wrapped_teams_play(self):
+        league = generate_league(2, 13, seed=2)
+        match = Match(league.team(0), league.team(1), seed=1)
+        match.simulate()
+        self.assertGreater(match.team_a.score + match.team_b.score, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import random
+import tempfile
+import unittest
+
+from calibration import seeded_team
+from log_sink import CompressedLogSink, iter_games, read_game, read_index
+from multiball_basketball import Match
+from tools.validate_log import validate_file, validate_lines
+
+class TestLogSink(unittest.TestCase):
+    def test_rotating_archive_round_trip(self):
+        rng = random.Random(3)
+        home, away = seeded_team(rng, "Testers", "T"), seeded_team(rng, "Debuggers", "D")
+        logs = [Match(home.copy(), away.copy(), seed=s).simulate().play_by_play for s in range(7)]
+        for codec in ("gzip", "lzma"):
+            with tempfile.TemporaryDirectory() as tmp:
+                with CompressedLogSink(tmp, codec=codec, max_games=3, buffer_size=1) as sink:
+                    for lines in logs:
+                        sink.write_game(lines)
+                self.assertEqual(len(sink.paths), 3)
+                self.assertEqual([e.game for e in read_index(sink.paths[1])], [3, 4, 5])
+                self.assertEqual([g for p in sink.paths for g in iter_games(p)], logs)
+                self.assertEqual(read_game(sink.paths[1], 2), logs[5])
+                os.remove(sink.paths[2] + ".idx.json")
+                self.assertEqual(read_game(sink.paths[2], 0), logs[6])
+                self.assertEqual(validate_lines(read_game(sink.paths[0], 1)), [])
+                with self.assertRaises(IndexError):
+                    read_game(sink.paths[0], -1)
+                with self.assertRaises(ValueError):
+                    validate_file(sink.paths[0], 0)
+                self.assertEqual(validate_file(sink.paths[0], 3), (1, []))
+
+if __name__ == '__main__':
+    unittest.main()
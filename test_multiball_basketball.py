@@ -1,6 +1,8 @@
 import unittest
 import random
+from dataclasses import replace
 from multiball_basketball import PlayerAttributes, Player, Team, Match
+from rotation import ForfeitError
 
 def make_random_player(name):
     # Random attributes between 40 and 99 for realism
@@ -44,6 +46,8 @@ class TestMultiballBasketballSimulator(unittest.TestCase):
         team_b = make_random_team("Debuggers", "D")
         match = Match(team_a, team_b)
         match.simulate()
+        # Log consumed by tools/validate_log.py in CI
+        match.write_log("play_by_play_log.txt")
         # Check play-by-play log is not empty
         self.assertTrue(len(match.play_by_play) > 0)
         # Check both teams have a non-negative score
@@ -53,6 +57,65 @@ class TestMultiballBasketballSimulator(unittest.TestCase):
         self.assertEqual(len(team_a.roster), 10)
         self.assertEqual(len(team_b.roster), 10)
 
+    def test_possession_after_non_shooting_foul_uses_time(self):
+        random.seed(11)
+        checked = 0
+        for seed in range(20):
+            match = Match(make_random_team("Testers", "T"), make_random_team("Debuggers", "D"), logged=False, seed=seed)
+            events = []
+            log = match.log
+            match.log = lambda kind, *args: (events.append(kind), log(kind, *args))
+            after_foul = False
+            try:
+                for seconds in match.run():
+                    if after_foul:
+                        checked += 1
+                        self.assertGreater(seconds, 0)
+                    # Outside the bonus the offense keeps the ball after the whistle
+                    played = [kind for kind in events if kind != "substitution"]
+                    after_foul = bool(played) and played[-1] == "non_shooting_foul"
+                    events.clear()
+            except ForfeitError:
+                pass  # a forfeited game still played its possessions
+        self.assertGreater(checked, 0)
+
+    def test_every_possession_uses_time(self):
+        random.seed(12)
+        possessions = 0
+        for seed in range(30):
+            match = Match(make_random_team("Testers", "T"), make_random_team("Debuggers", "D"), logged=False, seed=seed)
+            try:
+                for seconds in match.run():  # run() only starts a possession with time left
+                    possessions += 1
+                    self.assertGreater(seconds, 0)
+            except ForfeitError:
+                pass  # a forfeited game still played its possessions
+        self.assertGreater(possessions, 0)
+
+    def test_rebound_and_assist_picks_follow_attributes(self):
+        random.seed(21)
+        base = make_random_player("base").attributes
+        roster = [
+            Player("Big", replace(base, height=86.0, jumping=99.0, reactions=99.0)),
+            Player("Small", replace(base, height=69.0, jumping=40.0, reactions=40.0)),
+            Player("Creator", replace(base, teamwork=99.0, creativity=99.0)),
+            Player("Loner", replace(base, teamwork=40.0, creativity=40.0)),
+            Player("Plain", base),
+        ]
+        totals = {p.name: {'REB': 0, 'AST': 0} for p in roster}
+        for seed in range(40):
+            team_a = Team("Testers", [Player(p.name, p.attributes) for p in roster])
+            match = Match(team_a, make_random_team("Debuggers", "D"), logged=False, seed=seed)
+            try:
+                match.simulate()
+            except ForfeitError:
+                continue
+            for p in team_a.roster:
+                totals[p.name]['REB'] += p.stats['REB']
+                totals[p.name]['AST'] += p.stats['AST']
+        self.assertGreater(totals["Big"]['REB'], 2 * totals["Small"]['REB'])
+        self.assertGreater(totals["Creator"]['AST'], 2 * totals["Loner"]['AST'])
+
     def test_100_game_stat_averages(self):
         NUM_RUNS = 100
         stat_keys = ['FGA', 'FGM', '3PA', '3PM', 'FTA', 'FTM', 'TO', 'PTS', 'FOUL', 'AST', 'REB', 'STL', 'BLK']
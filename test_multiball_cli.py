@@ -0,0 +1,31 @@
+import csv
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import multiball
+
+class TestMultiballCli(unittest.TestCase):
+    def test_simulate_validate_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            games_csv = os.path.join(tmp, "games.csv")
+            logs = os.path.join(tmp, "logs")
+            self.assertEqual(multiball.main(["simulate", "-n", "4", "--seed", "9", "--format", "csv",
+                                             "-o", games_csv, "--mode", "logged", "--log-dir", logs]), 0)
+            with open(games_csv, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([r["seed"] for r in rows], ["9", "10", "11", "12"])
+
+            archive = os.path.join(logs, "play_by_play-00000.log.gz")
+            self.assertEqual(multiball.main(["validate", archive]), 0)
+
+            db_path = os.path.join(tmp, "box.sqlite")
+            self.assertEqual(multiball.main(["export", "-n", "2", "--seed", "9", "-o", db_path]), 0)
+            db = sqlite3.connect(db_path)
+            (points,), = db.execute("SELECT SUM(PTS) FROM box WHERE seed = 9").fetchall()
+            db.close()
+            self.assertEqual(points, int(rows[0]["home_score"]) + int(rows[0]["away_score"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from calibration import seeded_team
+from multiball_basketball import Match
+from pool import MatchPool
+
+def box(match):
+    return [(p.name, dict(p.stats)) for t in (match.team_a, match.team_b) for p in t.roster]
+
+class TestMatchPool(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(9)
+        self.teams = [seeded_team(rng, name, name[0]) for name in ("Testers", "Debuggers", "Fixers", "Linters")]
+
+    def test_reused_match_replays_a_fresh_one(self):
+        pool = MatchPool()
+        games = [(0, 1, 3), (2, 3, 4), (1, 0, 5), (0, 1, 3)]
+        stats_dicts = None
+        for a, b, seed in games:
+            home, away = self.teams[a], self.teams[b]
+            fresh = Match(home, away, seed=seed, copy_teams=True).simulate()
+            with pool.match(home, away, seed=seed) as match:
+                match.simulate()
+                self.assertEqual(match.play_by_play, fresh.play_by_play)
+                self.assertEqual(box(match), box(fresh))
+                self.assertEqual(match.team_fouls, fresh.team_fouls)
+                ids = [id(p.stats) for p in match.team_a.roster]
+                if stats_dicts is not None:
+                    self.assertEqual(ids, stats_dicts)
+                stats_dicts = ids
+        self.assertEqual((pool.created, pool.reused, len(pool)), (1, 3, 1))
+        for team in self.teams:
+            self.assertFalse(any(p.stats['PTS'] for p in team.roster))
+
+    def test_reset_zeroes_in_place(self):
+        match = Match(self.teams[0].copy(), self.teams[1].copy(), logged=False, seed=1).simulate()
+        stats = match.team_a.roster[0].stats
+        match.reset(seed=2)
+        self.assertIs(match.team_a.roster[0].stats, stats)
+        self.assertFalse(any(stats.values()))
+        self.assertEqual((match.team_a.score, match.quarter, match.possession_number), (0, 1, 0))
+        self.assertEqual(set(match.team_a.quarter_scores), {1, 2, 3, 4})
+        with self.assertRaises(ValueError):
+            match.reset(self.teams[2], self.teams[3])
+
+    def test_in_place_edit_reaches_pooled_copy(self):
+        pool = MatchPool(logged=False)
+        home, away = self.teams[0], self.teams[1]
+        with pool.match(home, away, seed=1) as match:
+            match.simulate()
+        star = home.roster[0]
+        star.attributes.form_technique = 1.0
+        star.attributes.finesse = 1.0
+        star.invalidate_ratings()
+        fresh = Match(home, away, seed=2, logged=False, copy_teams=True).simulate()
+        with pool.match(home, away, seed=2) as match:
+            self.assertEqual(match.team_a.roster[0].ratings(), star.ratings())
+            match.simulate()
+            self.assertEqual(box(match), box(fresh))
+        self.assertEqual(pool.reused, 1)
+
+if __name__ == '__main__':
+    unittest.main()
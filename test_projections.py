@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from calibration import seeded_team
+from multiball_basketball import EngineParams
+from projections import Projector
+from result_cache import simulate_matchup
+
+class TestProjections(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(6)
+        self.home = seeded_team(rng, "Testers", "T")
+        self.away = seeded_team(rng, "Debuggers", "D")
+
+    def test_distributions_match_box_scores(self):
+        projection = Projector(games=30, seed=2).project(self.home, self.away)
+        result = simulate_matchup(self.home, self.away, games=30, seed=2)
+        self.assertEqual(projection.games, result.games)
+        for side, players in enumerate(result.player_averages):
+            self.assertEqual(projection.players(side), list(players))
+            for name, averages in players.items():
+                for k in ('PTS', 'REB', 'AST', '3PM', 'FTA'):
+                    self.assertAlmostEqual(projection.mean(name, k), averages[k])
+                    self.assertAlmostEqual(sum(projection.distribution(name, k).values()), 1.0)
+
+        quantiles = projection.quantiles("T1", "PTS")
+        self.assertEqual(list(quantiles.values()), sorted(quantiles.values()))
+        median = quantiles[0.5]
+        prop = projection.prop("T1", "PTS", median)
+        self.assertGreater(1.0 - prop.over - prop.under, 0.0)  # push on an integer line
+        self.assertLessEqual(prop.over, 0.5)
+        half = projection.prop("T1", "PTS", median + 0.5)
+        self.assertAlmostEqual(half.over + half.under, 1.0)
+
+    def test_lines_reuse_cached_batch(self):
+        projector = Projector(games=20, seed=1)
+        first = projector.props(self.home, self.away, [("T1", "PTS", 9.5), ("D2", "REB", 4.5)])
+        again = projector.props(self.home, self.away, [("T1", "PTS", 12.5), ("D4", "AST", 1.5)])
+        self.assertEqual((projector.misses, projector.hits), (1, 1))
+        self.assertEqual(first[0].mean, again[0].mean)
+        self.assertGreaterEqual(first[0].over, again[0].over)
+        slate = projector.project_slate([(self.away, self.home), (self.home, self.away), (self.away, self.home)])
+        self.assertEqual((projector.misses, projector.hits), (2, 2))
+        self.assertIs(slate[0], slate[2])
+
+    def test_threads_match_serial(self):
+        serial = Projector(games=24, seed=3, chunk_size=6).project(self.home, self.away)
+        threaded = Projector(games=24, seed=3, chunk_size=6, workers=3, executor="thread").project(self.home, self.away)
+        self.assertEqual(threaded, serial)
+
+    def test_no_games(self):
+        with self.assertRaises(ValueError):
+            Projector(games=0)
+        starters = seeded_team(random.Random(2), "Starters", "S", size=5)
+        projection = Projector(games=3, params=EngineParams(foul_out=1)).project(starters, self.away)
+        self.assertEqual((projection.games, projection.forfeits), (0, 3))
+        for query in (projection.mean, projection.distribution, projection.quantiles):
+            with self.assertRaises(ValueError):
+                query("S1", "PTS")
+        with self.assertRaises(ValueError):
+            projection.prop("S1", "PTS", 9.5)
+        self.assertIn("3 forfeits", projection.format())
+
+if __name__ == '__main__':
+    unittest.main()
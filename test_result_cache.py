@@ -0,0 +1,54 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+
+from calibration import seeded_team
+from multiball_basketball import EngineParams
+from result_cache import ResultCache, cache_key, engine_modules
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.home = seeded_team(rng, "Testers", "T")
+        self.away = seeded_team(rng, "Debuggers", "D")
+
+    def test_hit_and_invalidation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp)
+            first = cache.simulate(self.home, self.away, games=5, seed=1)
+            again = cache.simulate(self.home, self.away, games=5, seed=1)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(first, again)
+            self.assertEqual(sum(first.score_hist[0].values()), first.games)
+
+            key = cache_key(self.home, self.away, 5, 1)
+            self.assertNotEqual(key, cache_key(self.home, self.away, 5, 2))
+            self.assertNotEqual(key, cache_key(self.home, self.away, 5, 1, replace(EngineParams(), block_rate=0.2)))
+            player = self.home.roster[0]
+            player.attributes = replace(player.attributes, jumping=player.attributes.jumping + 1)
+            self.assertNotEqual(key, cache_key(self.home, self.away, 5, 1))
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp)
+            for seed in range(3):
+                cache.simulate(self.home, self.away, games=1, seed=seed)
+                time.sleep(0.01)
+            cache.get(cache_key(self.home, self.away, 1, 0))  # seed 0 becomes most recent
+            entry = cache.size // 3
+            cache.evict(target=2 * entry + entry // 2)
+            self.assertIsNone(cache.get(cache_key(self.home, self.away, 1, 1)))
+            self.assertIsNotNone(cache.get(cache_key(self.home, self.away, 1, 0)))
+            self.assertEqual(len(os.listdir(tmp)), 2)
+
+    def test_engine_version_covers_imported_modules(self):
+        modules = engine_modules()
+        for name in ("multiball_basketball", "rotation", "rng", "instrumentation", "coarse", "pool", "result_cache"):
+            self.assertIn(name, modules)
+        self.assertNotIn("random", modules)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import random
+from multiball_basketball import Match
+from rng import PythonRNG, BlockRNG, make_rng
+from test_multiball_basketball import make_random_team
+
+try:
+    import numpy  # noqa: F401
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+def play(rng):
+    random.seed(11)  # same rosters every time
+    team_a = make_random_team("Testers", "T")
+    team_b = make_random_team("Debuggers", "D")
+    match = Match(team_a, team_b, rng=rng)
+    match.simulate()
+    return match.play_by_play
+
+class TestRNG(unittest.TestCase):
+    def test_weighted_matches_random_choices(self):
+        population, cum = ('a', 'b', 'c'), (0.2, 0.5, 1.0)
+        a, b = random.Random(3), PythonRNG(seed=3)
+        for _ in range(200):
+            self.assertEqual(a.choices(population, cum_weights=cum, k=1)[0], b.weighted(population, cum))
+
+    def test_seeded_python_backend_is_reproducible(self):
+        self.assertEqual(play(make_rng(5)), play(make_rng(5)))
+
+    def test_python_streams_do_not_collide(self):
+        def draws(seed, index):
+            rng = make_rng(seed, index=index)
+            return [rng.random() for _ in range(5)]
+
+        self.assertEqual(draws(3, 0), draws(3, 0))
+        plain = random.Random(3)
+        self.assertEqual(draws(3, 0), [plain.random() for _ in range(5)])  # index 0 is the plain seed
+        seen = {}
+        for seed, index in [(0, 1_000_003), (1, 0), (1, 1), (0, 1_000_004), (1_000_004, 0), (12, 3), (1, 23)]:
+            seen.setdefault(tuple(draws(seed, index)), []).append((seed, index))
+        self.assertEqual(len(seen), 7)
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+    def test_block_streams(self):
+        first = BlockRNG.stream(42, 3, block_size=16)
+        draws = [first.random() for _ in range(50)]  # crosses several refills
+        again = BlockRNG.stream(42, 3, block_size=64)
+        self.assertEqual(draws, [again.random() for _ in range(50)])
+        self.assertTrue(all(0.0 <= u < 1.0 for u in draws))
+        other = BlockRNG.stream(42, 4, block_size=16)
+        self.assertNotEqual(draws[:10], [other.random() for _ in range(10)])
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+    def test_block_backend_games_are_reproducible(self):
+        for backend in ("pcg64", "philox"):
+            self.assertEqual(play(make_rng(9, backend=backend, index=2)),
+                             play(make_rng(9, backend=backend, index=2)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import math
+import unittest
+import random
+from dataclasses import replace
+from multiball_basketball import Match, Team
+from rotation import ForfeitError
+from test_multiball_basketball import make_random_player
+
+def make_team(team_name, prefix, size):
+    return Team(name=team_name, roster=[make_random_player(f"{prefix}{i+1}") for i in range(size)])
+
+class TestRotation(unittest.TestCase):
+    def play(self, size=13, possessions=200):
+        random.seed(7)
+        team_a = make_team("Testers", "T", size)
+        team_b = make_team("Debuggers", "D", size)
+        match = Match(team_a, team_b, seed=7)
+        match.tip_off()
+        for i in range(possessions):
+            match.quarter = 1 + i * 4 // possessions
+            match.simulate_shot()
+            match._last_possession_time = 14
+            match.update_minutes_played()
+        return match, team_a, team_b
+
+    def test_substitutions_keep_five_on_court(self):
+        match, team_a, team_b = self.play()
+        self.assertTrue(any("Substitution" in line for line in match.play_by_play))
+        for team in (team_a, team_b):
+            self.assertEqual(len(team.lineup), 5)
+            self.assertEqual(len(set(map(id, team.lineup))), 5)
+            self.assertEqual(sum(p.on_court for p in team.roster), 5)
+            # every possession credits exactly five players
+            self.assertAlmostEqual(sum(p.stats['MIN'] for p in team.roster), 200 * 14 * 5 / 60.0)
+
+    def test_incremental_ratings_match_full_recalculation(self):
+        _, team_a, _ = self.play()
+        cached = (team_a.offensive_rating, team_a.defensive_rating, team_a.team_boost)
+        team_a.recalculate_ratings()
+        for got, want in zip(cached, (team_a.offensive_rating, team_a.defensive_rating, team_a.team_boost)):
+            self.assertAlmostEqual(got, want)
+
+    def test_selection_tables_follow_substitutions(self):
+        _, team_a, _ = self.play()
+        tables = team_a.tables
+        self.assertEqual(tables.players, tuple(team_a.lineup))
+        for i, (mates, cum_weights) in enumerate(tables.assist):
+            self.assertNotIn(team_a.lineup[i], mates)
+            self.assertEqual(len(cum_weights), 4)
+        self.assertEqual(sum(len(ps) for ps in tables.by_position.values()), 5)
+
+    def test_fouled_out_player_never_returns(self):
+        random.seed(1)
+        team_a = make_team("Testers", "T", 10)
+        team_b = make_team("Debuggers", "D", 10)
+        match = Match(team_a, team_b, seed=1)
+        starter = team_a.lineup[0]
+        starter.fouls = match.params.foul_out
+        match.update_minutes_played()
+        self.assertNotIn(starter, team_a.lineup)
+        for _ in range(100):
+            match.update_minutes_played()
+            self.assertNotIn(starter, team_a.lineup)
+
+    def test_fouled_out_without_bench_forfeits(self):
+        random.seed(2)
+        team_a = make_team("Testers", "T", 5)
+        match = Match(team_a, make_team("Debuggers", "D", 10), seed=2)
+        team_a.lineup[0].fouls = match.params.foul_out
+        with self.assertRaises(ForfeitError):
+            match.update_minutes_played()
+
+    def test_pending_substitution_waits_for_bench_recovery(self):
+        random.seed(3)
+        team_a = make_team("Testers", "T", 10)
+        team_b = make_team("Debuggers", "D", 10)
+        match = Match(team_a, team_b, seed=3)
+        rotation = match.rotation.teams[0]
+        params = match.params
+        for p in team_a.roster[5:]:
+            rotation._benched_at[p] = (0.0, params.sub_in_stamina - 6.0)
+        ready = rotation.ready_at(rotation.foul_limit(1))
+        self.assertAlmostEqual(ready, 6.0 / params.stamina_recovery)
+        starter = team_a.lineup[0]
+        starter.stamina = 0.0
+        scans = []
+        take = rotation._take_candidate
+        rotation._take_candidate = lambda *args: scans.append(rotation.clock) or take(*args)
+        while starter.on_court:
+            rotation.tick(1.0, 1)
+        # one failed scan, then none until a bench player can be ready
+        self.assertEqual(len(scans), 2)
+        self.assertEqual(scans[0], 1.0)
+        self.assertEqual(scans[1], float(math.ceil(ready)))
+
+    def test_new_attributes_drop_cached_ratings(self):
+        player = make_random_player("P1")
+        team = Team("Testers", [player])
+        before = player.ratings(), player.selection_weights()
+        copy = team.copy()
+        player.attributes = replace(player.attributes, jumping=player.attributes.jumping + 20)
+        self.assertNotEqual(player.ratings()[0], before[0])
+        self.assertNotEqual(player.selection_weights(), before[1])
+        self.assertEqual(copy.roster[0].ratings(), before[0])
+        copy.copy_from(team)
+        self.assertEqual(copy.roster[0].ratings(), player.ratings())
+
+if __name__ == "__main__":
+    unittest.main()
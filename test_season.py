@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from league_generator import generate_league
+    from season import SeasonResults, WhatIf, round_robin, simulate_season
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSeason(unittest.TestCase):
+    def test_whatif_matches_full_resimulation(self):
+        league = generate_league(6, 10, seed=4)
+        schedule = round_robin(6, cycles=1, seed=1)
+        base = simulate_season(league.teams(), schedule, workers=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "season.npz")
+            base.save(path)
+            base = SeasonResults.load(path)
+
+        traded = league.trade([(league.roster_indices(1)[0], league.roster_indices(4)[2])])
+        delta = WhatIf(base, workers=1).apply(traded.teams())
+        self.assertEqual(delta.affected, [1, 4])
+        self.assertEqual(len(delta.games), 9)  # 5 + 5 games, one of them shared
+
+        full = simulate_season(traded.teams(), schedule, workers=1)
+        self.assertTrue(np.array_equal(delta.results.home_score, full.home_score))
+        self.assertTrue(np.array_equal(delta.after.wins, full.standings().wins))
+        self.assertTrue(np.array_equal(delta.after.points_for, full.standings().points_for))
+        self.assertEqual(len(WhatIf(base, workers=1).apply(league.teams()).games), 0)
+
+    def test_round_robin_sequence_seeds(self):
+        # (league seed, year) keys that collided as seed * 1_000_003 + year
+        first, other = round_robin(6, seed=(1, 1)), round_robin(6, seed=(0, 1_000_004))
+        self.assertFalse(np.array_equal(first.seeds, other.seeds))
+        self.assertTrue(np.array_equal(first.seeds, round_robin(6, seed=(1, 1)).seeds))
+
+if __name__ == '__main__':
+    unittest.main()
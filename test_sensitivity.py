@@ -0,0 +1,45 @@
+import random
+import unittest
+from dataclasses import fields, replace
+
+from calibration import seeded_team
+from multiball_basketball import EngineParams, PlayerAttributes
+from sensitivity import _fresh_team, attribute_channels, attribute_sensitivity
+
+class TestSensitivity(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(8)
+        self.home = seeded_team(rng, "Testers", "T")
+        self.away = seeded_team(rng, "Debuggers", "D")
+
+    def test_fixed_seed_is_deterministic(self):
+        first = attribute_sensitivity(self.home, self.away, player="T1", games=2, workers=1, seed=3)
+        again = attribute_sensitivity(self.home, self.away, player="T1", games=2, workers=1, seed=3)
+        self.assertEqual(first, again)
+        self.assertEqual([e.attribute for e in first], [f.name for f in fields(PlayerAttributes)])
+
+    def test_fresh_team_shifts_only_targets(self):
+        team = _fresh_team(self.home, ("T2", "T5"), 'jumping', 5.0)
+        for old, new in zip(self.home.roster, team.roster):
+            self.assertIsNot(old, new)
+            shift = 5.0 if old.name in ("T2", "T5") else 0.0
+            self.assertAlmostEqual(new.attributes.jumping, old.attributes.jumping + shift)
+            self.assertEqual(replace(new.attributes, jumping=old.attributes.jumping), old.attributes)
+        self.assertEqual([p.attributes for p in _fresh_team(self.home, (), None, 0.0).roster],
+                         [p.attributes for p in self.home.roster])
+
+    def test_channels_cover_every_attribute(self):
+        self.assertEqual(set(attribute_channels()), {f.name for f in fields(PlayerAttributes)})
+
+    def test_unknown_player_raises(self):
+        with self.assertRaises(ValueError):
+            attribute_sensitivity(self.home, self.away, player="D1", games=1, workers=1)
+
+    def test_forfeits_drop_pairs(self):
+        starters = seeded_team(random.Random(2), "Starters", "S", size=5)
+        effects = attribute_sensitivity(starters, self.away, games=1, workers=1,
+                                        params=EngineParams(foul_out=1))
+        self.assertTrue(all(e.points == e.margin == e.points_stderr == 0.0 for e in effects))
+
+if __name__ == '__main__':
+    unittest.main()
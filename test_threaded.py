@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from calibration import seeded_team
+from multiball_basketball import Match
+from result_cache import simulate_matchup
+from threaded import play, simulate_threaded
+
+class TestThreaded(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.home = seeded_team(rng, "Testers", "T")
+        self.away = seeded_team(rng, "Debuggers", "D")
+
+    def test_shared_rosters_are_only_read(self):
+        fingerprints = (self.home.fingerprint(), self.away.fingerprint())
+        simulate_threaded(self.home, self.away, games=40, seed=0, workers=4, chunk_size=5)
+        self.assertEqual((self.home.fingerprint(), self.away.fingerprint()), fingerprints)
+        for team in (self.home, self.away):
+            self.assertEqual(team.score, 0)
+            self.assertEqual(team.lineup, [])
+            for p in team.roster:
+                self.assertFalse(any(p.stats.values()))
+                self.assertEqual((p.fouls, p.stamina), (0, 100.0))
+
+    def test_results_do_not_depend_on_threads(self):
+        threaded = simulate_threaded(self.home, self.away, games=40, seed=5, workers=4, chunk_size=5)
+        serial = simulate_threaded(self.home, self.away, games=40, seed=5, workers=1, chunk_size=5)
+        self.assertEqual(threaded, serial)
+        processes = simulate_matchup(self.home, self.away, games=40, seed=5)
+        self.assertEqual((threaded.wins, threaded.score_hist), (processes.wins, processes.score_hist))
+
+    def test_matches_leave_module_random_alone(self):
+        state = random.getstate()
+        play(self.home, self.away, 1)
+        Match(self.home, self.away, logged=False, copy_teams=True).simulate()
+        self.assertEqual(random.getstate(), state)
+
+if __name__ == '__main__':
+    unittest.main()
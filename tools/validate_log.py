@@ -1,29 +1,42 @@
 # tools/validate_log.py
+#
+#   python tools/validate_log.py [PATH] [--game N]
+#
+# PATH is a plain play-by-play log or a compressed archive written by
+# log_sink.CompressedLogSink (.gz / .xz); archives are validated game by game
+# straight from the compressed file, or just the N-th game (1-based).
+import argparse
 import re
 import sys
 from collections import defaultdict, deque
+from pathlib import Path
 
-LOG_PATH = sys.argv[1] if len(sys.argv) > 1 else "play_by_play_log.txt"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from log_sink import codec_for, iter_games, read_game
 
 TEAM_TAGS = ("Testers", "Debuggers")
 
 # --- Regexes ---
 re_score_bracket = re.compile(r"\[(?:Testers|Home):?\s*(\d+)\s*\|\s*(?:Debuggers|Away):?\s*(\d+)\]")
-re_made = re.compile(r"\] ([TD]\d) Made (.+?)(?: \((?:assist: ([TD]\d))\))?(?: \[.*\])?$")
-re_miss = re.compile(r"\] ([TD]\d) missed(?:| a) (.+?)(?: \[.*\])?$")
-re_block = re.compile(r"\] ([TD]\d) had .* blocked by ([TD]\d)")
-re_rebound = re.compile(r"\] ([TD]\d) grabbed the rebound")
+re_made = re.compile(r"\] ([TD]\d+) Made (.+?)(?: \((?:assist: ([TD]\d+))\))?(?: \[.*\])?$")
+re_miss = re.compile(r"\] ([TD]\d+) missed(?:| a) (.+?)(?: \[.*\])?$")
+re_block = re.compile(r"\] ([TD]\d+) had .* blocked by ([TD]\d+)")
+re_rebound = re.compile(r"\] ([TD]\d+) grabbed the rebound")
 re_poss = re.compile(r"\] Possession: (Testers|Debuggers)")
 re_turnover = re.compile(r"\] Turnover(?:.*)")
-re_foul_shoot = re.compile(r"\] ([TD]\d) misses? .+? but is fouled by ([TD]\d)")
-re_foul_nonshoot = re.compile(r"\] Non-shooting foul by ([TD]\d)")
-re_ft_made = re.compile(r"\] ([TD]\d) Made Free Throw(?: .*?)?(?: \[.*\])?$")
-re_ft_miss = re.compile(r"\] ([TD]\d) Missed Free Throw")
+re_foul_shoot = re.compile(r"\] ([TD]\d+) misses? (.+?) but is fouled by ([TD]\d+)")
+re_foul_nonshoot = re.compile(r"\] Non-shooting foul by ([TD]\d+)")
+re_foul_bonus = re.compile(r"\] Non-shooting foul by [TD]\d+ .*? on ([TD]\d+).*\[Bonus\]$")
+re_ft_made = re.compile(r"\] ([TD]\d+) Made Free Throw(?: .*?)?(?: \[.*\])?$")
+re_ft_miss = re.compile(r"\] ([TD]\d+) Missed Free Throw")
 re_end_q = re.compile(r"End of quarter\. Score: .*?(\d+)\s*-\s*(\d+)")
 re_final = re.compile(r"Final Score: .*?(\d+)\s*-\s*(\d+)")
 re_box_header = re.compile(r"--- Game Over.*")
 re_box_line = re.compile(
-    r"^\s+([TD]\d): \{.*'PTS': (\d+).+'FGM': (\d+), 'FGA': (\d+), '3PM': (\d+), 'FTM': (\d+), 'FTA': (\d+).*}$"
+    r"^\s+([TD]\d+): \{.*'PTS': (\d+).+'FGM': (\d+), 'FGA': (\d+), '3PM': (\d+), 'FTM': (\d+), 'FTA': (\d+).*}$"
 )
 
 # very light mapping of shot type -> points & 3pt flag
@@ -40,8 +53,8 @@ def expect_fts_for_foul(last_shot_desc: str):
     # “and-1” not handled here; we only trigger from “misses … but is fouled”
     return 2
 
-def main():
-    lines = open(LOG_PATH, "r", encoding="utf-8").read().splitlines()
+def validate_lines(lines):
+    """Check one game's play-by-play lines; returns the list of error messages."""
     errors = []
 
     # running score we compute from events
@@ -155,13 +168,22 @@ def main():
         # shooting foul on a miss -> set pending FTs
         m = re_foul_shoot.search(line)
         if m:
-            shooter = m.group(1)
-            pending_ft = expect_fts_for_foul(last_shot_desc or "")
+            shooter, desc = m.group(1), m.group(2)
+            last_shot_desc = desc
+            pending_ft = expect_fts_for_foul(desc)
             pending_ft_shooter = shooter
             i += 1
             continue
 
-        # non-shooting foul: nothing to validate besides existence (clock, bonuses out of scope)
+        # non-shooting foul in the bonus -> two FTs for the fouled player
+        m = re_foul_bonus.search(line)
+        if m:
+            pending_ft = 2
+            pending_ft_shooter = m.group(1)
+            i += 1
+            continue
+
+        # other non-shooting fouls: nothing to validate besides existence (clock out of scope)
         if re_foul_nonshoot.search(line):
             i += 1
             continue
@@ -245,6 +267,42 @@ def main():
                 errors.append(f"{pid}: FTA mismatch (box {FTA} vs PBP {tallies['FTA'][pid]}).")
         i += 1
 
+    return errors
+
+def game_number(text):
+    # argparse type for --game: a 1-based game number
+    n = int(text)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"game numbers start at 1, got {n}")
+    return n
+
+def validate_file(path, game=None):
+    """
+    Validate every game in a log (or only the 1-based `game`); returns
+    (games checked, error messages). Archive errors are prefixed "Game N: ".
+    """
+    if game is not None:
+        if game < 1:
+            raise ValueError(f"game numbers start at 1, got {game}")
+        games = [(game, read_game(path, game - 1))]
+    else:
+        games = enumerate(iter_games(path), 1)
+    archive = codec_for(path) is not None
+    count = 0
+    errors = []
+    for n, lines in games:
+        count += 1
+        game_errors = validate_lines(lines)
+        errors.extend([f"Game {n}: {e}" for e in game_errors] if archive else game_errors)
+    return count, errors
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Validate play-by-play logs (plain, .gz or .xz archives).")
+    ap.add_argument("path", nargs="?", default="play_by_play_log.txt")
+    ap.add_argument("--game", type=game_number, default=None, help="validate only the N-th game in the file (1-based)")
+    args = ap.parse_args(argv)
+
+    _, errors = validate_file(args.path, args.game)
     if errors:
         print("VALIDATION FAILED")
         print("[")